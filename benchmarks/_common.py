@@ -0,0 +1,69 @@
+"""Shared helpers for the benchmark scripts: environment capture and result output.
+
+Every script prints one JSON object per measurement and, with ``--output``,
+writes ``{"benchmark", "environment", "results"}`` to a file that
+``compare.py`` can diff against a baseline. Metric keys end in ``_per_s``
+(higher is better) or ``_ms``, ``_mb`` or ``_pct`` (lower is better); every
+other key identifies the case.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from mcp_server_ads import decoding
+
+METRIC_SUFFIXES = ("_per_s", "_ms", "_mb", "_pct")
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        version = metadata.version("mcp-server-ads")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "version": version,
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "orjson": decoding.orjson is not None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def is_metric(key: str) -> bool:
+    return key.endswith(METRIC_SUFFIXES)
+
+
+def report(benchmark: str, results: list[dict[str, Any]], output: str | None) -> None:
+    if output is None:
+        return
+    Path(output).write_text(json.dumps(
+        {"benchmark": benchmark, "environment": environment(), "results": results}, indent=2
+    ))
+
+
+def emit(result: dict[str, Any]) -> dict[str, Any]:
+    """Print ``result`` as a JSON line (rounding metrics) and return it."""
+    result = {k: round(v, 3) if is_metric(k) else v for k, v in result.items()}
+    print(json.dumps(result), flush=True)
+    return result
@@ -0,0 +1,75 @@
+"""Benchmark JSON decoding of large synthetic ADS search payloads.
+
+Compares ``httpx.Response.json()`` (the previous client path) with
+``mcp_server_ads.decoding.loads`` using the stdlib and, if installed, orjson.
+
+Run with: uv run python benchmarks/bench_decode.py --output results/decode.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import timeit
+
+import httpx
+from _common import emit, report
+
+from mcp_server_ads import decoding
+
+
+def synthetic_search(rows: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+
+    def words(n: int) -> str:
+        return " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(n)
+        )
+
+    docs = [
+        {
+            "bibcode": f"2020ApJ...{i % 1000:03d}..{i % 100:03d}A",
+            "title": [words(12)],
+            "author": [f"{words(1).title()}, {rng.choice(string.ascii_uppercase)}."
+                       for _ in range(rng.randint(1, 40))],
+            "year": str(rng.randint(1990, 2025)),
+            "pub": "The Astrophysical Journal",
+            "citation_count": rng.randint(0, 5000),
+            "abstract": words(250),
+            "identifier": [f"arXiv:2001.{i:05d}", f"10.3847/1538-4357/ab{i:04d}"],
+            "keyword": [words(2) for _ in range(8)],
+            "aff": [words(8) for _ in range(10)],
+        }
+        for i in range(rows)
+    ]
+    payload = {"responseHeader": {"status": 0}, "response": {"numFound": rows, "docs": docs}}
+    return json.dumps(payload).encode()
+
+
+def run(rows: int, repeat: int) -> dict[str, float]:
+    body = synthetic_search(rows)
+    candidates = {
+        "httpx_json": lambda: httpx.Response(200, content=body).json(),
+        "stdlib_bytes": lambda: json.loads(body),
+    }
+    if decoding.orjson is not None:
+        candidates["orjson"] = lambda: decoding.orjson.loads(body)
+    results = {"rows": rows, "bytes": len(body)}
+    for name, fn in candidates.items():
+        results[f"{name}_ms"] = min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write all results with environment info as JSON")
+    args = parser.parse_args()
+    report("decode", [emit(run(rows, args.repeat)) for rows in args.rows], args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Microbenchmark the formatting hot paths on large synthetic inputs.
+
+Covers ``format_search_results`` (with and without a ``max_chars`` budget),
+``format_reference_resolve`` and ``format_metrics``; these run on every
+search, reference and metrics call and dominate tool time once the
+response is decoded.
+
+Run with: uv run python benchmarks/bench_formatting.py --output results/formatting.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import timeit
+from typing import Any, Callable
+
+from _common import emit, report
+from bench_decode import synthetic_search
+
+from mcp_server_ads.formatting import (
+    format_metrics,
+    format_reference_resolve,
+    format_search_results,
+)
+
+
+def synthetic_references(rows: int, seed: int = 0) -> str:
+    """Reference-resolver text: mostly resolved lines, some unresolved or malformed."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(rows):
+        ref = f"Author{i}, A. et al. {rng.randint(1950, 2025)} ApJ {rng.randint(1, 999)} {i}"
+        bibcode = f"{rng.randint(1950, 2025)}ApJ...{i % 1000:03d}..{i % 100:03d}A"
+        roll = rng.random()
+        if roll < 0.8:
+            lines.append(f"1.0 {bibcode} -- {ref}")
+        elif roll < 0.95:
+            lines.append(f"0.0 -- {ref}")
+        else:
+            lines.append(ref)
+    return "\n".join(lines)
+
+
+def synthetic_metrics(years: int, seed: int = 0) -> dict[str, Any]:
+    """A full metrics response with per-year histograms spanning ``years`` years."""
+    rng = random.Random(seed)
+    span = [str(2025 - years + i) for i in range(years)]
+
+    def per_year() -> dict[str, int]:
+        return {year: rng.randint(0, 5000) for year in span}
+
+    stats = {"number of papers": years * 4, "total number of reads": rng.randint(0, 10**6),
+             "normalized paper count": years * 1.3}
+    citations = {"total number of citations": rng.randint(0, 10**5)}
+    indicators = {"h": 35, "g": 60, "i10": 70, "m": 1.2, "tori": 40.1}
+    histograms = {
+        name: {"refereed to refereed": per_year(), "nonrefereed to refereed": per_year()}
+        for name in ("citations", "reads", "downloads", "publications")
+    }
+    return {
+        "basic stats": stats, "basic stats refereed": stats,
+        "citation stats": citations, "citation stats refereed": citations,
+        "indicators": indicators, "indicators refereed": indicators,
+        "histograms": histograms,
+        "time series": {k: per_year() for k in ("h", "g", "i10", "i100", "tori")},
+    }
+
+
+def time_ms(fn: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results = []
+    for rows in args.rows:
+        data = json.loads(synthetic_search(rows))
+        results.append(emit({"function": "format_search_results", "size": rows,
+                             "time_ms": time_ms(lambda: format_search_results(data), args.repeat)}))
+        results.append(emit({
+            "function": "format_search_results[max_chars=20000]", "size": rows,
+            "time_ms": time_ms(lambda: format_search_results(data, max_chars=20000), args.repeat),
+        }))
+        text = synthetic_references(rows)
+        results.append(emit({"function": "format_reference_resolve", "size": rows,
+                             "time_ms": time_ms(lambda: format_reference_resolve(text),
+                                                args.repeat)}))
+    for years in args.years:
+        metrics = synthetic_metrics(years)
+        results.append(emit({"function": "format_metrics", "size": years,
+                             "time_ms": time_ms(lambda: format_metrics(metrics), args.repeat)}))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--years", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write all results with environment info as JSON")
+    args = parser.parse_args()
+    report("formatting", run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure server cold-start cost with ``python -X importtime``.
+
+Each run imports ``mcp_server_ads.server`` in a fresh interpreter and reports
+the total import time, the part spent in this package's own modules, and
+the wall time of the whole process (interpreter startup included). The
+slowest own modules are listed so regressions can be traced.
+
+Run with: uv run python benchmarks/bench_import.py --output results/import.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from _common import emit, report
+
+PACKAGE = "mcp_server_ads"
+
+
+def importtime(module: str) -> list[tuple[str, int, int]]:
+    """``(module, self_us, cumulative_us)`` for one cold import of ``module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def wall_ms(module: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(module: str, repeat: int, top: int) -> list[dict[str, Any]]:
+    totals, owns, walls = [], [], []
+    per_module: dict[str, list[int]] = {}
+    for _ in range(repeat):
+        rows = importtime(module)
+        totals.append(next(c for name, _, c in rows if name == module) / 1000)
+        own = [(name, s) for name, s, _ in rows if name.split(".")[0] == PACKAGE]
+        owns.append(sum(s for _, s in own) / 1000)
+        for name, s in own:
+            per_module.setdefault(name, []).append(s)
+        walls.append(wall_ms(module))
+    results = [emit({
+        "module": module,
+        "import_ms": statistics.median(totals),
+        "own_import_ms": statistics.median(owns),
+        "process_ms": statistics.median(walls),
+    })]
+    slowest = sorted(per_module.items(), key=lambda kv: -statistics.median(kv[1]))[:top]
+    for name, samples in slowest:
+        results.append(emit({"module": name, "self_ms": statistics.median(samples) / 1000}))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=f"{PACKAGE}.server")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest own modules to list")
+    parser.add_argument("--output", help="Write all results with environment info as JSON")
+    args = parser.parse_args()
+    report("import", run(args.module, args.repeat, args.top), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark tool functions end to end against the in-process fake ADS API.
+
+Each case calls a tool function the way FastMCP would (with a lifespan
+context) over ``httpx.ASGITransport``, so the measurement covers the client,
+JSON decoding, batching/mirroring and formatting, but no network. Cases
+are run for several payload sizes and concurrency levels.
+
+Run with: uv run python benchmarks/bench_tools.py --output results/tools.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+import httpx
+from _common import emit, percentile, report
+
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.fake import FakeConfig, Latency, create_app
+from mcp_server_ads.mirror import LibraryMirror
+from mcp_server_ads.tools.export import ads_export
+from mcp_server_ads.tools.libraries import ads_library, ads_library_documents
+from mcp_server_ads.tools.metrics import ads_metrics
+from mcp_server_ads.tools.network import ads_network
+from mcp_server_ads.tools.search import ads_bigquery, ads_search
+
+Call = Callable[[], Awaitable[Any]]
+
+
+async def _no_progress(*args: Any, **kwargs: Any) -> None:
+    pass
+
+
+class Bench:
+    """A fake ADS app plus a tool context wired to it."""
+
+    def __init__(self, corpus_size: int, latency_ms: float):
+        app = create_app(FakeConfig(
+            corpus_size=corpus_size, rate_limit=10**9, latency=Latency("fixed", latency_ms),
+        ))
+        self.fake = app.state.fake
+        http = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://fake", timeout=60
+        )
+        self.client = ADSClient(http)
+        self.ctx = SimpleNamespace(
+            lifespan_context={
+                "ads_client": self.client,
+                "library_mirror": LibraryMirror(self.client),
+            },
+            report_progress=_no_progress,
+        )
+
+    def bibcodes(self, n: int) -> list[str]:
+        return [p.bibcode for p in self.fake.corpus.papers[:n]]
+
+    async def library(self, n: int) -> str:
+        data = await self.client.post(
+            "/v1/biblib/libraries", json={"name": f"bench-{n}", "bibcode": self.bibcodes(n)}
+        )
+        return data["id"]
+
+
+async def cases(bench: Bench, size: int) -> dict[str, Call]:
+    ctx = bench.ctx
+    bibcodes = bench.bibcodes(size)
+    library_id = await bench.library(size)
+    scratch_id = await bench.library(0)
+
+    async def documents() -> None:
+        await ads_library_documents(library_id=scratch_id, action="add", bibcodes=bibcodes,
+                                    ctx=ctx)
+        await ads_library_documents(library_id=scratch_id, action="remove", bibcodes=bibcodes,
+                                    ctx=ctx)
+
+    return {
+        "ads_search": lambda: ads_search(
+            query="*:*", rows=min(size, 200), fields="bibcode,title,author,year,pub,abstract",
+            ctx=ctx,
+        ),
+        "ads_bigquery": lambda: ads_bigquery(bibcodes=bibcodes, rows=min(size, 200), ctx=ctx),
+        "ads_export": lambda: ads_export(bibcodes=bibcodes, ctx=ctx),
+        "ads_metrics": lambda: ads_metrics(bibcodes=bibcodes, ctx=ctx),
+        "ads_network": lambda: ads_network(bibcodes=bibcodes, ctx=ctx),
+        "ads_library_get": lambda: ads_library(
+            action="get", library_id=library_id, rows=size, ctx=ctx
+        ),
+        "ads_library_documents": documents,
+    }
+
+
+async def measure(call: Call, concurrency: int, calls: int) -> dict[str, float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    await call()  # warm-up: fills caches and mirrors like a running server
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    wall = time.perf_counter() - start
+    return {
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "calls_per_s": calls / wall,
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    bench = Bench(args.corpus_size, args.latency_ms)
+    results = []
+    for size in args.sizes:
+        table = await cases(bench, size)
+        for name, call in table.items():
+            if args.tools and name not in args.tools:
+                continue
+            for concurrency in args.concurrency:
+                stats = await measure(call, concurrency, max(args.calls, concurrency))
+                results.append(emit({
+                    "tool": name,
+                    "size": size,
+                    "concurrency": concurrency,
+                    "fake_latency": args.latency_ms,
+                    **stats,
+                }))
+    await bench.client.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=32, help="Calls per case")
+    parser.add_argument("--corpus-size", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Fixed latency the fake adds to every request")
+    parser.add_argument("--tools", nargs="*", help="Only run these tools")
+    parser.add_argument("--output", help="Write all results with environment info as JSON")
+    args = parser.parse_args()
+    report("tools", asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare two benchmark result files and flag regressions.
+
+Cases are matched on their non-metric keys. A ``_per_s`` metric regresses
+when it shrinks by more than ``--threshold``; any other metric when it
+grows by more. Exits with status 1 if anything regressed.
+
+Run with: uv run python benchmarks/compare.py results/base.json results/new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from _common import is_metric
+
+Key = tuple[tuple[str, Any], ...]
+
+
+def load(path: str) -> dict[Key, dict[str, float]]:
+    data = json.loads(Path(path).read_text())
+    cases = {}
+    for result in data["results"]:
+        key = tuple(sorted((k, v) for k, v in result.items() if not is_metric(k)))
+        cases[key] = {k: v for k, v in result.items() if is_metric(k)}
+    return cases
+
+
+def change(metric: str, old: float, new: float) -> float:
+    """Relative change, positive when ``new`` is worse."""
+    if not old:
+        return 0.0
+    delta = (new - old) / old
+    return -delta if metric.endswith("_per_s") else delta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown that counts as a regression (default 10%%)")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    regressions = 0
+    for key, metrics in candidate.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        label = " ".join(f"{k}={v}" for k, v in key)
+        for metric, value in metrics.items():
+            if metric not in old:
+                continue
+            worse = change(metric, old[metric], value)
+            flag = "REGRESSED" if worse > args.threshold else ""
+            regressions += bool(flag)
+            delta = f" ({(value - old[metric]) / old[metric]:+.1%})" if old[metric] else ""
+            print(f"{label} {metric}: {old[metric]} -> {value}{delta} {flag}".rstrip())
+    missing = len(baseline.keys() - candidate.keys())
+    if missing:
+        print(f"{missing} baseline cases not in candidate")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
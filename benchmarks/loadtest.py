@@ -0,0 +1,238 @@
+"""Drive concurrent MCP sessions against the server to find its saturation point.
+
+By default the fake ADS API runs in a subprocess and the server is driven
+in-process through ``fastmcp.Client(mcp)``, so the measurement covers MCP
+message handling, the tool layer and the ADS client over real HTTP. With
+``--url`` an already running server is driven over streamable HTTP instead;
+it should be backed by a fake started with the same ``--corpus-size`` and
+``--seed`` so the generated bibcodes exist.
+
+For each number of concurrent sessions the harness runs a fixed-duration
+stage of weighted random tool calls and reports throughput, latency
+percentiles, error rate, event-loop lag and peak RSS. The saturation point
+is the first stage where adding sessions no longer raises throughput by
+``--gain``.
+
+Run with: uv run python benchmarks/loadtest.py --sessions 1 4 16 64 --output load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+import httpx
+from _common import emit, percentile, report
+
+from mcp_server_ads.fake import Corpus
+from mcp_server_ads.fake.corpus import WORDS
+
+DEFAULT_MIX = "ads_search=6,ads_bigquery=1,ads_export=1,ads_metrics=1,ads_network=1"
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+class Workload:
+    """Random tool arguments drawn from the fake corpus."""
+
+    def __init__(self, corpus: Corpus, mix: dict[str, int], batch: int):
+        self.bibcodes = [p.bibcode for p in corpus.papers]
+        self.surnames = sorted({a.split(",")[0] for p in corpus.papers[:500] for a in p.author})
+        self.tools = list(mix)
+        self.weights = list(mix.values())
+        self.batch = batch
+
+    def arguments(self, tool: str, rng: random.Random) -> dict[str, Any]:
+        bibcodes = rng.sample(self.bibcodes, min(self.batch, len(self.bibcodes)))
+        if tool == "ads_search":
+            query = rng.choice([
+                f'author:"{rng.choice(self.surnames)}"',
+                f"title:{rng.choice(WORDS)} year:{rng.randint(1990, 2025)}",
+                f"abs:{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            ])
+            return {"query": query, "rows": 25}
+        if tool == "ads_bigquery":
+            return {"bibcodes": bibcodes, "rows": len(bibcodes)}
+        if tool in ("ads_export", "ads_metrics", "ads_network"):
+            return {"bibcodes": bibcodes}
+        raise SystemExit(f"No argument generator for {tool}")
+
+    def next(self, rng: random.Random) -> tuple[str, dict[str, Any]]:
+        tool = rng.choices(self.tools, self.weights)[0]
+        return tool, self.arguments(tool, rng)
+
+
+class LagMonitor:
+    """Measures how late a periodic timer fires, i.e. how busy the event loop is."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def __enter__(self) -> LagMonitor:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        assert self._task is not None
+        self._task.cancel()
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+async def session(
+    target: Any, workload: Workload, seed: int, stop_at: float,
+    latencies: list[float], errors: list[str],
+) -> None:
+    from fastmcp import Client
+
+    rng = random.Random(seed)
+    async with Client(target) as client:
+        while time.perf_counter() < stop_at:
+            tool, arguments = workload.next(rng)
+            start = time.perf_counter()
+            try:
+                result = await client.call_tool(tool, arguments, raise_on_error=False)
+                failed = result.is_error
+            except Exception as exc:  # transport failures count as errors, not crashes
+                failed, result = True, exc
+            latencies.append(time.perf_counter() - start)
+            if failed:
+                errors.append(tool)
+
+
+async def stage(target: Any, workload: Workload, sessions: int, duration: float,
+                seed: int) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors: list[str] = []
+    stop_at = time.perf_counter() + duration
+    start = time.perf_counter()
+    with LagMonitor() as lag:
+        await asyncio.gather(*(
+            session(target, workload, seed * 1000 + i, stop_at, latencies, errors)
+            for i in range(sessions)
+        ))
+    wall = time.perf_counter() - start
+    calls = len(latencies) or 1
+    return {
+        "sessions": sessions,
+        "calls_per_s": len(latencies) / wall,
+        "p50_ms": percentile(latencies or [0.0], 0.5) * 1000,
+        "p95_ms": percentile(latencies or [0.0], 0.95) * 1000,
+        "p99_ms": percentile(latencies or [0.0], 0.99) * 1000,
+        "error_pct": 100 * len(errors) / calls,
+        "loop_lag_p99_ms": percentile(lag.lags or [0.0], 0.99) * 1000,
+        "loop_lag_max_ms": max(lag.lags or [0.0]) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def saturation(results: list[dict[str, Any]], gain: float) -> int | None:
+    """The session count after which throughput stopped growing by ``gain``."""
+    for previous, current in zip(results, results[1:]):
+        if current["calls_per_s"] < previous["calls_per_s"] * (1 + gain):
+            return previous["sessions"]
+    return None
+
+
+def start_fake(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    url = f"http://127.0.0.1:{args.fake_port}"
+    proc = subprocess.Popen([
+        sys.executable, "-m", "mcp_server_ads.fake", "--port", str(args.fake_port),
+        "--corpus-size", str(args.corpus_size), "--seed", str(args.seed),
+        "--latency", args.latency, "--rate-limit", str(10**9),
+    ])
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{url}/v1/search/query", params={"q": "*:*", "rows": 0}, timeout=1)
+            return proc, url
+        except httpx.TransportError:
+            if proc.poll() is not None:
+                raise SystemExit("Fake ADS API exited during startup")
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("Fake ADS API did not start")
+
+
+async def run(args: argparse.Namespace, target: Any) -> list[dict[str, Any]]:
+    from fastmcp import Client
+
+    workload = Workload(Corpus(args.corpus_size, args.seed), parse_mix(args.mix), args.batch)
+    results = []
+    # In-process, the first client to connect owns the server lifespan and tears
+    # it down when it leaves; an idle session held for the whole run keeps the
+    # shared state open like a long-running server.
+    async with Client(target):
+        for sessions in args.sessions:
+            result = await stage(target, workload, sessions, args.duration, args.seed)
+            results.append(emit({"target": "http" if args.url else "inprocess",
+                                 "mix": args.mix, **result}))
+    knee = saturation(results, args.gain)
+    emit({"saturation_sessions": knee})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per stage")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="TOOL=WEIGHT,... (default: %(default)s)")
+    parser.add_argument("--batch", type=int, default=20, help="Bibcodes per bibcode-list call")
+    parser.add_argument("--gain", type=float, default=0.1,
+                        help="Minimum relative throughput gain per stage before saturation")
+    parser.add_argument("--url", help="Drive a running server over streamable HTTP instead")
+    parser.add_argument("--corpus-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", default="lognormal:80:0.5",
+                        help="Fake ADS latency, KIND:MEDIAN_MS[:SPREAD]")
+    parser.add_argument("--fake-port", type=int, default=8765)
+    parser.add_argument("--output", help="Write all results with environment info as JSON")
+    args = parser.parse_args()
+
+    if args.url:
+        report("load", asyncio.run(run(args, args.url)), args.output)
+        return
+
+    fake, url = start_fake(args)
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Configuration is read at import, so set it before loading the server.
+            os.environ.update(ADS_API_URL=url, ADS_API_TOKEN="load", ADS_CACHE_DIR=cache_dir)
+            # Failed calls are counted in error_pct; their tracebacks would flood the output.
+            logging.getLogger("fastmcp").setLevel(logging.CRITICAL)
+            from mcp_server_ads.server import mcp
+
+            report("load", asyncio.run(run(args, mcp)), args.output)
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+if __name__ == "__main__":
+    main()
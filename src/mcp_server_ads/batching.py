@@ -0,0 +1,141 @@
+"""Micro-batching of single-bibcode search lookups into one bigquery."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, Any
+
+from mcp_server_ads.deadlines import unbounded
+
+if TYPE_CHECKING:
+    from mcp_server_ads.client import ADSClient
+
+# ADS bibcodes are always 19 characters; the quotes are optional.
+_BIBCODE_QUERY = re.compile(r'^\s*bibcode:"?([^\s"]{19})"?\s*$')
+
+MAX_BATCH = 2000
+"""Upper bound on bibcodes per bigquery (the ADS limit)."""
+
+
+def single_bibcode(params: Any) -> str | None:
+    """Return the bibcode if ``params`` describe an exact single-bibcode lookup."""
+    if not isinstance(params, dict):
+        return None
+    match = _BIBCODE_QUERY.match(str(params.get("q", "")))
+    if match is None or int(params.get("start", 0)) != 0:
+        return None
+    return match.group(1)
+
+
+def _with_bibcode_field(fl: str) -> str:
+    fields = [f.strip() for f in fl.split(",") if f.strip()]
+    if "bibcode" not in fields:
+        fields.append("bibcode")
+    return ",".join(fields)
+
+
+class BibcodeBatcher:
+    """Hold exact-bibcode lookups briefly and answer them with one bigquery.
+
+    Lookups are grouped by their ``fl`` so every caller gets the fields it asked
+    for. A window holding a single lookup is sent as the original query, and
+    bibcodes missing from the bigquery result (e.g. alternate bibcodes) fall
+    back to individual queries.
+    """
+
+    def __init__(self, client: ADSClient, window: float):
+        self._client = client
+        self._window = window
+        self._pending: dict[str, list[tuple[str, dict[str, Any], asyncio.Future]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def lookup(self, bibcode: str, params: dict[str, Any]) -> dict[str, Any]:
+        key = params.get("fl", "")
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((bibcode, params, future))
+        if len(batch) == 1:
+            self._spawn(self._flush_later(key, batch))
+        elif len(batch) >= MAX_BATCH:
+            self._take(key, batch)
+            self._spawn(self._flush(batch))
+        return await future
+
+    def _spawn(self, coro: Any) -> None:
+        # A flush answers every waiter, so it isn't bound by the deadline of the one it started for.
+        with unbounded():
+            task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _take(self, key: str, batch: list) -> bool:
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+            return True
+        return False
+
+    async def _flush_later(self, key: str, batch: list) -> None:
+        await asyncio.sleep(self._window)
+        if self._take(key, batch):
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[str, dict[str, Any], asyncio.Future]]) -> None:
+        waiting = [item for item in batch if not item[2].done()]
+        if not waiting:
+            return
+        if len({bibcode for bibcode, _, _ in waiting}) == 1:
+            # Nothing to merge: send the original query.
+            await self._fallback(waiting)
+            return
+
+        fl = _with_bibcode_field(waiting[0][1].get("fl", "bibcode"))
+        bibcodes = list(dict.fromkeys(bibcode for bibcode, _, _ in waiting))
+        try:
+            data = await self._client.post(
+                "/v1/search/bigquery",
+                params={"q": "*:*", "fl": fl, "rows": len(bibcodes)},
+                content="bibcode\n" + "\n".join(bibcodes),
+                headers={"Content-Type": "big-query/csv"},
+            )
+        except Exception as exc:
+            for _, _, future in waiting:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        by_bibcode = {doc.get("bibcode"): doc for doc in data.get("response", {}).get("docs", [])}
+        header = data.get("responseHeader", {})
+        missing = []
+        for bibcode, params, future in waiting:
+            doc = by_bibcode.get(bibcode)
+            if doc is None:
+                missing.append((bibcode, params, future))
+            elif not future.done():
+                future.set_result({
+                    "responseHeader": header,
+                    "response": {"numFound": 1, "start": 0, "docs": [doc]},
+                })
+        if missing:
+            await self._fallback(missing)
+
+    async def _fallback(self, items: list[tuple[str, dict[str, Any], asyncio.Future]]) -> None:
+        groups: dict[str, list[tuple[str, dict[str, Any], asyncio.Future]]] = {}
+        for item in items:
+            groups.setdefault(item[0], []).append(item)
+
+        async def one(group: list[tuple[str, dict[str, Any], asyncio.Future]]) -> None:
+            try:
+                result = await self._client.get(
+                    "/v1/search/query", params=group[0][1], batch=False
+                )
+            except Exception as exc:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_result(result)
+
+        await asyncio.gather(*(one(group) for group in groups.values()))
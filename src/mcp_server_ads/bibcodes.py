@@ -0,0 +1,59 @@
+"""Bibcode validation and decomposition.
+
+A bibcode is a fixed-width 19 character identifier ``YYYYJJJJJVVVVMPPPPA``:
+year, journal abbreviation, volume, qualifier, page and first-author
+initial, with ``.`` as padding.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, NamedTuple
+from urllib.parse import unquote
+
+_VALID = re.compile(r"^\d{4}[A-Za-z0-9.&]{14}[A-Za-z.]$")
+
+
+class BibcodeParts(NamedTuple):
+    year: int
+    journal: str
+    volume: str
+    qualifier: str
+    page: str
+    initial: str
+
+
+def normalize(bibcode: str) -> str:
+    """Strip whitespace and URL-encoding (``A%26A`` -> ``A&A``)."""
+    bibcode = bibcode.strip()
+    if "%" in bibcode:
+        bibcode = unquote(bibcode)
+    return bibcode
+
+
+def is_valid(bibcode: str) -> bool:
+    return bool(_VALID.match(bibcode))
+
+
+def parse(bibcode: str) -> BibcodeParts:
+    """Split a bibcode into its fields, with ``.`` padding removed."""
+    if not is_valid(bibcode):
+        raise ValueError(f"Not a valid bibcode: {bibcode!r}")
+    return BibcodeParts(
+        year=int(bibcode[:4]),
+        journal=bibcode[4:9].strip("."),
+        volume=bibcode[9:13].strip("."),
+        qualifier=bibcode[13].strip("."),
+        page=bibcode[14:18].strip("."),
+        initial=bibcode[18].strip("."),
+    )
+
+
+def split_valid(bibcodes: Iterable[str]) -> tuple[list[str], list[str]]:
+    """Normalize ``bibcodes`` and split them into ``(valid, invalid)``."""
+    valid: list[str] = []
+    invalid: list[str] = []
+    for raw in bibcodes:
+        bibcode = normalize(raw)
+        (valid if is_valid(bibcode) else invalid).append(bibcode)
+    return valid, invalid
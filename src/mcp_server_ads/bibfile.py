@@ -0,0 +1,156 @@
+"""Incremental maintenance of local BibTeX files."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote
+
+from mcp_server_ads.bibcodes import is_valid
+from mcp_server_ads.storage import atomic_write
+
+_ENTRY_START = re.compile(r"^@(\w+)\s*[{(]", re.MULTILINE)
+_KEY = re.compile(r"^@\w+\s*[{(]\s*([^,\s]*)")
+_ADSURL = re.compile(r"adsurl\s*=\s*[{\"]\s*\S*/abs/([^}\"\s/]+)", re.IGNORECASE)
+
+
+@dataclass
+class BibEntry:
+    """One ``@type{key, ...}`` entry, kept verbatim."""
+
+    key: str
+    bibcode: str | None
+    text: str
+
+
+def _entry_end(text: str, start: int) -> int:
+    """Index just past the entry whose opening delimiter is at ``start``.
+
+    Raises ``ValueError`` if the entry is never closed.
+    """
+    opening = text[start]
+    closing = "}" if opening == "{" else ")"
+    depth = 0
+    for i in range(start, len(text)):
+        c = text[i]
+        if c == opening or (opening == "(" and c == "{"):
+            depth += 1
+        elif c == closing or (opening == "(" and c == "}"):
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    line = text.count("\n", 0, start) + 1
+    raise ValueError(f"Unclosed BibTeX entry on line {line}")
+
+
+def _make_entry(text: str) -> BibEntry:
+    key = _KEY.match(text).group(1)
+    match = _ADSURL.search(text)
+    if match:
+        bibcode = unquote(match.group(1))
+    else:
+        bibcode = key if is_valid(key) else None
+    return BibEntry(key=key, bibcode=bibcode, text=text)
+
+
+def parse_entries(text: str) -> list[str | BibEntry]:
+    """Split BibTeX source into entries and the raw text between them.
+
+    ``@string``, ``@preamble`` and ``@comment`` blocks are kept as raw text so
+    a rewrite reproduces them unchanged. Raises ``ValueError`` for text that
+    isn't BibTeX: an unclosed entry, or text other than ``%`` comments
+    without a single ``@`` block.
+    """
+    segments: list[str | BibEntry] = []
+    pos = 0
+    for match in _ENTRY_START.finditer(text):
+        if match.start() < pos:
+            continue
+        end = _entry_end(text, match.end() - 1)
+        if match.start() > pos:
+            segments.append(text[pos : match.start()])
+        block = text[match.start() : end]
+        if match.group(1).lower() in ("string", "preamble", "comment"):
+            segments.append(block)
+        else:
+            segments.append(_make_entry(block))
+        pos = end
+    if pos < len(text):
+        segments.append(text[pos:])
+    if pos == 0 and any(
+        line.strip() and not line.lstrip().startswith("%") for line in text.splitlines()
+    ):
+        raise ValueError("No BibTeX entries found")
+    return segments
+
+
+class BibFile:
+    """A BibTeX file indexed by citekey and bibcode."""
+
+    def __init__(self, segments: list[str | BibEntry]):
+        self.segments = segments
+        self.by_key: dict[str, BibEntry] = {}
+        self.by_bibcode: dict[str, BibEntry] = {}
+        for segment in segments:
+            if isinstance(segment, BibEntry):
+                self._index(segment)
+
+    @classmethod
+    def load(cls, path: Path) -> BibFile:
+        """Read ``path`` (an empty file if missing); raises ``ValueError`` if it isn't BibTeX."""
+        text = path.read_text(encoding="utf-8") if path.exists() else ""
+        return cls(parse_entries(text))
+
+    def _index(self, entry: BibEntry) -> None:
+        self.by_key[entry.key] = entry
+        if entry.bibcode:
+            self.by_bibcode[entry.bibcode] = entry
+
+    def __contains__(self, bibcode: str) -> bool:
+        return bibcode in self.by_bibcode or bibcode in self.by_key
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def merge(self, entries: list[BibEntry]) -> tuple[int, int]:
+        """Replace entries with a matching bibcode or key and append the rest.
+
+        Returns ``(added, replaced)``.
+        """
+        added = replaced = 0
+        positions = {
+            id(segment): i for i, segment in enumerate(self.segments)
+            if isinstance(segment, BibEntry)
+        }
+        for entry in entries:
+            old = self.by_bibcode.get(entry.bibcode or "") or self.by_key.get(entry.key)
+            if old is not None:
+                index = positions.pop(id(old))
+                self.segments[index] = entry
+                positions[id(entry)] = index
+                self.by_key.pop(old.key, None)
+                if old.bibcode:
+                    self.by_bibcode.pop(old.bibcode, None)
+                replaced += 1
+            else:
+                if self.segments:
+                    # Keep a blank line between entries
+                    self.segments.append("\n" if self._tail().endswith("\n") else "\n\n")
+                positions[id(entry)] = len(self.segments)
+                self.segments.append(entry)
+                added += 1
+            self._index(entry)
+        return added, replaced
+
+    def _tail(self) -> str:
+        last = self.segments[-1]
+        return last.text if isinstance(last, BibEntry) else last
+
+    def write(self, path: Path) -> None:
+        """Atomically rewrite ``path``, streaming one segment at a time."""
+        with atomic_write(path) as fh:
+            for segment in self.segments:
+                fh.write(segment.text if isinstance(segment, BibEntry) else segment)
+            if self.segments and not self._tail().endswith("\n"):
+                fh.write("\n")
@@ -0,0 +1,160 @@
+"""Circuit breakers per ADS endpoint family, and notices for stale results.
+
+After ``FAILURE_THRESHOLD`` consecutive 5xx, 429 or connection failures of
+one family (``/v1/search``, ``/v1/export``, ...), its breaker opens and
+requests fail at once with ``ADSUnavailableError`` instead of waiting on ADS.
+``ADSClient`` then answers public reads from responses it cached earlier,
+even expired ones. Once the cooldown has passed, one probe request at a time
+is let through (half-open); a success closes the breaker, a failure reopens
+it for twice as long.
+
+``StaleNoticeMiddleware`` tells the agent when a tool result was built from
+such stale responses, in the text and under ``stale`` in structured content.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any, Literal, NamedTuple
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from mcp.types import TextContent
+
+from mcp_server_ads.errors import ADSUnavailableError
+
+FAILURE_THRESHOLD = 5
+"""Consecutive failures that open a breaker."""
+
+COOLDOWN = 30.0
+"""Seconds a breaker first stays open before probing."""
+
+MAX_COOLDOWN = 300.0
+"""Cap in seconds on the cooldown, which doubles after each failed probe.
+
+A longer ``Retry-After`` from ADS still wins.
+"""
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class StaleNote(NamedTuple):
+    """A stale response used: ``age`` seconds old, ADS retried in ``retry_in``."""
+
+    text: str
+    age: float
+    retry_in: float
+
+
+_stale_notes: ContextVar[list[StaleNote] | None] = ContextVar("stale_notes", default=None)
+
+
+def family(path: str) -> str:
+    """``/v1/search/query`` -> ``/v1/search``."""
+    return "/" + "/".join(path.split("?", 1)[0].strip("/").split("/")[:2])
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.failures = 0
+        self._base_cooldown = self._cooldown = cooldown
+        self._opened = False
+        self._retry_at = 0.0
+        self._retry_after = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        if not self._opened:
+            return "closed"
+        return "open" if time.monotonic() < self._retry_at else "half_open"
+
+    def retry_in(self) -> float:
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Raise ``ADSUnavailableError`` unless a request may be sent now.
+
+        Returns True if the request is the probe of a half-open breaker.
+        """
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "open" or self._probing:
+            retry_in = self.retry_in()
+            raise ADSUnavailableError(
+                f"ADS {self.name} is failing repeatedly; retry in {retry_in:.0f}s.", retry_in
+            )
+        self._probing = True
+        return True
+
+    def succeeded(self) -> None:
+        self.failures = 0
+        self._opened = self._probing = False
+        self._cooldown = self._base_cooldown
+        self._retry_after = 0.0
+
+    def failed(self, retry_after: float | None = None) -> None:
+        """Count a failure; a ``retry_after`` from ADS extends the cooldown."""
+        self.failures += 1
+        self._retry_after = max(self._retry_after, retry_after or 0.0)
+        if self._probing:
+            self._cooldown = min(self._cooldown * 2, MAX_COOLDOWN)
+        elif self.failures < self.threshold:
+            return
+        self._probing = False
+        self._opened = True
+        self._retry_at = time.monotonic() + max(self._cooldown, self._retry_after)
+
+    def release(self) -> None:
+        """Free the probe slot of a request that ended without an answer either way."""
+        self._probing = False
+
+
+class CircuitBreakers(dict[str, CircuitBreaker]):
+    """Breakers by endpoint family, created on first use."""
+
+    def for_path(self, path: str) -> CircuitBreaker:
+        name = family(path)
+        breaker = self.get(name)
+        if breaker is None:
+            breaker = self[name] = CircuitBreaker(name)
+        return breaker
+
+
+def note_stale(text: str, age: float, retry_in: float) -> None:
+    """Record that the running tool call used a stale response."""
+    notes = _stale_notes.get()
+    if notes is not None and all(note.text != text for note in notes):
+        notes.append(StaleNote(text, age, retry_in))
+
+
+class StaleNoticeMiddleware(Middleware):
+    """Marks tool results built from stale responses.
+
+    The text content is prefixed with a notice, and structured content gets
+    a ``stale`` entry with the notice, the age of the oldest stale response
+    and the longest wait until ADS is tried again.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        notes: list[StaleNote] = []
+        token = _stale_notes.set(notes)
+        try:
+            result = await call_next(context)
+        finally:
+            _stale_notes.reset(token)
+        if notes:
+            text = " ".join(note.text for note in notes)
+            result.content = [
+                TextContent(type="text", text=f"**Stale result:** {text}"), *result.content
+            ]
+            if isinstance(result.structured_content, dict):
+                result.structured_content["stale"] = {
+                    "notice": text,
+                    "age_seconds": round(max(note.age for note in notes), 1),
+                    "retry_in_seconds": round(max(note.retry_in for note in notes), 1),
+                }
+        return result
@@ -0,0 +1,127 @@
+"""Short-lived cache of public ADS responses, shared by every token.
+
+Search, export, metrics, resolver and similar endpoints return the same
+data whoever asks, so a response fetched for one tenant can answer an
+identical request from another without spending either's rate limit.
+Library (biblib) endpoints are private and never cached, and neither are
+requests that mention a library (``docs(library/<id>)``), since searches
+can read a private library that way.
+
+Expired responses are kept (until evicted) for ``STALE_FOR`` seconds, to be
+served, marked as stale, while ADS is unavailable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from mcp_server_ads.config import ADS_PUBLIC_CACHE_BYTES
+
+PUBLIC_PREFIXES = (
+    "/v1/search/",
+    "/v1/export/",
+    "/v1/metrics",
+    "/v1/resolver/",
+    "/v1/objects",
+    "/v1/reference",
+    "/v1/vis/",
+    "/v1/citation_helper",
+)
+
+_LIBRARY_REFERENCE = re.compile(r"library\s*/", re.IGNORECASE)
+
+STALE_FOR = 86400.0
+"""Seconds after expiry a response may still be served stale."""
+
+MAX_BODY_SHARE = 0.1
+"""Largest share of a cache's byte budget one response may take; bigger ones aren't kept."""
+
+
+def is_public(path: str, kwargs: dict[str, Any] | None = None) -> bool:
+    """Whether the response is the same for every token.
+
+    With ``kwargs``, requests that mention a library are not.
+    """
+    if not path.startswith(PUBLIC_PREFIXES):
+        return False
+    return kwargs is None or not _LIBRARY_REFERENCE.search(_request_parts(kwargs))
+
+
+def request_key(method: str, path: str, kwargs: dict[str, Any]) -> str:
+    """Digest of everything that determines the response, except credentials."""
+    raw = json.dumps([method, path], default=str) + _request_parts(kwargs)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _request_parts(kwargs: dict[str, Any]) -> str:
+    parts = {k: kwargs[k] for k in ("params", "json", "content", "data") if k in kwargs}
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    content_type: str
+    expires: float
+
+
+class ResponseCache:
+    """LRU of response bodies that expire ``ttl`` seconds after being fetched.
+
+    Holds at most ``max_entries`` responses and ``max_bytes`` of bodies.
+    """
+
+    def __init__(
+        self, ttl: float, max_entries: int = 1000, max_bytes: int = ADS_PUBLIC_CACHE_BYTES
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires < time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def age(self, entry: CachedResponse) -> float:
+        """Seconds since ``entry`` was fetched."""
+        return time.monotonic() - (entry.expires - self.ttl)
+
+    def stale(self, key: str) -> CachedResponse | None:
+        """The response for ``key`` even if expired, unless older than ``STALE_FOR``."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires < time.monotonic() - STALE_FOR:
+            return None
+        return entry
+
+    def fits(self, body: bytes) -> bool:
+        return len(body) <= self.max_bytes * MAX_BODY_SHARE
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        if not self.fits(body):
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old.body)
+        self._entries[key] = CachedResponse(body, content_type, time.monotonic() + self.ttl)
+        self.size += len(body)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.body)
@@ -0,0 +1,209 @@
+"""Record ADS traffic to a cassette file and replay it without the network.
+
+A cassette is JSON Lines (gzip-compressed when the name ends in ``.gz``):
+a header line, then one entry per request with the method, path and query,
+a digest of the request body, the response status, its content type and
+rate-limit headers, the body, and timing (``offset``, when the request was
+sent after the first one, and ``elapsed``, how long its response took).
+Authorization headers are never written.
+
+``RecordingTransport`` wraps the real transport; ``ReplayTransport`` serves
+entries back, either as fast as possible or with the recorded timing.
+Requests with no recording get a 404, which the client raises as
+``ADSNotFoundError``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Any, Literal
+
+import httpx
+
+from mcp_server_ads.config import ADS_MAX_RESPONSE_BYTES
+from mcp_server_ads.errors import ADSResponseTooLargeError
+
+CASSETTE_VERSION = 1
+
+RECORDED_HEADERS = (
+    "content-type",
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+)
+
+Timing = Literal["fast", "original"]
+
+Key = tuple[str, str, str, str]
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def request_key(method: str, url: httpx.URL, body: bytes) -> Key:
+    """Match requests on method, path, sorted query parameters and body digest."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(url.params.multi_items()))
+    digest = hashlib.sha1(body).hexdigest()[:16] if body else ""
+    return method, url.path, query, digest
+
+
+def _entry_key(entry: dict[str, Any]) -> Key:
+    return entry["method"], entry["path"], entry["query"], entry["body_sha1"]
+
+
+def _encode_body(body: bytes) -> dict[str, str]:
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(entry: dict[str, Any]) -> bytes:
+    if "b64" in entry:
+        return base64.b64decode(entry["b64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+def load_cassette(path: Path | str) -> list[dict[str, Any]]:
+    """Read the entries of a cassette, skipping the header."""
+    with _open(Path(path), "r") as fh:
+        lines = [json.loads(line) for line in fh if line.strip()]
+    if not lines or lines[0].get("cassette") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+    return lines[1:]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests to ``inner`` and append each exchange to a cassette.
+
+    Responses are read fully before being handed back, so the recorded
+    ``elapsed`` includes the body transfer; one larger than ``max_bytes``
+    raises ``ADSResponseTooLargeError`` as soon as that shows and is not
+    recorded. Entries are flushed as they are written; the file is closed
+    with the client.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        path: Path | str,
+        max_bytes: int = ADS_MAX_RESPONSE_BYTES,
+    ):
+        self._inner = inner
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = _open(self.path, "w")
+        self._started: float | None = None
+        self.count = 0
+        self._write({"cassette": CASSETTE_VERSION, "recorded_at": time.time()})
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        self._fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        if self._started is None:
+            self._started = time.monotonic()
+        offset = time.monotonic() - self._started
+        start = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        try:
+            content = await self._read(request, response)
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - start
+        headers = {k: response.headers[k] for k in RECORDED_HEADERS if k in response.headers}
+        method, path, query, digest = request_key(request.method, request.url, body)
+        self._write({
+            "method": method,
+            "path": path,
+            "query": query,
+            "body_sha1": digest,
+            "status": response.status_code,
+            "headers": headers,
+            "offset": round(offset, 4),
+            "elapsed": round(elapsed, 4),
+            **_encode_body(content),
+        })
+        self.count += 1
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    async def _read(self, request: httpx.Request, response: httpx.Response) -> bytes:
+        """The body, decoded (so content-encoding is not among the stored headers)."""
+        too_large = ADSResponseTooLargeError(
+            f"{request.url.path} response exceeded {self.max_bytes:,} bytes"
+        )
+        declared = response.headers.get("content-length")
+        if declared is not None and int(declared) > self.max_bytes:
+            raise too_large
+        chunks: list[bytes] = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > self.max_bytes:
+                raise too_large
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def aclose(self) -> None:
+        self._fh.close()
+        await self._inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve responses from a cassette instead of the network.
+
+    Repeated identical requests get the recorded responses in order; once
+    those run out the last one is served again, so a short recording can
+    drive a longer load test. With ``timing="original"`` responses keep
+    their recorded pacing: each is held until its recorded ``offset`` plus
+    ``elapsed`` after the first replayed request, and for at least its
+    ``elapsed``, so a client that sends faster than the recording is slowed
+    to it.
+    """
+
+    def __init__(self, path: Path | str, timing: Timing = "fast"):
+        self.path = Path(path)
+        self.timing = timing
+        self._entries: dict[Key, list[dict[str, Any]]] = defaultdict(list)
+        for entry in load_cassette(self.path):
+            self._entries[_entry_key(entry)].append(entry)
+        self._served: dict[Key, int] = defaultdict(int)
+        self._started: float | None = None
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, request.url, await request.aread())
+        if self._started is None:
+            self._started = time.monotonic()
+        recorded = self._entries.get(key)
+        if not recorded:
+            self.misses += 1
+            return httpx.Response(
+                404, json={"error": f"no recorded response for {request.method} {request.url}"}
+            )
+        index = self._served[key]
+        self._served[key] = index + 1
+        entry = recorded[min(index, len(recorded) - 1)]
+        if self.timing == "original":
+            due = self._started + entry.get("offset", 0.0) + entry["elapsed"]
+            await asyncio.sleep(max(due - time.monotonic(), entry["elapsed"]))
+        return httpx.Response(
+            entry["status"], headers=entry["headers"], content=_decode_body(entry)
+        )
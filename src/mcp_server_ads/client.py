@@ -2,30 +2,123 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import json
+import logging
 import time
+from collections import deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, TypeVar
 
 import httpx
 from fastmcp.exceptions import ToolError
 
-from mcp_server_ads.config import ADS_API_URL
+from mcp_server_ads import deadlines, tracing
+from mcp_server_ads.batching import BibcodeBatcher, single_bibcode
+from mcp_server_ads.breaker import CircuitBreakers, note_stale
+from mcp_server_ads.cache import ResponseCache, is_public, request_key
+from mcp_server_ads.config import (
+    ADS_API_URL,
+    ADS_BATCH_WINDOW,
+    ADS_HEDGING,
+    ADS_MAX_RESPONSE_BYTES,
+    ADS_RECORD,
+    ADS_REPLAY,
+    ADS_REPLAY_TIMING,
+)
+from mcp_server_ads.decoding import loads
 from mcp_server_ads.errors import (
     ADSAuthError,
+    ADSDeadlineError,
     ADSNotFoundError,
     ADSRateLimitError,
+    ADSResponseTooLargeError,
     ADSServerError,
+    ADSUnavailableError,
 )
+from mcp_server_ads.quota import HISTORY_SECONDS, QuotaForecast, Spend, forecast
+from mcp_server_ads.stats import STATS, Stats, current_call, endpoint_name
+from mcp_server_ads.storage import atomic_write, read_json, write_json
+
+Sink = Path | str | IO[bytes] | Callable[[bytes], Any]
+"""Destination for streamed bodies: a file path, a binary file, or a callback."""
+
+SAVE_INTERVAL = 5.0
+"""Seconds between saves of a persisted ``RateLimitTracker`` (always saved when exhausted)."""
+
+MAX_HISTORY = 20000
+"""Most spends a ``RateLimitTracker`` remembers."""
+
+HEDGE_MIN_SAMPLES = 20
+"""Requests an endpoint needs before its p95 latency is trusted as a hedging delay."""
+
+HEDGE_RESERVE = 0.2
+"""Share of the rate limit that must remain for a read to be hedged."""
+
+VERIFY_PARAMS = {"q": "bibcode:0000", "rows": 0, "fl": "bibcode"}
+"""A search that returns nothing, sent once to check an unverified token."""
+
+STALE_ENTRIES = 256
+STALE_MAX_BYTES = 1024**2
+"""Public responses kept to serve while ADS is unavailable, without a public cache."""
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class RateLimitTracker:
-    """Tracks ADS API rate-limit headers."""
+    """Tracks ADS API rate-limit headers and the requests spent against them.
+
+    With a ``path`` the state is reloaded from there on creation and saved
+    back as it changes, so a restarted server still knows an exhausted quota
+    and the recent spend rate. Spends are appended to a ``.jsonl`` file next
+    to ``path``, which is rewritten only once most of it has expired. State
+    saved for another ``tenant`` (a different token) is discarded.
+    """
 
     limit: int | None = None
     remaining: int | None = None
     reset: float | None = None
+    path: Path | None = None
+    tenant: str | None = None
+    history: deque[Spend] = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORY), repr=False
+    )
     _last_updated: float = field(default_factory=time.monotonic)
+    _last_saved: float = field(default=0.0, repr=False)
+    _unsaved: list[Spend] = field(default_factory=list, repr=False)
+    _logged: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.path is None:
+            return
+        saved = read_json(self.path, {})
+        if saved.get("tenant") != self.tenant:
+            if saved:
+                self._compact()  # the other token's spends
+            self._last_saved = time.monotonic()
+            return
+        self.limit = saved.get("limit")
+        self.remaining = saved.get("remaining")
+        self.reset = saved.get("reset")
+        damaged = False
+        for line in _read_lines(self.path.with_suffix(".jsonl")):
+            self._logged += 1
+            try:
+                self.history.append(Spend(*json.loads(line)))
+            except (ValueError, TypeError):
+                damaged = True  # a line cut short by a crash
+        cutoff = time.time() - HISTORY_SECONDS
+        while self.history and self.history[0].at < cutoff:
+            self.history.popleft()
+        if damaged:
+            self._compact()
+        self._last_saved = time.monotonic()
 
     def update(self, headers: httpx.Headers) -> None:
         rl = headers.get("x-ratelimit-limit")
@@ -38,6 +131,63 @@ class RateLimitTracker:
         if rs is not None:
             self.reset = float(rs)
         self._last_updated = time.monotonic()
+        self._maybe_save()
+
+    def spend(self) -> None:
+        """Charge a request about to be sent, until its response reports the budget."""
+        if self.remaining:
+            self.remaining -= 1
+        spend = Spend(time.time(), *current_call())
+        self.record(spend)
+        if self.path is not None:
+            self._unsaved.append(spend)
+        self._maybe_save()
+
+    def record(self, spend: Spend) -> None:
+        self.history.append(spend)
+        while self.history[0].at < spend.at - HISTORY_SECONDS:
+            self.history.popleft()
+
+    def recent(self, since: float) -> list[Spend]:
+        """Spends made at or after epoch ``since``."""
+        return [s for s in self.history if s.at >= since]
+
+    def forecast(self, now: float | None = None) -> QuotaForecast:
+        now = time.time() if now is None else now
+        return forecast(
+            self.limit, self.remaining, self.reset, self.recent(now - HISTORY_SECONDS), now
+        )
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        write_json(self.path, {
+            "tenant": self.tenant,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset": self.reset,
+        })
+        if self._logged + len(self._unsaved) > 2 * len(self.history):
+            self._compact()
+        elif self._unsaved:
+            with self.path.with_suffix(".jsonl").open("a", encoding="utf-8") as fh:
+                fh.writelines(json.dumps(s) + "\n" for s in self._unsaved)
+            self._logged += len(self._unsaved)
+            self._unsaved.clear()
+        self._last_saved = time.monotonic()
+
+    def _compact(self) -> None:
+        """Rewrite the spend log with just the remembered history."""
+        with atomic_write(self.path.with_suffix(".jsonl")) as fh:
+            fh.writelines(json.dumps(s) + "\n" for s in self.history)
+        self._logged = len(self.history)
+        self._unsaved.clear()
+
+    def _maybe_save(self) -> None:
+        if self.path is not None and (
+            self.exhausted or time.monotonic() - self._last_saved >= SAVE_INTERVAL
+        ):
+            self.save()
 
     @property
     def exhausted(self) -> bool:
@@ -56,6 +206,13 @@ class RateLimitTracker:
         return f"{remaining}/{self.limit} requests remaining (resets at epoch {self.reset})"
 
 
+def _read_lines(path: Path) -> list[str]:
+    try:
+        return path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+
+
 def _raise_for_status(response: httpx.Response) -> None:
     """Map ADS HTTP errors to typed exceptions."""
     if response.is_success:
@@ -77,27 +234,163 @@ def _raise_for_status(response: httpx.Response) -> None:
     response.raise_for_status()
 
 
+def _retry_after(headers: httpx.Headers) -> float | None:
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _ago(seconds: float) -> str:
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def http_pool(
+    base_url: str | None = None,
+    record: str | Path | None = None,
+    replay: str | Path | None = None,
+) -> httpx.AsyncClient:
+    """An HTTP client for the ADS API without credentials, which are per request.
+
+    Wraps the transport for cassette recording or replay when ``record``
+    (default ``ADS_RECORD``) or ``replay`` (default ``ADS_REPLAY``) is set.
+    """
+    from mcp_server_ads.cassette import RecordingTransport, ReplayTransport
+
+    record = record or ADS_RECORD
+    replay = replay or ADS_REPLAY
+    transport: httpx.AsyncBaseTransport | None = None
+    if replay:
+        transport = ReplayTransport(replay, ADS_REPLAY_TIMING)  # type: ignore[arg-type]
+    if record:
+        transport = RecordingTransport(transport or httpx.AsyncHTTPTransport(), record)
+    return httpx.AsyncClient(base_url=base_url or ADS_API_URL, timeout=30.0, transport=transport)
+
+
 class ADSClient:
-    """Async HTTP client for the ADS API."""
+    """Async HTTP client for the ADS API.
 
-    def __init__(self, http: httpx.AsyncClient, rate_limits: RateLimitTracker | None = None):
-        self._http = http
+    ``headers`` (the token) are sent with every request, so several clients
+    with different tokens can share one ``httpx.AsyncClient`` connection pool.
+    Successful responses from public endpoints are served from and stored
+    in ``public_cache`` when one is given.
+
+    With ``hedging``, a read still unanswered after its endpoint's p95
+    latency is sent a second time while enough of the rate limit remains,
+    and whichever response arrives first is used. Requests made under a
+    deadline (see ``mcp_server_ads.deadlines``) raise ``ADSDeadlineError``
+    when it passes.
+
+    Each endpoint family has a circuit breaker (see ``mcp_server_ads.breaker``).
+    While one is open, public reads are answered from earlier responses, even
+    expired ones, and anything else fails at once with ``ADSUnavailableError``.
+
+    A client created with ``verified=False`` (a token nobody has vouched for)
+    checks its token with ADS before its first request, including one the
+    public cache could answer; see ``verify``.
+    """
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient | Callable[[], httpx.AsyncClient],
+        rate_limits: RateLimitTracker | None = None,
+        batch_window: float = ADS_BATCH_WINDOW,
+        max_response_bytes: int = ADS_MAX_RESPONSE_BYTES,
+        stats: Stats = STATS,
+        headers: dict[str, str] | None = None,
+        public_cache: ResponseCache | None = None,
+        hedging: bool = ADS_HEDGING,
+        verified: bool = True,
+    ):
+        self._http_client = http if isinstance(http, httpx.AsyncClient) else None
+        self._http_factory = http
+        self._headers = headers or {}
+        self.public_cache = public_cache
+        self._stale = public_cache if public_cache is not None else ResponseCache(0, STALE_ENTRIES)
+        self.hedging = hedging
+        self.breakers = CircuitBreakers()
         self.rate_limits = rate_limits or RateLimitTracker()
+        self.stats = stats
+        self.max_response_bytes = max_response_bytes
+        self._batcher = BibcodeBatcher(self, batch_window) if batch_window > 0 else None
+        self._doc_listeners: list[Callable[[list[dict[str, Any]]], Any]] = []
+        self.verified = verified
+        self._verifying = asyncio.Lock()
 
     @classmethod
-    def create(cls, token: str | None = None, base_url: str | None = None) -> ADSClient:
+    def create(
+        cls,
+        token: str | None = None,
+        base_url: str | None = None,
+        record: str | Path | None = None,
+        replay: str | Path | None = None,
+    ) -> ADSClient:
+        """Build a client for ``base_url`` on its own connection pool.
+
+        With ``record`` (default ``ADS_RECORD``) every exchange is written to
+        that cassette; with ``replay`` (default ``ADS_REPLAY``) responses come
+        from a cassette and no token is needed.
+        """
         import os
 
         token = token or os.environ.get("ADS_API_TOKEN", "")
-        base_url = base_url or ADS_API_URL
-        if not token:
+        if not token and not (replay or ADS_REPLAY):
             raise ADSAuthError("ADS_API_TOKEN environment variable is not set.")
-        http = httpx.AsyncClient(
-            base_url=base_url,
+        return cls(
+            functools.partial(http_pool, base_url, record, replay),
             headers={"Authorization": f"Bearer {token}"},
-            timeout=30.0,
         )
-        return cls(http)
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        """The HTTP client, built on first use when given a factory.
+
+        Building one loads the TLS trust store, which is a noticeable part of
+        server startup, so ``create`` defers it to the first request.
+        """
+        if self._http_client is None:
+            self._http_client = self._http_factory()  # type: ignore[operator]
+        return self._http_client
+
+    def add_doc_listener(self, listener: Callable[[list[dict[str, Any]]], Any]) -> None:
+        """Call ``listener`` with the docs of every search response received."""
+        self._doc_listeners.append(listener)
+
+    def _decode(self, body: bytes) -> Any:
+        with tracing.span("ads.decode", **{"ads.response_bytes": len(body)}):
+            data = loads(body)
+        if self._doc_listeners and isinstance(data, dict):
+            docs = data.get("response", {}).get("docs") if "response" in data else None
+            if docs:
+                for listener in self._doc_listeners:
+                    try:
+                        listener(docs)
+                    except Exception:
+                        # A listener's bookkeeping must not fail the request that fed it.
+                        logger.exception("Doc listener %r failed", listener)
+        return data
+
+    async def verify(self) -> None:
+        """Make sure ADS accepts the token, asking it once if not known yet.
+
+        Raises ``ADSAuthError`` (or the error ADS answered with) otherwise.
+        """
+        if self.verified:
+            return
+        path = "/v1/search/query"
+        async with self._verifying:
+            if self.verified:
+                return
+            resp = await self._bounded(
+                path, self._http.get(path, params=VERIFY_PARAMS, headers=self._headers)
+            )
+            _raise_for_status(resp)
+            self.verified = True
+            self.rate_limits.update(resp.headers)
 
     def _check_rate_limit(self) -> None:
         if self.rate_limits.exhausted:
@@ -105,41 +398,225 @@ class ADSClient:
                 f"ADS rate limit exhausted. {self.rate_limits.status_summary()}"
             )
 
-    async def get(self, path: str, **kwargs: Any) -> dict[str, Any]:
+    @asynccontextmanager
+    async def _stream(
+        self, method: str, path: str, max_bytes: int | None, **kwargs: Any
+    ) -> AsyncIterator[tuple[httpx.Response, AsyncIterator[bytes]]]:
+        """Open a response and yield it with its body chunks, enforcing ``max_bytes``."""
+        await self.verify()
+        left = deadlines.remaining()
+        if left is not None and left <= 0:
+            raise ADSDeadlineError(f"Deadline passed before requesting {endpoint_name(path)}")
         self._check_rate_limit()
-        resp = await self._http.get(path, **kwargs)
-        self.rate_limits.update(resp.headers)
-        _raise_for_status(resp)
-        return resp.json()
+        breaker = self.breakers.for_path(path)
+        probe = breaker.allow()
+        self.rate_limits.spend()
+        limit = self.max_response_bytes if max_bytes is None else max_bytes
+        start = time.perf_counter()
+        received = 0
+        failed = True
+        with tracing.span(
+            f"ADS {method} {endpoint_name(path)}",
+            **{"http.request.method": method, "url.path": path},
+        ) as span:
+            try:
+                headers = {**self._headers, **kwargs.pop("headers", {})}
+                async with self._http.stream(method, path, headers=headers, **kwargs) as resp:
+                    self.rate_limits.update(resp.headers)
+                    if span is not None:
+                        span.set_attribute("http.response.status_code", resp.status_code)
+                    if resp.status_code == 429 or resp.status_code >= 500:
+                        breaker.failed(_retry_after(resp.headers))
+                    else:
+                        breaker.succeeded()
+                    if not resp.is_success:
+                        await resp.aread()
+                        received = len(resp.content)
+                        _raise_for_status(resp)
+                    declared = resp.headers.get("content-length")
+                    if declared is not None and int(declared) > limit:
+                        raise ADSResponseTooLargeError(
+                            f"{path} response is {int(declared):,} bytes (limit {limit:,})"
+                        )
+
+                    async def chunks() -> AsyncIterator[bytes]:
+                        nonlocal received
+                        async for chunk in resp.aiter_bytes():
+                            received += len(chunk)
+                            if received > limit:
+                                raise ADSResponseTooLargeError(
+                                    f"{path} response exceeded {limit:,} bytes"
+                                )
+                            yield chunk
+
+                    yield resp, chunks()
+                    failed = False
+            except httpx.TransportError:
+                breaker.failed()
+                raise
+            except asyncio.CancelledError:
+                # Abandoned (e.g. the losing copy of a hedged read), not failed.
+                failed = False
+                raise
+            finally:
+                if probe:
+                    breaker.release()
+                self.stats.record_request(path, time.perf_counter() - start, received, failed)
+                if span is not None:
+                    span.set_attribute("ads.response_bytes", received)
+                    if self.rate_limits.remaining is not None:
+                        span.set_attribute("ads.rate_limit.remaining", self.rate_limits.remaining)
+
+    async def _request(
+        self, method: str, path: str, **kwargs: Any
+    ) -> tuple[httpx.Response, bytes]:
+        """Send a request and return the response with its size-capped body."""
+        await self.verify()
+        public = is_public(path, kwargs)
+        if public:
+            key = request_key(method, path, kwargs)
+            hit = None if self.public_cache is None else self.public_cache.get(key)
+            if hit is not None:
+                return httpx.Response(200, headers={"content-type": hit.content_type}), hit.body
+        try:
+            resp, body = await self._bounded(path, self._hedged(method, path, kwargs))
+        except ADSUnavailableError as exc:
+            stale = self._stale.stale(key) if public else None
+            if stale is None:
+                raise
+            age = self._stale.age(stale)
+            note_stale(
+                f"{exc} Showing a response for {endpoint_name(path)} fetched {_ago(age)} ago.",
+                age,
+                exc.retry_in,
+            )
+            return httpx.Response(200, headers={"content-type": stale.content_type}), stale.body
+        # The public cache keeps everything; the fallback store only modest bodies.
+        if public and (self._stale is self.public_cache or len(body) <= STALE_MAX_BYTES):
+            self._stale.put(key, body, resp.headers.get("content-type", ""))
+        return resp, body
+
+    async def _fetch(
+        self, method: str, path: str, kwargs: dict[str, Any]
+    ) -> tuple[httpx.Response, bytes]:
+        async with self._stream(method, path, None, **kwargs) as (resp, chunks):
+            body = b"".join([chunk async for chunk in chunks])
+        return resp, body
+
+    def _hedge_delay(self, method: str, path: str) -> float | None:
+        """Seconds to wait before duplicating a request, or None to never do so."""
+        if not self.hedging or not (method == "GET" or is_public(path)):
+            return None  # Only reads are safe to send twice.
+        series = self.stats.endpoints.get(endpoint_name(path))
+        if series is None or series.latency.count < HEDGE_MIN_SAMPLES:
+            return None
+        return series.latency.quantile(0.95)
+
+    def _can_hedge(self) -> bool:
+        limits = self.rate_limits
+        if limits.limit is None or limits.remaining is None:
+            return False
+        return limits.remaining > limits.limit * HEDGE_RESERVE
+
+    async def _hedged(
+        self, method: str, path: str, kwargs: dict[str, Any]
+    ) -> tuple[httpx.Response, bytes]:
+        """Fetch, sending a second copy if the first is slow; the first success wins."""
+        delay = self._hedge_delay(method, path)
+        if delay is None:
+            return await self._fetch(method, path, kwargs)
+        first = asyncio.ensure_future(self._fetch(method, path, kwargs))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._can_hedge():
+                return await first
+            self.stats.record_hedge(path)
+            tasks.add(asyncio.ensure_future(self._fetch(method, path, kwargs)))
+            errors = []
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _bounded(self, path: str, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable`` until the current deadline, if there is one."""
+        left = deadlines.remaining()
+        if left is None:
+            return await awaitable
+        try:
+            async with asyncio.timeout(max(left, 0)):
+                return await awaitable
+        except TimeoutError:
+            raise ADSDeadlineError(
+                f"{endpoint_name(path)} did not answer before the deadline"
+            ) from None
+
+    async def get(self, path: str, batch: bool = True, **kwargs: Any) -> dict[str, Any]:
+        """GET returning JSON.
+
+        Exact ``bibcode:X`` searches are merged with concurrent ones into a
+        single bigquery unless ``batch`` is False.
+        """
+        if batch and self._batcher is not None and path == "/v1/search/query":
+            bibcode = single_bibcode(kwargs.get("params"))
+            if bibcode is not None and kwargs.keys() == {"params"}:
+                return await self._bounded(path, self._batcher.lookup(bibcode, kwargs["params"]))
+        _, body = await self._request("GET", path, **kwargs)
+        return self._decode(body)
 
     async def post(self, path: str, **kwargs: Any) -> dict[str, Any]:
-        self._check_rate_limit()
-        resp = await self._http.post(path, **kwargs)
-        self.rate_limits.update(resp.headers)
-        _raise_for_status(resp)
-        return resp.json()
+        _, body = await self._request("POST", path, **kwargs)
+        return self._decode(body)
 
     async def put(self, path: str, **kwargs: Any) -> dict[str, Any]:
-        self._check_rate_limit()
-        resp = await self._http.put(path, **kwargs)
-        self.rate_limits.update(resp.headers)
-        _raise_for_status(resp)
-        return resp.json()
+        _, body = await self._request("PUT", path, **kwargs)
+        return self._decode(body)
 
     async def delete(self, path: str, **kwargs: Any) -> dict[str, Any]:
-        self._check_rate_limit()
-        resp = await self._http.delete(path, **kwargs)
-        self.rate_limits.update(resp.headers)
-        _raise_for_status(resp)
-        return resp.json()
+        _, body = await self._request("DELETE", path, **kwargs)
+        return self._decode(body)
 
     async def post_raw(self, path: str, **kwargs: Any) -> str:
         """POST returning raw text (e.g. export endpoints)."""
-        self._check_rate_limit()
-        resp = await self._http.post(path, **kwargs)
-        self.rate_limits.update(resp.headers)
-        _raise_for_status(resp)
-        return resp.text
+        resp, body = await self._request("POST", path, **kwargs)
+        return body.decode(resp.encoding or "utf-8")
+
+    async def stream_to(
+        self,
+        method: str,
+        path: str,
+        sink: Sink,
+        max_bytes: int | None = None,
+        **kwargs: Any,
+    ) -> int:
+        """Stream a response body into ``sink`` without buffering it in memory.
+
+        A path sink is written to a temporary file and moved into place only
+        when the whole body arrived. Raises ``ADSResponseTooLargeError`` once
+        more than ``max_bytes`` (default: ``max_response_bytes``) are received.
+        Returns the number of bytes written.
+        """
+        written = 0
+        async with self._stream(method, path, max_bytes, **kwargs) as (_, chunks):
+            if isinstance(sink, (str, Path)):
+                with atomic_write(Path(sink), "wb") as fh:
+                    async for chunk in chunks:
+                        written += fh.write(chunk)
+                return written
+            write = sink.write if hasattr(sink, "write") else sink
+            async for chunk in chunks:
+                write(chunk)
+                written += len(chunk)
+        return written
 
     async def close(self) -> None:
-        await self._http.aclose()
+        if self._http_client is not None:
+            await self._http_client.aclose()
@@ -3,5 +3,62 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
 ADS_API_URL: str = os.environ.get("ADS_API_URL", "https://api.adsabs.harvard.edu")
+
+ADS_BATCH_WINDOW: float = float(os.environ.get("ADS_BATCH_WINDOW_MS", "5")) / 1000
+"""How long single-bibcode lookups are held to be merged into one bigquery (0 disables)."""
+
+ADS_CACHE_DIR: Path = Path(
+    os.environ.get("ADS_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mcp-server-ads"
+)
+"""Directory for local state such as the library mirror."""
+
+ADS_MAX_RESPONSE_BYTES: int = int(os.environ.get("ADS_MAX_RESPONSE_BYTES", str(64 * 1024**2)))
+"""Largest response body the client will read before aborting the request."""
+
+ADS_METRICS_PATH: str = os.environ.get("ADS_METRICS_PATH", "")
+"""HTTP path serving Prometheus metrics under HTTP transports (empty, the default, disables)."""
+
+ADS_TRACING: bool = os.environ.get("ADS_TRACING", "").lower() in ("1", "true", "yes")
+"""Emit OpenTelemetry spans for ADS requests, decoding and formatting."""
+
+ADS_RECORD: str = os.environ.get("ADS_RECORD", "")
+"""Cassette file to record all ADS traffic to (``.gz`` compresses it)."""
+
+ADS_REPLAY: str = os.environ.get("ADS_REPLAY", "")
+"""Cassette file to serve ADS responses from instead of the network."""
+
+ADS_REPLAY_TIMING: str = os.environ.get("ADS_REPLAY_TIMING", "fast")
+"""``fast`` replays immediately; ``original`` keeps the recorded latencies and request gaps."""
+
+ADS_MULTI_TENANT: bool = os.environ.get("ADS_MULTI_TENANT", "").lower() in ("1", "true", "yes")
+"""Serve each HTTP session with the ADS token it sends instead of ``ADS_API_TOKEN``."""
+
+ADS_TOKEN_HEADER: str = os.environ.get("ADS_TOKEN_HEADER", "X-ADS-API-Token")
+"""Request header carrying a session's ADS token in multi-tenant mode."""
+
+ADS_PUBLIC_CACHE_TTL: float = float(
+    os.environ.get("ADS_PUBLIC_CACHE_TTL", "300" if ADS_MULTI_TENANT else "0")
+)
+"""Seconds public responses (search, export, metrics, ...) are shared; 0 disables."""
+
+ADS_PUBLIC_CACHE_BYTES: int = int(os.environ.get("ADS_PUBLIC_CACHE_BYTES", str(256 * 1024**2)))
+"""Total size of the response bodies the public cache holds; the least recently used go first."""
+
+ADS_MAX_TENANTS: int = int(os.environ.get("ADS_MAX_TENANTS", "100"))
+"""Tenants kept in memory in multi-tenant mode; the least recently used idle ones are dropped."""
+
+ADS_WORKERS: int = int(os.environ.get("ADS_WORKERS", "1"))
+"""Worker processes serving streamable HTTP; above 1 they share ``ADS_STATE_FILE``."""
+
+ADS_STATE_FILE: Path = Path(os.environ.get("ADS_STATE_FILE") or ADS_CACHE_DIR / "state.sqlite")
+"""SQLite file holding the response cache and rate limits shared by workers."""
+
+ADS_TOOL_DEADLINE: float = float(os.environ.get("ADS_TOOL_DEADLINE", "45"))
+"""Seconds a tool call may wait on ADS before returning partial results or failing (0 disables)."""
+
+ADS_HEDGING: bool = os.environ.get("ADS_HEDGING", "").lower() in ("1", "true", "yes")
+"""Duplicate reads slower than their endpoint's p95 latency and use whichever answers first."""
@@ -0,0 +1,158 @@
+"""Persistent DOI / arXiv ID / bibcode crosswalk."""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Literal
+
+from mcp_server_ads.bibcodes import is_valid, normalize
+
+IdentifierType = Literal["doi", "arxiv", "bibcode"]
+
+BUSY_TIMEOUT = 30.0
+"""Seconds a write waits while another server worker writes the same file."""
+
+logger = logging.getLogger(__name__)
+
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+_ARXIV_PREFIX = re.compile(r"^(?:https?://arxiv\.org/(?:abs|pdf)/|arxiv:)", re.IGNORECASE)
+_ARXIV_NEW = re.compile(r"^\d{4}\.\d{4,5}$")
+_ARXIV_OLD = re.compile(r"^[a-z\-]+(?:\.[a-z]{2})?/\d{7}$", re.IGNORECASE)
+_ARXIV_VERSION = re.compile(r"v\d+$")
+
+
+def classify(identifier: str) -> tuple[IdentifierType, str] | None:
+    """Return the identifier type and its normalized lookup key, or None.
+
+    DOIs are case-insensitive and keyed in lower case; arXiv IDs are keyed as
+    ``arxiv:<id>`` without a version suffix; bibcodes are kept as they are.
+    """
+    ident = identifier.strip()
+    bare = _DOI_PREFIX.sub("", ident)
+    if bare.startswith("10.") and "/" in bare:
+        return "doi", bare.lower()
+    bare = _ARXIV_VERSION.sub("", _ARXIV_PREFIX.sub("", ident).removesuffix(".pdf"))
+    if _ARXIV_NEW.match(bare) or _ARXIV_OLD.match(bare):
+        return "arxiv", f"arxiv:{bare.lower()}"
+    bibcode = normalize(ident)
+    if is_valid(bibcode):
+        return "bibcode", bibcode
+    return None
+
+
+def query_term(kind: IdentifierType, key: str) -> str:
+    """ADS ``identifier:`` search term for a normalized key."""
+    if kind == "arxiv":
+        return f'identifier:"arXiv:{key.removeprefix("arxiv:")}"'
+    return f'identifier:"{key}"'
+
+
+class CrosswalkIndex:
+    """Maps identifiers seen in ADS docs to their canonical bibcodes.
+
+    Fed from every search response through ``ADSClient.add_doc_listener`` and
+    persisted in SQLite, so repeat lookups don't need the network. Observed
+    identifiers are written in batches on a background thread, since the
+    file may be busy with another worker's write; until then lookups find
+    them in memory. A batch that can't be written is dropped.
+    """
+
+    def __init__(self, path: Path | None = None):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(":memory:" if path is None else path, timeout=BUSY_TIMEOUT)
+        if path is not None:
+            # Lets server workers sharing the file read while another writes.
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ids (key TEXT PRIMARY KEY, bibcode TEXT NOT NULL)"
+        )
+        self._writer: ThreadPoolExecutor | None = None
+        self._write_db = self._db
+        if path is not None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crosswalk")
+            self._write_db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._pending: dict[str, str] = {}
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def observe(self, docs: Iterable[dict[str, Any]]) -> None:
+        """Record the identifiers of ADS docs."""
+        rows = {}
+        for doc in docs:
+            bibcode = doc.get("bibcode")
+            if not bibcode:
+                continue
+            rows[bibcode] = bibcode
+            idents = [
+                *doc.get("identifier", []), *doc.get("doi", []), *doc.get("alternate_bibcode", [])
+            ]
+            for ident in idents:
+                if (found := classify(ident)) is not None:
+                    rows[found[1]] = bibcode
+        if not rows:
+            return
+        with self._lock:
+            self._pending.update(rows)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        if self._writer is None:
+            self._write()
+        else:
+            self._writer.submit(self._write)
+
+    def flush(self) -> None:
+        """Wait until everything observed so far is written."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def _write(self) -> None:
+        with self._lock:
+            self._scheduled = False
+            batch = dict(self._pending)
+        try:
+            with self._write_db as db:
+                db.executemany("INSERT OR REPLACE INTO ids VALUES (?, ?)", batch.items())
+        except sqlite3.Error as exc:
+            logger.warning("Dropped %d crosswalk entries: %s", len(batch), exc)
+        with self._lock:
+            for key, bibcode in batch.items():
+                if self._pending.get(key) == bibcode:
+                    del self._pending[key]
+
+    def lookup(self, keys: Iterable[str], record: bool = True) -> dict[str, str]:
+        """Return the bibcodes known for normalized ``keys``.
+
+        ``record`` counts the lookup towards the hit/miss statistics.
+        """
+        keys = list(keys)
+        with self._lock:
+            found = {key: self._pending[key] for key in keys if key in self._pending}
+        stored = [key for key in keys if key not in found]
+        for i in range(0, len(stored), 500):
+            chunk = stored[i : i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(
+                self._db.execute(f"SELECT key, bibcode FROM ids WHERE key IN ({marks})", chunk)
+            )
+        if record:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM ids").fetchone()[0]
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._write_db.close()
+        self._db.close()
@@ -0,0 +1,64 @@
+"""Deadlines bounding how long a tool call waits on ADS.
+
+``DeadlineMiddleware`` gives every tool call ``ADS_TOOL_DEADLINE`` seconds.
+``ADSClient`` cuts requests short at the deadline of the call that made them
+and raises ``ADSDeadlineError``, which composite tools catch to return the
+results they already have instead of failing the whole call. Chunked
+library writes instead stop starting new requests once the deadline passes
+and let those in flight finish, so no write is abandoned halfway.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from mcp_server_ads.config import ADS_TOOL_DEADLINE
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Finish within ``seconds``, or sooner if an enclosing deadline says so."""
+    end = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(end if outer is None else min(outer, end))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def unbounded() -> Iterator[None]:
+    """Lift the deadline, e.g. for background tasks that outlive the call starting them."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlineMiddleware(Middleware):
+    """Sets a deadline for each tool call."""
+
+    def __init__(self, seconds: float = ADS_TOOL_DEADLINE):
+        self.seconds = seconds
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        if self.seconds <= 0:
+            return await call_next(context)
+        with deadline(self.seconds):
+            return await call_next(context)
@@ -0,0 +1,157 @@
+"""JSON decoding for ADS responses, using orjson when it is installed."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when the extra is missing
+    orjson = None
+
+
+def loads(content: bytes) -> Any:
+    """Decode a JSON response body straight from bytes.
+
+    Decoding the raw bytes skips the intermediate ``str`` that
+    ``httpx.Response.json()`` builds, and orjson (``pip install
+    mcp-server-ads[fast]``) is several times faster than the stdlib on large
+    search and bigquery payloads.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRING_SPECIAL = re.compile(r'["\\]')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_WHITESPACE = " \t\r\n"
+
+
+class StringField:
+    """Decodes one top-level string field of a JSON object as the body streams in.
+
+    ``feed`` takes raw body chunks and hands the decoded text of ``field`` to
+    ``write`` piece by piece, so a large value (an ``export`` response, say)
+    never sits in memory whole; other fields are skipped. ``close`` raises
+    ``ValueError`` if the body ended before the object did.
+    """
+
+    def __init__(self, field: str, write: Callable[[str], object]):
+        self.field = field
+        self._write = write
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._state = "start"
+        self._key: str | None = None
+        self._depth = 0
+
+    def feed(self, chunk: bytes, final: bool = False) -> None:
+        self._buf += self._utf8.decode(chunk, final)
+        self._buf = self._buf[self._parse(self._buf) :]
+
+    def close(self) -> None:
+        self.feed(b"", final=True)
+        if self._state != "done":
+            raise ValueError("JSON body ended before its object did")
+
+    def _parse(self, buf: str) -> int:
+        """Consume what can be parsed of ``buf``; return where the rest starts."""
+        i = 0
+        while i < len(buf):
+            c = buf[i]
+            if self._state == "string":
+                i = self._string(buf, i)
+                if i < 0:
+                    return -i - 1
+            elif self._state == "skip":
+                i = self._skip(buf, i)
+                if i < 0:
+                    return -i - 1
+            elif c in _WHITESPACE or (c == "," and self._state == "key"):
+                i += 1
+            elif self._state == "start" and c == "{":
+                self._state, i = "key", i + 1
+            elif self._state == "key" and c == "}":
+                self._state, i = "done", i + 1
+            elif self._state == "key" and c == '"':
+                match = _STRING.match(buf, i)
+                if match is None:
+                    return i
+                self._key = json.loads(match.group())
+                self._state, i = "colon", match.end()
+            elif self._state == "colon" and c == ":":
+                self._state, i = "value", i + 1
+            elif self._state == "value":
+                if self._key == self.field and c == '"':
+                    self._state, i = "string", i + 1
+                else:
+                    self._state, self._depth = "skip", 0
+            else:
+                raise ValueError(f"Unexpected {c!r} in JSON body")
+        return i
+
+    def _string(self, buf: str, i: int) -> int:
+        """Write the field's text from ``buf[i:]``; a negative result ``-n - 1``
+        means more data is needed from position ``n``."""
+        while True:
+            match = _STRING_SPECIAL.search(buf, i)
+            end = len(buf) if match is None else match.start()
+            if end > i:
+                self._write(buf[i:end])
+            if match is None:
+                return -len(buf) - 1
+            if buf[end] == '"':
+                self._state = "key"
+                return end + 1
+            escape = buf[end + 1 : end + 2]
+            if not escape:
+                return -end - 1
+            if escape != "u":
+                if escape not in _ESCAPES:
+                    raise ValueError(f"Invalid escape \\{escape} in JSON string")
+                self._write(_ESCAPES[escape])
+                i = end + 2
+                continue
+            # \uXXXX, and the low half right after it for a surrogate pair
+            unit = buf[end : end + 6]
+            if len(unit) < 6:
+                return -end - 1
+            if 0xD800 <= int(unit[2:], 16) < 0xDC00:
+                pair = buf[end + 6 : end + 8] == "\\u"
+                if len(buf) < end + (12 if pair else 8):
+                    return -end - 1
+                if pair:
+                    unit = buf[end : end + 12]
+            self._write(json.loads(f'"{unit}"'))
+            i = end + len(unit)
+
+    def _skip(self, buf: str, i: int) -> int:
+        """Skip the value of another field, like ``_string`` returns."""
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                match = _STRING.match(buf, i)
+                if match is None:
+                    return -i - 1
+                i = match.end()
+            elif c in "{[":
+                self._depth += 1
+                i += 1
+            elif c in "}]" and self._depth:
+                self._depth -= 1
+                i += 1
+            elif c in ",}" and not self._depth:
+                self._state = "key"
+                return i
+            else:
+                i += 1
+            if not self._depth and c in '"}]':
+                self._state = "key"
+                return i
+        return -i - 1
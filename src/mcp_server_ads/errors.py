@@ -21,3 +21,19 @@ class ADSRateLimitError(ADSError):
 
 class ADSServerError(ADSError):
     """ADS server error (HTTP 5xx)."""
+
+
+class ADSResponseTooLargeError(ADSError):
+    """Response body exceeded the configured size limit."""
+
+
+class ADSDeadlineError(ADSError):
+    """The tool call's deadline passed before ADS answered."""
+
+
+class ADSUnavailableError(ADSError):
+    """ADS keeps failing, so requests are refused until ``retry_in`` seconds pass."""
+
+    def __init__(self, message: str, retry_in: float):
+        super().__init__(message)
+        self.retry_in = retry_in
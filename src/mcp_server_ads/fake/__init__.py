@@ -0,0 +1,11 @@
+"""Local stand-in for the ADS API, for offline load tests and benchmarks.
+
+``create_app`` returns a Starlette app serving the ADS endpoints the server
+uses, backed by a synthetic ``Corpus``. Point ``ADS_API_URL`` at it, or pass
+``httpx.ASGITransport(app)`` to an ``httpx.AsyncClient`` to skip the network.
+"""
+
+from mcp_server_ads.fake.app import FakeADS, FakeConfig, Latency, create_app
+from mcp_server_ads.fake.corpus import Corpus, Paper
+
+__all__ = ["Corpus", "FakeADS", "FakeConfig", "Latency", "Paper", "create_app"]
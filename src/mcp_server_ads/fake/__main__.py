@@ -0,0 +1,47 @@
+"""Run the fake ADS API: ``python -m mcp_server_ads.fake --port 8765``."""
+
+from __future__ import annotations
+
+import argparse
+
+from mcp_server_ads.fake.app import FakeConfig, Latency, create_app
+
+
+def _latency(value: str) -> Latency:
+    kind, _, rest = value.partition(":")
+    median, _, spread = rest.partition(":")
+    return Latency(kind, float(median or 0), float(spread or 0))  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--corpus-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--token", help="Require this bearer token")
+    parser.add_argument(
+        "--latency", type=_latency, default=Latency(),
+        help="KIND:MEDIAN_MS[:SPREAD], e.g. lognormal:120:0.6 or uniform:50:20",
+    )
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--rate-window", type=float, default=86400.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(FakeConfig(
+        corpus_size=args.corpus_size,
+        seed=args.seed,
+        token=args.token,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        error_rate=args.error_rate,
+    ))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
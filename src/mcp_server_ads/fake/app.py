@@ -0,0 +1,521 @@
+"""ASGI stand-in for the ADS API backed by a synthetic corpus."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from mcp_server_ads.fake.corpus import Corpus, Paper, sort_papers
+from mcp_server_ads.stats import endpoint_name
+
+MAX_ROWS = 2000
+
+
+@dataclass
+class Latency:
+    """Per-request delay distribution, in milliseconds.
+
+    ``fixed`` always waits ``median``; ``uniform`` draws from
+    ``[median - spread, median + spread]``; ``lognormal`` has the given
+    median and ``spread`` as sigma of the underlying normal, which gives
+    the long tail real APIs show.
+    """
+
+    kind: Literal["fixed", "uniform", "lognormal"] = "fixed"
+    median: float = 0.0
+    spread: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return max(self.median + rng.uniform(-self.spread, self.spread), 0.0)
+        if self.kind == "lognormal" and self.median > 0:
+            return rng.lognormvariate(math.log(self.median), self.spread)
+        return self.median
+
+
+@dataclass
+class FakeConfig:
+    """Behavior of the fake server.
+
+    ``rate_limit`` requests are allowed per ``rate_window`` seconds, counted
+    and reported through ``x-ratelimit-*`` headers like ADS does; once spent,
+    requests get 429 until the window resets. ``error_rate`` is the fraction
+    of requests answered with a random status from ``error_statuses``.
+    """
+
+    corpus_size: int = 5000
+    seed: int = 0
+    token: str | None = None
+    latency: Latency = field(default_factory=Latency)
+    endpoint_latency: dict[str, Latency] = field(default_factory=dict)
+    rate_limit: int = 5000
+    rate_window: float = 86400.0
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (500, 502, 503)
+
+
+class RateLimiter:
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset = time.time() + window
+
+    def take(self) -> bool:
+        now = time.time()
+        if now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.window
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "x-ratelimit-limit": str(self.limit),
+            "x-ratelimit-remaining": str(self.remaining),
+            "x-ratelimit-reset": str(int(self.reset)),
+        }
+
+
+class FakeADS:
+    """State of one fake server: corpus, libraries, rate limit and fault injection."""
+
+    def __init__(self, config: FakeConfig | None = None):
+        self.config = config or FakeConfig()
+        self.corpus = Corpus(self.config.corpus_size, self.config.seed)
+        self.rng = random.Random(self.config.seed)
+        self.rate = RateLimiter(self.config.rate_limit, self.config.rate_window)
+        self.libraries: dict[str, dict[str, Any]] = {}
+        self.requests: Counter[str] = Counter()
+        self._injected: list[int] = []
+
+    def inject(self, status: int, count: int = 1) -> None:
+        """Answer the next ``count`` requests with ``status``."""
+        self._injected.extend([status] * count)
+
+    async def admit(self, request: Request) -> Response | None:
+        """Apply auth, latency, fault injection and rate limiting to a request."""
+        endpoint = endpoint_name(request.url.path)
+        self.requests[endpoint] += 1
+        token = self.config.token
+        if token is not None and request.headers.get("authorization") != f"Bearer {token}":
+            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+        delay = self.config.endpoint_latency.get(endpoint, self.config.latency).sample(self.rng)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if not self.rate.take():
+            return JSONResponse(
+                {"error": "Too many requests"}, status_code=429, headers=self.rate.headers()
+            )
+        status = None
+        if self._injected:
+            status = self._injected.pop(0)
+        elif self.config.error_rate and self.rng.random() < self.config.error_rate:
+            status = self.rng.choice(self.config.error_statuses)
+        if status is not None:
+            return JSONResponse(
+                {"error": f"Injected error {status}"}, status_code=status,
+                headers=self.rate.headers(),
+            )
+        return None
+
+    def library_documents(self, library_id: str) -> list[str]:
+        lib = self.libraries.get(library_id)
+        return lib["documents"] if lib else []
+
+    def search(self, params: Any, within: list[str] | None = None) -> dict[str, Any]:
+        q = params.get("q", "*:*")
+        fl = [f.strip() for f in params.get("fl", "bibcode").split(",") if f.strip()]
+        sort = params.get("sort", "date desc")
+        rows = min(int(params.get("rows", 10)), MAX_ROWS)
+        start = int(params.get("start", 0))
+        started = time.perf_counter()
+        libraries = self.library_documents
+        papers = self.corpus.search(q, sort, within=within, libraries=libraries)
+        for fq in params.getlist("fq"):
+            allowed = {p.bibcode for p in self.corpus.search(fq, "", libraries=libraries)}
+            papers = [p for p in papers if p.bibcode in allowed]
+        return {
+            "responseHeader": {
+                "status": 0,
+                "QTime": int((time.perf_counter() - started) * 1000),
+                "params": {"q": q, "fl": ",".join(fl), "start": str(start), "rows": str(rows)},
+            },
+            "response": {
+                "numFound": len(papers),
+                "start": start,
+                "docs": [p.doc(fl) for p in papers[start : start + rows]],
+            },
+        }
+
+    def metadata(self, library_id: str) -> dict[str, Any]:
+        lib = self.libraries[library_id]
+        return {**lib["metadata"], "num_documents": len(lib["documents"])}
+
+
+def _papers(fake: FakeADS, bibcodes: list[str]) -> list[Paper]:
+    return [p for b in bibcodes if (p := fake.corpus.by_bibcode.get(b))]
+
+
+def _h_index(counts: list[int]) -> int:
+    counts = sorted(counts, reverse=True)
+    return sum(1 for i, c in enumerate(counts, 1) if c >= i)
+
+
+def _g_index(counts: list[int]) -> int:
+    counts = sorted(counts, reverse=True)
+    total, g = 0, 0
+    for i, c in enumerate(counts, 1):
+        total += c
+        if total >= i * i:
+            g = i
+    return g
+
+
+def _bibtex(paper: Paper, abstract: bool = False) -> str:
+    authors = " and ".join(
+        "{{" + last + "}}, " + first.strip() for last, _, first in
+        (a.partition(",") for a in paper.author)
+    )
+    lines = [
+        f"@ARTICLE{{{paper.bibcode},",
+        f"       author = {{{authors}}},",
+        f'        title = "{{{paper.title}}}",',
+        f"      journal = {{{paper.pub}}},",
+        f"         year = {paper.year},",
+        f"          doi = {{{paper.doi}}},",
+    ]
+    if paper.arxiv:
+        lines.append(f"       eprint = {{{paper.arxiv}}},")
+    if abstract:
+        lines.append(f"     abstract = \"{{{paper.abstract}}}\",")
+    lines.append(f"       adsurl = {{https://ui.adsabs.harvard.edu/abs/{paper.bibcode}}},")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _export(paper: Paper, fmt: str) -> str:
+    if fmt in ("bibtex", "bibtexabs"):
+        return _bibtex(paper, abstract=fmt == "bibtexabs")
+    if fmt == "ris":
+        authors = "".join(f"AU  - {a}\n" for a in paper.author)
+        return (
+            f"TY  - JOUR\n{authors}TI  - {paper.title}\nJO  - {paper.pub}\n"
+            f"PY  - {paper.year}\nDO  - {paper.doi}\nER  -\n"
+        )
+    return (
+        f"%R {paper.bibcode}\n%T {paper.title}\n%A {'; '.join(paper.author)}\n"
+        f"%J {paper.pub}\n%D {paper.year}\n"
+    )
+
+
+def create_app(config: FakeConfig | None = None) -> Starlette:
+    """Build the ASGI app; its ``FakeADS`` state is available as ``app.state.fake``."""
+    fake = FakeADS(config)
+
+    def endpoint(handler):
+        async def wrapped(request: Request) -> Response:
+            rejected = await fake.admit(request)
+            if rejected is not None:
+                return rejected
+            try:
+                response = await handler(request)
+            except KeyError as exc:
+                response = JSONResponse({"error": f"Not found: {exc}"}, status_code=404)
+            response.headers.update(fake.rate.headers())
+            return response
+
+        return wrapped
+
+    async def search_query(request: Request) -> Response:
+        return JSONResponse(fake.search(request.query_params))
+
+    async def search_bigquery(request: Request) -> Response:
+        body = (await request.body()).decode()
+        bibcodes = [line.strip() for line in body.splitlines()[1:] if line.strip()]
+        return JSONResponse(fake.search(request.query_params, within=bibcodes))
+
+    async def export(request: Request) -> Response:
+        payload = await request.json()
+        papers = sort_papers(_papers(fake, payload.get("bibcode", [])),
+                             (payload.get("sort") or ["date desc"])[0])
+        fmt = request.path_params["format"]
+        return JSONResponse({
+            "msg": f"Retrieved {len(papers)} abstracts, starting with number 1.",
+            "export": "\n".join(_export(p, fmt) for p in papers),
+        })
+
+    async def metrics(request: Request) -> Response:
+        payload = await request.json()
+        papers = _papers(fake, payload.get("bibcodes", []))
+        refereed = [p for p in papers if p.refereed]
+
+        def basic(ps: list[Paper]) -> dict[str, Any]:
+            reads = [p.read_count for p in ps]
+            return {
+                "number of papers": len(ps),
+                "normalized paper count": round(sum(1 / len(p.author) for p in ps), 2),
+                "total number of reads": sum(reads),
+                "average number of reads": sum(reads) / len(ps) if ps else 0,
+                "median number of reads": sorted(reads)[len(reads) // 2] if reads else 0,
+            }
+
+        def citations(ps: list[Paper]) -> dict[str, Any]:
+            counts = [len(p.citation) for p in ps]
+            return {
+                "number of citing papers": len({c for p in ps for c in p.citation}),
+                "total number of citations": sum(counts),
+                "average number of citations": sum(counts) / len(ps) if ps else 0,
+            }
+
+        def indicators(ps: list[Paper]) -> dict[str, Any]:
+            counts = [len(p.citation) for p in ps]
+            return {
+                "h": _h_index(counts),
+                "g": _g_index(counts),
+                "i10": sum(c >= 10 for c in counts),
+                "i100": sum(c >= 100 for c in counts),
+            }
+
+        years = Counter(str(p.year) for p in papers)
+        return JSONResponse({
+            "skipped bibcodes": [b for b in payload.get("bibcodes", [])
+                                 if b not in fake.corpus.by_bibcode],
+            "basic stats": basic(papers),
+            "basic stats refereed": basic(refereed),
+            "citation stats": citations(papers),
+            "citation stats refereed": citations(refereed),
+            "indicators": indicators(papers),
+            "indicators refereed": indicators(refereed),
+            "histograms": {"publications": {"all publications": dict(sorted(years.items()))}},
+        })
+
+    async def libraries(request: Request) -> Response:
+        if request.method == "POST":
+            payload = await request.json()
+            lib_id = uuid.uuid4().hex[:22]
+            now = time.strftime("%Y-%m-%dT%H:%M:%S")
+            fake.libraries[lib_id] = {
+                "metadata": {
+                    "id": lib_id,
+                    "name": payload.get("name", "Untitled"),
+                    "description": payload.get("description", ""),
+                    "public": payload.get("public", False),
+                    "date_created": now,
+                    "date_last_modified": now,
+                },
+                "documents": list(dict.fromkeys(payload.get("bibcode", []))),
+                "notes": {},
+            }
+            return JSONResponse({**fake.metadata(lib_id), "bibcode": payload.get("bibcode", [])})
+        start = int(request.query_params.get("start", 0))
+        rows = int(request.query_params.get("rows", 100))
+        listing = [fake.metadata(lib_id) for lib_id in fake.libraries]
+        return JSONResponse({"libraries": listing[start : start + rows]})
+
+    async def library(request: Request) -> Response:
+        lib_id = request.path_params["library_id"]
+        docs = fake.libraries[lib_id]["documents"]
+        start = int(request.query_params.get("start", 0))
+        rows = int(request.query_params.get("rows", 20))
+        return JSONResponse({
+            "metadata": fake.metadata(lib_id),
+            "documents": docs[start : start + rows],
+        })
+
+    def _touch(lib_id: str) -> None:
+        fake.libraries[lib_id]["metadata"]["date_last_modified"] = time.strftime(
+            "%Y-%m-%dT%H:%M:%S"
+        )
+
+    async def documents(request: Request) -> Response:
+        lib_id = request.path_params["library_id"]
+        lib = fake.libraries[lib_id]
+        if request.method == "DELETE":
+            del fake.libraries[lib_id]
+            return JSONResponse({})
+        payload = await request.json()
+        if request.method == "PUT":
+            for key in ("name", "description", "public"):
+                if key in payload:
+                    lib["metadata"][key] = payload[key]
+            _touch(lib_id)
+            return JSONResponse({key: lib["metadata"][key] for key in payload})
+        current = dict.fromkeys(lib["documents"])
+        bibcodes = payload.get("bibcode", [])
+        if payload.get("action") == "remove":
+            removed = [b for b in bibcodes if b in current]
+            lib["documents"] = [b for b in lib["documents"] if b not in set(removed)]
+            _touch(lib_id)
+            return JSONResponse({"number_removed": len(removed)})
+        added = [b for b in dict.fromkeys(bibcodes) if b not in current]
+        lib["documents"].extend(added)
+        _touch(lib_id)
+        return JSONResponse({"number_added": len(added)})
+
+    async def operations(request: Request) -> Response:
+        lib_id = request.path_params["library_id"]
+        payload = await request.json()
+        lib = fake.libraries[lib_id]
+        others = [fake.libraries[other]["documents"] for other in payload.get("libraries", [])]
+        docs = lib["documents"]
+        action = payload.get("action")
+        if action == "union":
+            docs = list(dict.fromkeys([*docs, *(b for o in others for b in o)]))
+        elif action == "intersection":
+            docs = [b for b in docs if all(b in set(o) for o in others)]
+        elif action == "difference":
+            exclude = {b for o in others for b in o}
+            docs = [b for b in docs if b not in exclude]
+        elif action == "copy":
+            for other in payload.get("libraries", []):
+                fake.libraries[other]["documents"] = list(docs)
+        elif action == "empty":
+            docs = []
+        lib["documents"] = docs
+        _touch(lib_id)
+        return JSONResponse({**fake.metadata(lib_id)})
+
+    async def notes(request: Request) -> Response:
+        lib_id = request.path_params["library_id"]
+        lib_notes = fake.libraries[lib_id]["notes"]
+        if request.method == "GET":
+            return JSONResponse([
+                {"bibcode": b, "content": c} for b, c in lib_notes.items()
+            ])
+        if request.method == "DELETE":
+            lib_notes.pop(request.query_params.get("bibcode"), None)
+            return JSONResponse({})
+        payload = await request.json()
+        lib_notes[payload["bibcode"]] = payload.get("content", "")
+        return JSONResponse(payload)
+
+    async def resolver(request: Request) -> Response:
+        bibcode = request.path_params["bibcode"]
+        paper = fake.corpus.by_bibcode[bibcode]
+        records = [
+            {"title": "Publisher Article", "type": "esource",
+             "url": f"https://doi.org/{paper.doi}"},
+            {"title": "Citations", "type": "citation",
+             "url": f"https://ui.adsabs.harvard.edu/abs/{bibcode}/citations"},
+            {"title": "References", "type": "reference",
+             "url": f"https://ui.adsabs.harvard.edu/abs/{bibcode}/references"},
+        ]
+        if paper.arxiv:
+            records.insert(0, {"title": "arXiv e-print", "type": "esource",
+                               "url": f"https://arxiv.org/abs/{paper.arxiv}"})
+        link_type = request.path_params.get("link_type")
+        if link_type:
+            records = [r for r in records if r["type"] == link_type]
+        return JSONResponse({"links": {"count": len(records), "bibcode": bibcode,
+                                       "records": records}})
+
+    async def objects(request: Request) -> Response:
+        payload = await request.json()
+        ids = [
+            "simbid:" + str(int(hashlib.sha1(name.encode()).hexdigest()[:8], 16) % 10**7)
+            for name in payload.get("identifiers", [])
+        ]
+        return JSONResponse({"query": " OR ".join(ids)})
+
+    async def reference(request: Request) -> Response:
+        payload = await request.json()
+        lines = []
+        for ref in payload.get("reference", []):
+            match = _resolve_reference(fake.corpus, ref)
+            if match is None:
+                lines.append(f"0.0 {'.' * 19} -- {ref}")
+            else:
+                lines.append(f"1.0 {match.bibcode} -- {ref}")
+        return PlainTextResponse("\n".join(lines) + "\n")
+
+    async def vis(request: Request) -> Response:
+        kind = request.path_params["kind"]
+        payload = await request.json()
+        papers = _papers(fake, payload.get("bibcodes", []))
+        if kind == "author-network":
+            groups = Counter(a for p in papers for a in p.author[:3])
+            children = [{"name": name, "size": n} for name, n in groups.most_common(20)]
+            summary = [f"{len(groups)} unique authors"]
+            name = "Author Network"
+        else:
+            groups = Counter(p.pub for p in papers)
+            children = [{"name": name, "size": n} for name, n in groups.most_common(20)]
+            summary = [f"{len(groups)} clusters found", f"{len(papers)} papers total"]
+            name = "Paper Network"
+        return JSONResponse({"data": {"root": {"name": name, "children": children},
+                                      "summary": summary}})
+
+    async def citation_helper(request: Request) -> Response:
+        payload = await request.json()
+        given = set(payload.get("bibcodes", []))
+        scores: Counter[str] = Counter()
+        for paper in _papers(fake, list(given)):
+            for bibcode in (*paper.reference, *paper.citation):
+                if bibcode not in given:
+                    scores[bibcode] += 1
+        suggestions = []
+        for bibcode, score in scores.most_common(10):
+            paper = fake.corpus.by_bibcode[bibcode]
+            suggestions.append({
+                "bibcode": bibcode, "score": score, "title": paper.title,
+                "author": f"{paper.author[0]} et al." if len(paper.author) > 1
+                else paper.author[0],
+            })
+        return JSONResponse(suggestions)
+
+    routes = [
+        Route("/v1/search/query", endpoint(search_query), methods=["GET"]),
+        Route("/v1/search/bigquery", endpoint(search_bigquery), methods=["POST"]),
+        Route("/v1/export/{format}", endpoint(export), methods=["POST"]),
+        Route("/v1/metrics", endpoint(metrics), methods=["POST"]),
+        Route("/v1/biblib/libraries", endpoint(libraries), methods=["GET", "POST"]),
+        Route("/v1/biblib/libraries/operations/{library_id}", endpoint(operations),
+              methods=["POST"]),
+        Route("/v1/biblib/libraries/{library_id}", endpoint(library), methods=["GET"]),
+        Route("/v1/biblib/documents/{library_id}", endpoint(documents),
+              methods=["POST", "PUT", "DELETE"]),
+        Route("/v1/biblib/notes/{library_id}", endpoint(notes),
+              methods=["GET", "POST", "PUT", "DELETE"]),
+        Route("/v1/resolver/{bibcode}", endpoint(resolver), methods=["GET"]),
+        Route("/v1/resolver/{bibcode}/{link_type}", endpoint(resolver), methods=["GET"]),
+        Route("/v1/objects", endpoint(objects), methods=["POST"]),
+        Route("/v1/reference/text", endpoint(reference), methods=["POST"]),
+        Route("/v1/vis/{kind}", endpoint(vis), methods=["POST"]),
+        Route("/v1/citation_helper", endpoint(citation_helper), methods=["POST"]),
+    ]
+    app = Starlette(routes=routes)
+    app.state.fake = fake
+    return app
+
+
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def _resolve_reference(corpus: Corpus, text: str) -> Paper | None:
+    """Match a free-text reference by first-author surname and year."""
+    year = _YEAR.search(text)
+    if year is None:
+        return None
+    words = {w.strip(",.").lower() for w in text.split()}
+    for paper in corpus.papers:
+        if str(paper.year) == year.group(0):
+            surname = paper.author[0].split(",")[0].lower()
+            if surname in words:
+                return paper
+    return None
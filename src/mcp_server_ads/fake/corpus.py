@@ -0,0 +1,362 @@
+"""Deterministic synthetic paper corpus with a small ADS query evaluator."""
+
+from __future__ import annotations
+
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+JOURNALS = [
+    ("ApJ", "The Astrophysical Journal"),
+    ("ApJL", "The Astrophysical Journal Letters"),
+    ("ApJS", "The Astrophysical Journal Supplement Series"),
+    ("MNRAS", "Monthly Notices of the Royal Astronomical Society"),
+    ("A&A", "Astronomy and Astrophysics"),
+    ("AJ", "The Astronomical Journal"),
+    ("PhRvD", "Physical Review D"),
+    ("PhRvL", "Physical Review Letters"),
+    ("Natur", "Nature"),
+    ("JCAP", "Journal of Cosmology and Astroparticle Physics"),
+]
+
+SURNAMES = [
+    "Abbott", "Bahcall", "Chandrasekhar", "Davis", "Einstein", "Faber", "Gunn", "Hubble",
+    "Ivezic", "Jansky", "Kerr", "Leavitt", "Mather", "Navarro", "Ostriker", "Peebles",
+    "Quimby", "Rubin", "Sandage", "Tinsley", "Urry", "Vogelsberger", "White", "Xu",
+    "Yoshida", "Zwicky", "Springel", "Frenk", "Hernquist", "Dekel", "Silk", "Rees",
+    "Lynden-Bell", "Toomre", "Binney", "Tremaine", "Kauffmann", "Madau", "Loeb", "Bromm",
+]
+
+WORDS = [
+    "dark", "matter", "halo", "galaxy", "cluster", "cosmic", "reionization", "black", "hole",
+    "accretion", "disk", "star", "formation", "feedback", "supernova", "gravitational",
+    "waves", "neutron", "merger", "exoplanet", "atmosphere", "transit", "spectroscopy",
+    "survey", "simulation", "magnetic", "field", "turbulence", "dust", "gas", "outflow",
+    "quasar", "lensing", "weak", "strong", "redshift", "distribution", "evolution",
+    "metallicity", "stellar", "population", "kinematics", "dwarf", "satellite", "Lyman",
+    "alpha", "emission", "absorption", "radio", "X-ray", "infrared", "ultraviolet",
+]
+
+DATABASES = ["astronomy", "physics"]
+
+FIELDS = (
+    "bibcode", "title", "author", "year", "pub", "pubdate", "entry_date", "citation_count",
+    "read_count", "abstract", "identifier", "doi", "alternate_bibcode", "property",
+    "database", "doctype", "keyword", "reference", "citation",
+)
+
+
+def _pad(value: str, width: int) -> str:
+    return value.rjust(width, ".")
+
+
+def make_bibcode(year: int, journal: str, volume: int, qualifier: str, page: int,
+                 initial: str) -> str:
+    return (
+        f"{year}{journal.ljust(5, '.')}{_pad(str(volume), 4)}{qualifier}"
+        f"{_pad(str(page), 4)}{initial}"
+    )
+
+
+@dataclass
+class Paper:
+    bibcode: str
+    title: str
+    author: list[str]
+    year: int
+    pub: str
+    pubdate: str
+    entry_date: str
+    abstract: str
+    doi: str
+    arxiv: str | None
+    alternate_bibcode: str | None
+    refereed: bool
+    database: str
+    keyword: list[str]
+    read_count: int
+    reference: list[str] = field(default_factory=list)
+    citation: list[str] = field(default_factory=list)
+
+    @property
+    def identifiers(self) -> list[str]:
+        ids = [self.bibcode, self.doi]
+        if self.arxiv:
+            ids.append(f"arXiv:{self.arxiv}")
+        if self.alternate_bibcode:
+            ids.append(self.alternate_bibcode)
+        return ids
+
+    def doc(self, fl: Iterable[str] | None = None) -> dict[str, Any]:
+        """ADS-shaped search doc, restricted to the fields in ``fl``."""
+        full = {
+            "bibcode": self.bibcode,
+            "title": [self.title],
+            "author": self.author,
+            "year": str(self.year),
+            "pub": self.pub,
+            "pubdate": self.pubdate,
+            "entry_date": self.entry_date,
+            "citation_count": len(self.citation),
+            "read_count": self.read_count,
+            "abstract": self.abstract,
+            "identifier": self.identifiers,
+            "doi": [self.doi],
+            "property": ["REFEREED" if self.refereed else "NOT REFEREED", "ARTICLE"],
+            "database": [self.database],
+            "doctype": "article",
+            "keyword": self.keyword,
+            "reference": self.reference,
+            "citation": self.citation,
+        }
+        if self.alternate_bibcode:
+            full["alternate_bibcode"] = [self.alternate_bibcode]
+        if fl is None:
+            return full
+        return {name: full[name] for name in fl if name in full}
+
+
+class Corpus:
+    """``size`` reproducible papers with a citation graph, generated from ``seed``.
+
+    Papers cite earlier papers, preferentially well-cited ones, so citation
+    counts follow a heavy-tailed distribution like the real database.
+    """
+
+    def __init__(self, size: int = 5000, seed: int = 0):
+        rng = random.Random(seed)
+        self.papers: list[Paper] = []
+        self.by_bibcode: dict[str, Paper] = {}
+        self.by_identifier: dict[str, Paper] = {}
+        authors = [f"{s}, {chr(65 + i % 26)}." for s in SURNAMES for i in range(0, 26, 5)]
+        for i in range(size):
+            year = 1990 + i * 35 // max(size, 1)
+            month = rng.randint(1, 12)
+            abbrev, full_name = rng.choice(JOURNALS)
+            names = rng.sample(authors, min(50, 1 + int(rng.paretovariate(1.5))))
+            while True:
+                bibcode = make_bibcode(
+                    year, abbrev, rng.randint(1, 999), rng.choice("..L"),
+                    rng.randint(1, 9999), names[0][0],
+                )
+                if bibcode not in self.by_bibcode:
+                    break
+            arxiv = None
+            alternate = None
+            if year >= 2008:
+                number = rng.randint(1, 99999)
+                arxiv = f"{year % 100:02d}{month:02d}.{number:05d}"
+                alternate = f"{year}arXiv{year % 100:02d}{month:02d}{number:05d}{names[0][0]}"
+            title_words = rng.sample(WORDS, rng.randint(4, 9))
+            paper = Paper(
+                bibcode=bibcode,
+                title=" ".join(title_words).capitalize(),
+                author=names,
+                year=year,
+                pub=full_name,
+                pubdate=f"{year}-{month:02d}-00",
+                entry_date=f"{year}-{month:02d}-{rng.randint(1, 28):02d}T00:00:00Z",
+                abstract=" ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 200))) + ".",
+                doi=f"10.{rng.randint(1000, 9999)}/{abbrev.lower()}.{year}.{i}",
+                arxiv=arxiv,
+                alternate_bibcode=alternate,
+                refereed=rng.random() < 0.85,
+                database=rng.choice(DATABASES),
+                keyword=rng.sample(WORDS, 3),
+                read_count=int(rng.paretovariate(1.2) * 10),
+            )
+            self._add(paper)
+
+        # Preferential attachment: every paper is in the pool once, plus once per
+        # citation it has received, so uniform draws favor well-cited papers.
+        pool: list[int] = []
+        for i, paper in enumerate(self.papers):
+            if pool:
+                for j in {rng.choice(pool) for _ in range(rng.randint(0, 20))}:
+                    cited = self.papers[j]
+                    paper.reference.append(cited.bibcode)
+                    cited.citation.append(paper.bibcode)
+                    pool.append(j)
+            pool.append(i)
+
+    def _add(self, paper: Paper) -> None:
+        self.papers.append(paper)
+        self.by_bibcode[paper.bibcode] = paper
+        for ident in paper.identifiers:
+            self.by_identifier[ident.lower()] = paper
+        if paper.arxiv:
+            self.by_identifier[paper.arxiv.lower()] = paper
+
+    def get(self, identifier: str) -> Paper | None:
+        return self.by_bibcode.get(identifier) or self.by_identifier.get(identifier.lower())
+
+    def search(
+        self,
+        q: str,
+        sort: str = "date desc",
+        within: Iterable[str] | None = None,
+        libraries: Callable[[str], list[str]] | None = None,
+    ) -> list[Paper]:
+        """Evaluate ``q`` (a practical subset of the ADS syntax) and sort the matches."""
+        papers = Query(self, libraries).evaluate(q)
+        if within is not None:
+            allowed = set(within)
+            papers = [p for p in papers if p.bibcode in allowed]
+        return sort_papers(papers, sort)
+
+
+_SORT_KEYS: dict[str, Callable[[Paper], Any]] = {
+    "date": lambda p: p.pubdate,
+    "pubdate": lambda p: p.pubdate,
+    "entry_date": lambda p: p.entry_date,
+    "citation_count": lambda p: len(p.citation),
+    "read_count": lambda p: p.read_count,
+    "year": lambda p: p.year,
+    "bibcode": lambda p: p.bibcode,
+    "score": lambda p: len(p.citation),
+}
+
+
+def sort_papers(papers: list[Paper], sort: str) -> list[Paper]:
+    """Apply an ADS ``sort`` parameter such as ``citation_count desc, date desc``."""
+    for clause in reversed([c.strip() for c in (sort or "").split(",") if c.strip()]):
+        name, _, direction = clause.partition(" ")
+        key = _SORT_KEYS.get(name.strip())
+        if key is not None:
+            papers = sorted(papers, key=key, reverse=direction.strip().lower() != "asc")
+    return papers
+
+
+_FUNCTION = re.compile(r"^(\w+)\((.*)\)$", re.DOTALL)
+_TERM = re.compile(r'(-?)(\w+):(\((?:[^()"]|"[^"]*")*\)|"[^"]*"|\[[^\]]*\]|[^\s()]+)')
+_WORD = re.compile(r'"[^"]*"|[^\s()]+')
+_LIST_ITEM = re.compile(r'"([^"]*)"|([^\s()"]+)')
+
+
+def _values(raw: str) -> list[str]:
+    """Split a field value like ``"a"`` or ``("a" OR "b")`` into its items."""
+    if raw.startswith("("):
+        return [a or b for a, b in _LIST_ITEM.findall(raw[1:-1]) if (a or b) not in ("OR", "AND")]
+    return [raw.strip('"')]
+
+
+def _in_range(value: Any, raw: str) -> bool:
+    lo, _, hi = raw[1:-1].partition(" TO ")
+    lo, hi = lo.strip().strip('"'), hi.strip().strip('"')
+    if isinstance(value, int):
+        return (lo == "*" or value >= int(lo)) and (hi == "*" or value <= int(hi))
+    value = str(value)[: max(len(lo), len(hi), 4)]
+    return (lo == "*" or value >= lo[: len(value)]) and (hi == "*" or value <= hi[: len(value)])
+
+
+class Query:
+    """Evaluates the query forms the server and its users commonly send.
+
+    Supports ``*:*``, field terms (``author``, ``first_author``, ``title``,
+    ``abs``, ``year``, ``bibcode``, ``identifier``, ``doi``, ``entry_date``,
+    ``pubdate``, ``citation_count``, ``property``...), ranges, ``-`` negation,
+    ``OR`` lists, bare words, ``docs(library/<id>)`` and the functional
+    operators ``citations``, ``references``, ``similar``, ``trending``,
+    ``reviews`` and ``useful``. Terms are AND-ed unless the query contains
+    a top-level ``OR``. Unknown fields match everything.
+    """
+
+    def __init__(self, corpus: Corpus, libraries: Callable[[str], list[str]] | None = None):
+        self.corpus = corpus
+        self.libraries = libraries
+
+    def evaluate(self, q: str) -> list[Paper]:
+        q = (q or "").strip()
+        if q in ("", "*:*", "*"):
+            return list(self.corpus.papers)
+        match = _FUNCTION.match(q)
+        if match and _balanced(match.group(2)):
+            return self._function(match.group(1).lower(), match.group(2))
+
+        terms = _TERM.findall(q)
+        rest = _TERM.sub(" ", q)
+        words = [w for w in _WORD.findall(rest) if w not in ("OR", "AND", "NOT", "*:*")]
+        any_of = " OR " in rest
+        positive = [(f, v) for neg, f, v in terms if not neg]
+        negative = [(f, v) for neg, f, v in terms if neg]
+
+        matches = []
+        for paper in self.corpus.papers:
+            checks = [self._match(paper, f, v) for f, v in positive]
+            checks += [_contains(paper, w.strip('"')) for w in words]
+            if checks and not (any(checks) if any_of else all(checks)):
+                continue
+            if any(self._match(paper, f, v) for f, v in negative):
+                continue
+            matches.append(paper)
+        return matches
+
+    def _function(self, name: str, inner: str) -> list[Paper]:
+        if name == "docs":
+            lib_id = inner.strip().removeprefix("library/")
+            bibcodes = self.libraries(lib_id) if self.libraries else []
+            return [p for b in bibcodes if (p := self.corpus.by_bibcode.get(b))]
+        papers = self.evaluate(inner)
+        if name in ("citations", "references"):
+            linked = dict.fromkeys(b for p in papers for b in getattr(p, name[:-1]))
+            return [self.corpus.by_bibcode[b] for b in linked]
+        # similar/trending/reviews/useful: the most cited papers linked to the matches
+        return sort_papers(papers, "citation_count desc")
+
+    def _match(self, paper: Paper, name: str, raw: str) -> bool:
+        name = name.lower()
+        if raw.startswith("["):
+            value = {
+                "year": paper.year,
+                "citation_count": len(paper.citation),
+                "read_count": paper.read_count,
+                "entry_date": paper.entry_date,
+                "pubdate": paper.pubdate,
+            }.get(name)
+            return value is None or _in_range(value, raw)
+        values = _values(raw)
+        if name in ("author", "first_author"):
+            authors = paper.author[:1] if name == "first_author" else paper.author
+            names = [a.lower() for a in authors]
+            for value in values:
+                value = value.lower()
+                if value.startswith("^"):
+                    if names and names[0].startswith(value[1:]):
+                        return True
+                elif any(n.startswith(value) or value in n for n in names):
+                    return True
+            return False
+        if name == "year":
+            for value in values:
+                lo, _, hi = value.partition("-")
+                if int(lo) <= paper.year <= int(hi or lo):
+                    return True
+            return False
+        if name in ("bibcode", "identifier", "doi", "alternate_bibcode", "arxiv"):
+            ids = {i.lower() for i in paper.identifiers}
+            if paper.arxiv:
+                ids.add(paper.arxiv.lower())
+            return any(v.lower() in ids for v in values)
+        if name in ("title", "abs", "abstract", "keyword", "full"):
+            return any(_contains(paper, v, abstract=name != "title") for v in values)
+        if name == "property":
+            wanted = {v.lower() for v in values}
+            return ("refereed" in wanted and paper.refereed) or not wanted & {"refereed"}
+        if name == "database":
+            return paper.database in {v.lower() for v in values}
+        return True
+
+
+def _contains(paper: Paper, text: str, abstract: bool = True) -> bool:
+    text = text.lower()
+    return text in paper.title.lower() or (abstract and text in paper.abstract.lower())
+
+
+def _balanced(text: str) -> bool:
+    depth = 0
+    for c in text:
+        depth += {"(": 1, ")": -1}.get(c, 0)
+        if depth < 0:
+            return False
+    return depth == 0
@@ -2,7 +2,44 @@
 
 from __future__ import annotations
 
-from typing import Any
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from mcp_server_ads.tracing import traced
+
+if TYPE_CHECKING:
+    from mcp_server_ads.jobs import Job
+    from mcp_server_ads.quota import QuotaForecast
+    from mcp_server_ads.setops import SetPreview
+    from mcp_server_ads.watch import WatchQuery, WatchRun
+
+
+CHARS_PER_TOKEN = 4
+"""Rough characters-per-token ratio used to turn token budgets into characters."""
+
+
+def tokens_to_chars(max_tokens: int | None) -> int | None:
+    return None if max_tokens is None else max_tokens * CHARS_PER_TOKEN
+
+
+@dataclass(frozen=True)
+class _Detail:
+    """How much of a paper record to render."""
+
+    abstract: int
+    authors: int
+    identifiers: bool
+    pub: bool
+
+
+# Richest first; the first level is the default (unbudgeted) output.
+_DETAIL_LEVELS = (
+    _Detail(abstract=300, authors=5, identifiers=True, pub=True),
+    _Detail(abstract=120, authors=3, identifiers=True, pub=True),
+    _Detail(abstract=0, authors=3, identifiers=True, pub=True),
+    _Detail(abstract=0, authors=1, identifiers=False, pub=False),
+)
 
 
 def _author_list(authors: list[str], max_authors: int = 5) -> str:
@@ -13,47 +50,97 @@ def _author_list(authors: list[str], max_authors: int = 5) -> str:
     return "; ".join(authors[:max_authors]) + f" et al. ({len(authors)} total)"
 
 
+def _author_list_len(authors: list[str], max_authors: int) -> int:
+    if not authors:
+        return len("Unknown authors")
+    shown = authors[:max_authors]
+    n = sum(map(len, shown)) + 2 * (len(shown) - 1)
+    if len(authors) > max_authors:
+        n += len(f" et al. ({len(authors)} total)")
+    return n
+
+
+class _Paper:
+    """Fields of a search doc, extracted once for sizing and rendering."""
+
+    __slots__ = ("title", "authors", "bibcode", "year", "citations", "pub", "abstract",
+                 "arxiv_id", "doi")
+
+    def __init__(self, doc: dict[str, Any]):
+        title = doc.get("title", ["Untitled"])
+        if isinstance(title, list):
+            title = title[0] if title else "Untitled"
+        self.title = title
+        self.authors = doc.get("author", [])
+        self.bibcode = doc.get("bibcode", "")
+        self.year = str(doc.get("year", "?"))
+        self.citations = str(doc.get("citation_count", 0))
+        self.pub = doc.get("pub", "")
+        self.abstract = doc.get("abstract", "")
+
+        # Extract arXiv ID and DOI from identifiers
+        self.arxiv_id = ""
+        self.doi = ""
+        for ident in doc.get("identifier", []):
+            if ident.startswith("arXiv:") and not self.arxiv_id:
+                self.arxiv_id = ident
+            elif ident.startswith("10.") and "/" in ident and not self.doi:
+                self.doi = ident
+
+    def size(self, detail: _Detail, prefix: str = "") -> int:
+        """Exact length of ``render`` output, computed without rendering."""
+        n = len(prefix) + len(self.title) + 4
+        n += 1 + 2 + _author_list_len(self.authors, detail.authors) + len(self.year) + 3
+        if self.pub and detail.pub:
+            n += 1 + len(self.pub) + 4
+        n += 1 + len("  Bibcode: `` | Citations: ") + len(self.bibcode) + len(self.citations)
+        if detail.identifiers:
+            if self.arxiv_id:
+                n += 3 + len(self.arxiv_id)
+            if self.doi:
+                n += 8 + len(self.doi)
+        if self.abstract and detail.abstract:
+            n += 1 + 4 + min(len(self.abstract), detail.abstract)
+            if len(self.abstract) > detail.abstract:
+                n += 3
+        return n
+
+    def render(self, out: list[str], detail: _Detail, prefix: str = "") -> None:
+        """Append the record's lines to ``out``."""
+        out.append(f"{prefix}**{self.title}**")
+        out.append(f"  {_author_list(self.authors, detail.authors)} ({self.year})")
+        if self.pub and detail.pub:
+            out.append(f"  *{self.pub}*")
+        ids = f"  Bibcode: `{self.bibcode}` | Citations: {self.citations}"
+        if detail.identifiers:
+            if self.arxiv_id:
+                ids += f" | {self.arxiv_id}"
+            if self.doi:
+                ids += f" | DOI: {self.doi}"
+        out.append(ids)
+        if self.abstract and detail.abstract:
+            short = self.abstract[: detail.abstract]
+            if len(self.abstract) > detail.abstract:
+                short += "..."
+            out.append(f"  > {short}")
+
+
 def format_paper(doc: dict[str, Any], index: int | None = None) -> str:
     prefix = f"**{index}.** " if index is not None else ""
-    title = doc.get("title", ["Untitled"])
-    if isinstance(title, list):
-        title = title[0] if title else "Untitled"
-    authors = _author_list(doc.get("author", []))
-    bibcode = doc.get("bibcode", "")
-    year = doc.get("year", "?")
-    citation_count = doc.get("citation_count", 0)
-    pub = doc.get("pub", "")
-    abstract = doc.get("abstract", "")
-    identifiers = doc.get("identifier", [])
-
-    # Extract arXiv ID and DOI from identifiers
-    arxiv_id = ""
-    doi = ""
-    for ident in identifiers:
-        if ident.startswith("arXiv:") and not arxiv_id:
-            arxiv_id = ident
-        elif ident.startswith("10.") and "/" in ident and not doi:
-            doi = ident
-
-    lines = [
-        f"{prefix}**{title}**",
-        f"  {authors} ({year})",
-    ]
-    if pub:
-        lines.append(f"  *{pub}*")
-    ids = f"  Bibcode: `{bibcode}` | Citations: {citation_count}"
-    if arxiv_id:
-        ids += f" | {arxiv_id}"
-    if doi:
-        ids += f" | DOI: {doi}"
-    lines.append(ids)
-    if abstract:
-        short = abstract[:300] + "..." if len(abstract) > 300 else abstract
-        lines.append(f"  > {short}")
+    lines: list[str] = []
+    _Paper(doc).render(lines, _DETAIL_LEVELS[0], prefix)
     return "\n".join(lines)
 
 
-def format_search_results(data: dict[str, Any]) -> str:
+@traced("format_search_results")
+def format_search_results(data: dict[str, Any], max_chars: int | None = None) -> str:
+    """Format search results, optionally fitting them into ``max_chars``.
+
+    With a budget, each record gets an even share of what is left and is
+    rendered at the richest detail level whose computed size fits that share;
+    records that no longer fit even at minimal detail are summarized in a
+    trailing note.
+    """
     response = data.get("response", {})
     docs = response.get("docs", [])
     num_found = response.get("numFound", 0)
@@ -62,16 +149,38 @@ def format_search_results(data: dict[str, Any]) -> str:
         return "No results found."
 
     lines = [f"**Found {num_found:,} results** (showing {len(docs)}):\n"]
+    if max_chars is None:
+        for i, doc in enumerate(docs, 1):
+            _Paper(doc).render(lines, _DETAIL_LEVELS[0], f"**{i}.** ")
+            lines.append("")
+        return "\n".join(lines)
+
+    def omitted(n: int) -> str:
+        return f"*... {n} more results omitted to fit the output budget.*"
+
+    # Keep room for the omission note so the total never exceeds the budget.
+    remaining = max_chars - len(lines[0]) - 1 - len(omitted(len(docs))) - 1
     for i, doc in enumerate(docs, 1):
-        lines.append(format_paper(doc, index=i))
+        paper = _Paper(doc)
+        prefix = f"**{i}.** "
+        share = remaining // (len(docs) - i + 1)
+        sizes = [(paper.size(detail, prefix) + 2, detail) for detail in _DETAIL_LEVELS]
+        size, detail = next(((n, d) for n, d in sizes if n <= share), sizes[-1])
+        if size > remaining:
+            lines.append(omitted(len(docs) - i + 1))
+            break
+        paper.render(lines, detail, prefix)
         lines.append("")
+        remaining -= size
     return "\n".join(lines)
 
 
+@traced("format_export")
 def format_export(data: dict[str, Any]) -> str:
     return data.get("export", data.get("msg", str(data)))
 
 
+@traced("format_metrics")
 def format_metrics(data: dict[str, Any]) -> str:
     lines = ["## Metrics Summary\n"]
 
@@ -117,6 +226,7 @@ def format_metrics(data: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+@traced("format_libraries")
 def format_libraries(data: list[dict[str, Any]]) -> str:
     if not data:
         return "No libraries found."
@@ -133,7 +243,24 @@ def format_libraries(data: list[dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
-def format_library_detail(data: dict[str, Any]) -> str:
+def _fit_count(lines: list[str], budget: int) -> int:
+    """Number of leading ``lines`` (each joined with a newline) that fit ``budget``."""
+    count = 0
+    for line in lines:
+        budget -= len(line) + 1
+        if budget < 0:
+            break
+        count += 1
+    return count
+
+
+def _used(lines: list[str]) -> int:
+    return sum(map(len, lines)) + len(lines) - 1
+
+
+@traced("format_library_detail")
+def format_library_detail(data: dict[str, Any], max_chars: int | None = None) -> str:
+    """Format a library; with ``max_chars`` the bibcode list is cut to fit."""
     meta = data.get("metadata", {})
     docs = data.get("documents", [])
     name = meta.get("name", "Untitled")
@@ -143,13 +270,19 @@ def format_library_detail(data: dict[str, Any]) -> str:
         lines.append(f"*{desc}*\n")
     lines.append(f"**{meta.get('num_documents', len(docs))} documents**\n")
     if docs:
-        for bib in docs[:50]:
-            lines.append(f"- `{bib}`")
-        if len(docs) > 50:
-            lines.append(f"- ... and {len(docs) - 50} more")
+        entries = [f"- `{bib}`" for bib in docs]
+        if max_chars is None:
+            shown = 50
+        else:
+            reserve = len(f"- ... and {len(docs)} more") + 1
+            shown = _fit_count(entries, max_chars - _used(lines) - reserve)
+        lines.extend(entries[:shown])
+        if len(docs) > shown:
+            lines.append(f"- ... and {len(docs) - shown} more")
     return "\n".join(lines)
 
 
+@traced("format_resolver_links")
 def format_resolver_links(data: dict[str, Any]) -> str:
     links = data.get("links", {}).get("records", [])
     if not links:
@@ -162,6 +295,7 @@ def format_resolver_links(data: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+@traced("format_object_results")
 def format_object_results(data: dict[str, Any]) -> str:
     query = data.get("query", "")
     if query:
@@ -169,6 +303,7 @@ def format_object_results(data: dict[str, Any]) -> str:
     return str(data)
 
 
+@traced("format_citation_helper")
 def format_citation_helper(data: dict[str, Any] | list) -> str:
     # The API returns a plain list of suggestions
     if isinstance(data, list):
@@ -192,85 +327,90 @@ def format_citation_helper(data: dict[str, Any] | list) -> str:
     return "\n".join(lines)
 
 
-def format_reference_resolve(data: str) -> str:
-    """Format reference resolution results.
+def parse_reference_resolve(data: str) -> list[tuple[str | None, str, str]]:
+    """Parse reference resolution text into ``(score, bibcode, reference)`` tuples.
 
     The API returns plain text lines like:
       1.0 1905AnP...322..891E -- Einstein 1905 Annalen der Physik 17 891
       0.0                     -- Some unresolved reference
+    Lines that don't follow this shape are returned with a ``None`` score.
     """
-    if not data or not data.strip():
-        return "Could not resolve reference."
-    lines = ["**Resolved references:**\n"]
-    for raw_line in data.strip().splitlines():
+    results: list[tuple[str | None, str, str]] = []
+    for raw_line in (data or "").strip().splitlines():
         raw_line = raw_line.strip()
         if not raw_line:
             continue
         parts = raw_line.split(" -- ", 1)
         if len(parts) == 2:
-            score_bib = parts[0].strip()
-            ref_text = parts[1].strip()
-            tokens = score_bib.split()
+            tokens = parts[0].strip().split()
             score = tokens[0] if tokens else "?"
             bibcode = tokens[1] if len(tokens) > 1 else ""
-            lines.append(f"- {ref_text}")
-            if bibcode:
-                lines.append(f"  -> `{bibcode}` (score: {score})")
-            else:
-                lines.append(f"  -> Not resolved (score: {score})")
+            results.append((score, bibcode, parts[1].strip()))
         else:
-            lines.append(f"- {raw_line}")
-    return "\n".join(lines)
+            results.append((None, "", raw_line))
+    return results
 
 
-def format_author_network(data: dict[str, Any]) -> str:
-    d = data.get("data", {})
-    if not d:
-        return "No author network data."
-    root = d.get("root", {})
-    name = root.get("name", "Network")
-    children = root.get("children", [])
-    lines = [f"## Author Network: {name}\n"]
-    lines.append(f"**{len(children)} author groups:**\n")
-    for group in children[:20]:
-        gname = group.get("name", "?")
-        size = group.get("size", 0)
-        lines.append(f"- **{gname}** (size: {size})")
-    if len(children) > 20:
-        lines.append(f"- ... and {len(children) - 20} more groups")
-
-    summary = d.get("summary", [])
-    if summary:
-        lines.append("\n### Summary")
-        for item in summary[:10]:
-            lines.append(f"- {item}")
+@traced("format_reference_resolve")
+def format_reference_resolve(data: str) -> str:
+    """Format reference resolution results."""
+    if not data or not data.strip():
+        return "Could not resolve reference."
+    lines = ["**Resolved references:**\n"]
+    for score, bibcode, ref_text in parse_reference_resolve(data):
+        lines.append(f"- {ref_text}")
+        if score is None:
+            continue
+        if bibcode:
+            lines.append(f"  -> `{bibcode}` (score: {score})")
+        else:
+            lines.append(f"  -> Not resolved (score: {score})")
     return "\n".join(lines)
 
 
-def format_paper_network(data: dict[str, Any]) -> str:
+def _format_network(kind: str, data: dict[str, Any], max_chars: int | None) -> str:
     d = data.get("data", {})
     if not d:
-        return "No paper network data."
+        return f"No {kind.lower()} network data."
     root = d.get("root", {})
     name = root.get("name", "Network")
     children = root.get("children", [])
-    lines = [f"## Paper Network: {name}\n"]
-    lines.append(f"**{len(children)} paper groups:**\n")
-    for group in children[:20]:
-        gname = group.get("name", "?")
-        size = group.get("size", 0)
-        lines.append(f"- **{gname}** (size: {size})")
-    if len(children) > 20:
-        lines.append(f"- ... and {len(children) - 20} more groups")
-
-    summary = d.get("summary", [])
+    lines = [f"## {kind} Network: {name}\n"]
+    lines.append(f"**{len(children)} {kind.lower()} groups:**\n")
+    groups = [
+        f"- **{group.get('name', '?')}** (size: {group.get('size', 0)})" for group in children
+    ]
+    summary = [f"- {item}" for item in d.get("summary", [])[:10]]
+
+    if max_chars is None:
+        shown = 20
+    else:
+        reserve = len(f"- ... and {len(children)} more groups") + 1
+        shown = _fit_count(groups, max_chars - _used(lines) - reserve)
+    lines.extend(groups[:shown])
+    if len(children) > shown:
+        lines.append(f"- ... and {len(children) - shown} more groups")
+
+    if max_chars is not None:
+        heading = len("\n### Summary") + 1
+        summary = summary[: _fit_count(summary, max_chars - _used(lines) - heading)]
     if summary:
         lines.append("\n### Summary")
-        for item in summary[:10]:
-            lines.append(f"- {item}")
+        lines.extend(summary)
     return "\n".join(lines)
 
 
+@traced("format_author_network")
+def format_author_network(data: dict[str, Any], max_chars: int | None = None) -> str:
+    return _format_network("Author", data, max_chars)
+
+
+@traced("format_paper_network")
+def format_paper_network(data: dict[str, Any], max_chars: int | None = None) -> str:
+    return _format_network("Paper", data, max_chars)
+
+
+@traced("format_library_notes")
 def format_library_notes(data: dict[str, Any] | list | str) -> str:
     if isinstance(data, str):
         return data
@@ -284,3 +424,164 @@ def format_library_notes(data: dict[str, Any] | list | str) -> str:
             lines.append(f"- `{bib}`: {content}")
         return "\n".join(lines)
     return str(data)
+
+
+@traced("format_identifier_matches")
+def format_identifier_matches(
+    matches: list[tuple[str, str | None, str | None]],
+    from_index: int = 0,
+    not_looked_up: int = 0,
+) -> str:
+    """Format ``(identifier, type, bibcode)`` rows from the identifier crosswalk."""
+    if not matches:
+        return "No identifiers given."
+    resolved = sum(1 for _, _, bibcode in matches if bibcode)
+    lines = [
+        f"**Resolved {resolved} of {len(matches)} identifiers** "
+        f"({from_index} from the local index)\n",
+    ]
+    if not_looked_up:
+        lines.append(
+            f"_{not_looked_up} identifiers were not looked up before the deadline; "
+            "call again with the unresolved ones._\n"
+        )
+    lines += [
+        "| Identifier | Type | Bibcode |",
+        "|---|---|---|",
+    ]
+    for identifier, kind, bibcode in matches:
+        found = f"`{bibcode}`" if bibcode else "not found"
+        lines.append(f"| {identifier} | {kind or 'unrecognized'} | {found} |")
+    return "\n".join(lines)
+
+
+def format_watches(watches: list[WatchQuery]) -> str:
+    if not watches:
+        return "No watch queries saved."
+    lines = [f"**{len(watches)} watch queries:**\n"]
+    for watch in watches:
+        mark = f"new since {watch.since}" if watch.since else "not run yet"
+        lines.append(f"- **{watch.name}**: `{watch.query}` ({mark})")
+    return "\n".join(lines)
+
+
+@traced("format_watch_run")
+def format_watch_run(run: WatchRun, max_chars: int | None = None) -> str:
+    name = run.watch.name
+    if run.baseline:
+        header = f"## Watch '{name}': baseline ({len(run.docs)} most recent results)"
+    elif not run.docs:
+        return f"No new results for watch '{name}'."
+    else:
+        header = f"## Watch '{name}': {len(run.docs)} new results"
+        if run.remaining:
+            header += f" ({run.remaining:,} more on the next run)"
+    body = format_search_results(
+        {"response": {"numFound": len(run.docs), "docs": run.docs}},
+        max_chars=None if max_chars is None else max_chars - len(header) - 2,
+    )
+    return f"{header}\n\n{body}"
+
+
+def format_job(job: Job) -> str:
+    total = f"{job.total:,}" if job.total is not None else "?"
+    line = f"- `{job.id}` {job.kind}: **{job.status}** ({job.cursor:,}/{total} records)"
+    if job.error:
+        line += f"\n  Error: {job.error}"
+    return line
+
+
+def format_jobs(jobs: list[Job]) -> str:
+    if not jobs:
+        return "No jobs."
+    return "\n".join([f"**{len(jobs)} jobs:**\n", *map(format_job, jobs)])
+
+
+def format_stats(snapshot: dict[str, Any]) -> str:
+    """Format a ``Stats.snapshot()`` as markdown tables."""
+    lines = [f"# ADS server stats (uptime {snapshot['uptime_s']:,.0f}s)\n"]
+
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value:,.1f}"
+
+    for title, key in (("ADS endpoints", "endpoints"), ("Tools", "tools")):
+        lines.append(f"## {title}\n")
+        table = snapshot[key]
+        if not table:
+            lines.append("No calls yet.\n")
+            continue
+        lines.append(
+            "| Name | Calls | Errors | Bytes | Rate-limit units | p50 ms | p95 ms | p99 ms |"
+        )
+        lines.append("|---|---|---|---|---|---|---|---|")
+        for name, s in table.items():
+            lines.append(
+                f"| `{name}` | {s['count']:,} | {s['errors']:,} | {s['bytes']:,} | "
+                f"{s['units']:,} | {ms(s['p50_ms'])} | {ms(s['p95_ms'])} | {ms(s['p99_ms'])} |"
+            )
+        lines.append("")
+
+    if snapshot["caches"]:
+        lines.append("## Caches\n")
+        lines.append("| Cache | Hits | Misses | Hit ratio |")
+        lines.append("|---|---|---|---|")
+        for name, c in snapshot["caches"].items():
+            ratio = "-" if c["hit_ratio"] is None else f"{c['hit_ratio']:.1%}"
+            lines.append(f"| `{name}` | {c['hits']:,} | {c['misses']:,} | {ratio} |")
+    return "\n".join(lines)
+
+
+def _utc(epoch: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(epoch))
+
+
+def format_rate_limits(status: str, forecast: QuotaForecast, now: float | None = None) -> str:
+    """Format the rate-limit status with a forecast of the remaining budget."""
+    now = time.time() if now is None else now
+    lines = ["# ADS rate limit\n", status + "\n", "## Forecast\n"]
+    if not forecast.per_hour:
+        lines.append("No requests in the last hour, so no spend rate to forecast from.")
+    else:
+        lines.append(f"Spending about {forecast.per_hour:,.0f} requests/hour.")
+        if forecast.exhausted_at is not None:
+            hours = max(forecast.exhausted_at - now, 0) / 3600
+            lines.append(
+                f"At this rate the budget runs out at {_utc(forecast.exhausted_at)} "
+                f"(in {hours:,.1f} h)"
+                + (f", before the reset at {_utc(forecast.reset)}." if forecast.reset else ".")
+            )
+        elif forecast.reset is not None:
+            lines.append(
+                f"At this rate the budget lasts until the reset at {_utc(forecast.reset)}."
+            )
+    if forecast.tools:
+        lines.append("\n## Affordable calls per tool\n")
+        lines.append("| Tool | Requests per call | Calls affordable |")
+        lines.append("|---|---|---|")
+        for cost in forecast.tools:
+            affordable = "?" if cost.affordable is None else f"{cost.affordable:,}"
+            lines.append(f"| `{cost.tool}` | {cost.units_per_call:,.1f} | {affordable} |")
+    return "\n".join(lines)
+
+
+def format_set_preview(preview: SetPreview, sample: int = 10) -> str:
+    lines = [
+        f"## Preview: {preview.action} (not applied)\n",
+        f"**{len(preview.result):,} documents** after the operation "
+        f"(currently {preview.primary_size:,}): "
+        f"+{len(preview.added):,} added, -{len(preview.removed):,} removed\n",
+    ]
+    for label, bibcodes in (
+        ("Added", preview.added),
+        ("Removed", preview.removed),
+        ("Result", preview.result),
+    ):
+        if not bibcodes:
+            continue
+        lines.append(f"### {label}")
+        for bib in bibcodes[:sample]:
+            lines.append(f"- `{bib}`")
+        if len(bibcodes) > sample:
+            lines.append(f"- ... and {len(bibcodes) - sample:,} more")
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,326 @@
+"""Background jobs for long-running harvests, checkpointed to disk."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Literal, TypeVar
+
+from mcp_server_ads import tracing
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.deadlines import unbounded
+from mcp_server_ads.decoding import StringField
+from mcp_server_ads.errors import ADSRateLimitError, ADSServerError, ADSUnavailableError
+from mcp_server_ads.shared import StateFile
+from mcp_server_ads.storage import read_json, write_json
+
+T = TypeVar("T")
+
+JobKind = Literal["search", "export"]
+JobStatus = Literal["pending", "running", "done", "failed", "cancelled"]
+
+SEARCH_PAGE_SIZE = 2000
+EXPORT_CHUNK_SIZE = 2000
+"""Records fetched per step; progress is checkpointed after every step."""
+
+MAX_CONCURRENT_JOBS = 2
+MAX_RETRIES = 5
+RETRY_DELAY = 2.0
+"""Initial delay in seconds between retries of a failed step, doubled each time."""
+
+
+@dataclass
+class Job:
+    """Persistent state of one job.
+
+    ``cursor`` counts the records already written to the result file and
+    ``result_bytes`` its size at that point, so a resumed job truncates any
+    partially written step and continues from the next one.
+    """
+
+    id: str
+    kind: JobKind
+    params: dict[str, Any]
+    status: JobStatus = "pending"
+    cursor: int = 0
+    total: int | None = None
+    result_bytes: int = 0
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+
+class _FinishedElsewhere(Exception):
+    """Another worker saved the job finished (e.g. cancelled it) first."""
+
+
+class JobManager:
+    """Runs jobs on the shared ``ADSClient`` and checkpoints them under ``directory``.
+
+    Each job has a ``<id>.json`` checkpoint and a ``<id>.result`` file
+    (JSON lines of docs for ``search``, export text for ``export``); export
+    text is decoded and written to the result file as the response arrives.
+    Jobs left pending or running by a previous process are resumed by ``start``.
+    Steps wait out an exhausted rate limit or an open circuit breaker
+    instead of failing.
+
+    With a ``shared`` state file (several workers), jobs run by other
+    workers are read from their checkpoints, and cancelling one marks its
+    checkpoint, which the worker running it notices at its next step. A
+    finished checkpoint is never overwritten.
+    """
+
+    def __init__(self, client: ADSClient, directory: Path, shared: StateFile | None = None):
+        self._client = client
+        self._dir = directory
+        self._shared = shared
+        self._jobs: dict[str, Job] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+        self._load()
+
+    def start(self) -> None:
+        """Resume unfinished jobs from earlier runs."""
+        for job in self._jobs.values():
+            if not job.finished and job.id not in self._tasks:
+                self._launch(job)
+
+    async def submit(self, kind: JobKind, params: dict[str, Any]) -> Job:
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, params=params)
+        if kind == "export":
+            job.total = len(params["bibcodes"])
+        self._jobs[job.id] = job
+        await self._checkpoint(job)
+        self._launch(job)
+        return job
+
+    @property
+    def running(self) -> bool:
+        """Whether any job is running in this process."""
+        return bool(self._tasks)
+
+    def get(self, job_id: str) -> Job | None:
+        if self._shared is not None and job_id not in self._tasks and job_id.isalnum():
+            raw = read_json(self._checkpoint_path(job_id))
+            if raw:
+                self._jobs[job_id] = Job(**raw)
+        return self._jobs.get(job_id)
+
+    def all(self) -> list[Job]:
+        if self._shared is not None:
+            self._load()
+        return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def result_path(self, job_id: str) -> Path:
+        return self._dir / f"{job_id}.result"
+
+    def read_docs(self, job_id: str, start: int = 0, rows: int | None = None) -> list[dict]:
+        """Docs harvested so far by a ``search`` job."""
+        path = self.result_path(job_id)
+        if not path.exists():
+            return []
+        docs = []
+        with path.open(encoding="utf-8") as fh:
+            for i, line in enumerate(fh):
+                if i < start:
+                    continue
+                if rows is not None and len(docs) >= rows:
+                    break
+                docs.append(json.loads(line))
+        return docs
+
+    def read_text(self, job_id: str, max_chars: int | None = None) -> str:
+        """Export text written so far by an ``export`` job."""
+        path = self.result_path(job_id)
+        if not path.exists():
+            return ""
+        with path.open(encoding="utf-8") as fh:
+            return fh.read(-1 if max_chars is None else max_chars)
+
+    async def cancel(self, job_id: str) -> bool:
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.status = "cancelled"
+        try:
+            await self._checkpoint(job)
+        except _FinishedElsewhere:
+            self.get(job_id)
+            return False
+        return True
+
+    async def wait(self, job_id: str) -> Job:
+        """Wait for a job to stop running and return it."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self._jobs[job_id]
+
+    async def close(self) -> None:
+        """Stop running jobs, leaving their checkpoints for the next start."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _launch(self, job: Job) -> None:
+        # Jobs outlive the tool call that submits them, so they don't inherit its deadline.
+        with unbounded():
+            task = asyncio.get_running_loop().create_task(self._run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+
+    async def _run(self, job: Job) -> None:
+        async with self._slots:
+            try:
+                job.status = "running"
+                await self._checkpoint(job)
+                self._truncate(job)
+                while not await self._step(job):
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except _FinishedElsewhere:
+                self._jobs[job.id] = Job(**read_json(self._checkpoint_path(job.id)))
+                return
+            except Exception as exc:
+                job.status = "failed"
+                job.error = str(exc)
+            else:
+                job.status = "done"
+            try:
+                await self._checkpoint(job)
+            except _FinishedElsewhere:
+                self._jobs[job.id] = Job(**read_json(self._checkpoint_path(job.id)))
+
+    async def _step(self, job: Job) -> bool:
+        """Fetch and store the next chunk of ``job``; return True when complete."""
+        if job.kind == "search":
+            params = job.params
+            data = await self._request("/v1/search/query", lambda: self._client.get(
+                "/v1/search/query",
+                params={
+                    "q": params["query"],
+                    "fl": params["fields"],
+                    "sort": params["sort"],
+                    "rows": SEARCH_PAGE_SIZE,
+                    "start": job.cursor,
+                },
+            ))
+            response = data.get("response", {})
+            docs = response.get("docs", [])
+            job.total = response.get("numFound", 0)
+            await self._append(job, "".join(json.dumps(doc) + "\n" for doc in docs), len(docs))
+            return not docs or job.cursor >= job.total
+
+        bibcodes = job.params["bibcodes"][job.cursor : job.cursor + EXPORT_CHUNK_SIZE]
+        if not bibcodes:
+            return True
+        path = f"/v1/export/{job.params['format']}"
+        with self.result_path(job.id).open("ab") as fh:
+
+            async def export() -> None:
+                tail = "\n"
+
+                def write(text: str) -> None:
+                    nonlocal tail
+                    fh.write(text.encode("utf-8"))
+                    tail = text[-1]
+
+                # The export text goes to the result file as it arrives.
+                export = StringField("export", write)
+                try:
+                    await self._client.stream_to(
+                        "POST", path, export.feed,
+                        json={"bibcode": bibcodes, "sort": [job.params["sort"]]},
+                    )
+                    export.close()
+                except BaseException:
+                    fh.truncate(job.result_bytes)  # drop the part of a failed attempt
+                    fh.seek(job.result_bytes)
+                    raise
+                if tail != "\n" or fh.tell() == job.result_bytes:
+                    fh.write(b"\n")
+
+            await self._request(path, export)
+            await self._commit(job, fh, len(bibcodes))
+        return job.cursor >= job.total
+
+    async def _request(self, path: str, send: Callable[[], Awaitable[T]]) -> T:
+        """Await ``send()``, retrying rate-limit, server and breaker failures."""
+        delay = RETRY_DELAY
+        with tracing.span("ads.job.request", **{"url.path": path}) as span:
+            for attempt in range(MAX_RETRIES + 1):
+                await self._wait_for_rate_limit()
+                try:
+                    return await send()
+                except (ADSRateLimitError, ADSServerError, ADSUnavailableError) as exc:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    if span is not None:
+                        span.set_attribute("ads.retries", attempt + 1)
+                    retry_in = exc.retry_in if isinstance(exc, ADSUnavailableError) else 0.0
+                    await asyncio.sleep(max(delay, retry_in))
+                    delay *= 2
+
+    async def _wait_for_rate_limit(self) -> None:
+        limits = self._client.rate_limits
+        if limits.exhausted and limits.reset is not None:
+            await asyncio.sleep(max(limits.reset - time.time(), 0) + 1)
+
+    async def _append(self, job: Job, text: str, records: int) -> None:
+        with self.result_path(job.id).open("ab") as fh:
+            fh.write(text.encode("utf-8"))
+            await self._commit(job, fh, records)
+
+    async def _commit(self, job: Job, fh: BinaryIO, records: int) -> None:
+        """Make what was written to ``fh`` durable and checkpoint ``records`` more."""
+        fh.flush()
+        os.fsync(fh.fileno())
+        job.result_bytes = fh.tell()
+        job.cursor += records
+        await self._checkpoint(job)
+
+    def _truncate(self, job: Job) -> None:
+        path = self.result_path(job.id)
+        if path.exists() and path.stat().st_size != job.result_bytes:
+            with path.open("r+b") as fh:
+                fh.truncate(job.result_bytes)
+
+    def _load(self) -> None:
+        for path in sorted(self._dir.glob("*.json")):
+            raw = read_json(path)
+            if raw and raw["id"] not in self._tasks:
+                self._jobs[raw["id"]] = Job(**raw)
+
+    def _checkpoint_path(self, job_id: str) -> Path:
+        return self._dir / f"{job_id}.json"
+
+    async def _checkpoint(self, job: Job) -> None:
+        path = self._checkpoint_path(job.id)
+        job.updated_at = time.time()
+        if self._shared is None:
+            write_json(path, asdict(job))
+            return
+
+        def not_finished() -> None:
+            saved = read_json(path)
+            if saved and saved["status"] in ("done", "failed", "cancelled"):
+                raise _FinishedElsewhere(job.id)
+
+        await self._shared.save_json(path, asdict(job), None, not_finished)
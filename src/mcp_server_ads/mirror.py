@@ -0,0 +1,273 @@
+"""Local mirror of ADS libraries with incremental sync."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, unquote
+
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.errors import ADSError, ADSNotFoundError
+from mcp_server_ads.storage import read_json, signature, write_json
+
+PAGE_SIZE = 2000
+"""Documents requested per page (the biblib maximum)."""
+
+MAX_CONCURRENT_PAGES = 4
+"""Pages of one library requested at once."""
+
+MAX_CONCURRENT_LIBRARIES = 2
+"""Libraries downloaded at once by ``sync``, each with its own page limit."""
+
+UNLISTED_TTL = 300.0
+"""Seconds a library missing from the user's listing (someone else's public
+library) is served from the mirror before its metadata is checked again."""
+
+
+@dataclass
+class MirroredLibrary:
+    """A complete local copy of one library."""
+
+    metadata: dict[str, Any]
+    documents: list[str]
+    notes: list[dict[str, Any]] = field(default_factory=list)
+    synced_at: float = field(default_factory=time.time)
+
+    def detail(self, rows: int | None = None, start: int = 0) -> dict[str, Any]:
+        """Return a biblib-shaped response for a slice of the documents."""
+        end = None if rows is None else start + rows
+        return {"metadata": self.metadata, "documents": self.documents[start:end]}
+
+
+@dataclass
+class SyncReport:
+    fetched: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def _is_current(lib: MirroredLibrary, listed: dict[str, Any]) -> bool:
+    meta = lib.metadata
+    return (
+        meta.get("date_last_modified") == listed.get("date_last_modified")
+        and meta.get("num_documents") == listed.get("num_documents")
+    )
+
+
+class LibraryMirror:
+    """Keeps full copies of libraries so reads don't page through biblib.
+
+    Libraries are fetched in full (all pages concurrently, plus notes) the first
+    time they are read. ``current`` and ``sync`` compare ``date_last_modified`` and
+    ``num_documents`` against the library listing and refetch only libraries
+    that changed. A library missing from the listing (someone else's public
+    library) is served for ``UNLISTED_TTL`` seconds, then checked against its
+    own metadata the same way.
+
+    Each library is persisted as ``<id>.json`` under ``directory``, so a write
+    replaces one library's file only. A file replaced or removed by another
+    worker is reread on the next access.
+    """
+
+    def __init__(self, client: ADSClient, directory: Path | None = None):
+        self._client = client
+        self._dir = directory
+        self._cache: dict[str, tuple[tuple[int, int] | None, MirroredLibrary]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, library_id: str) -> bool:
+        return self.get(library_id) is not None
+
+    def get(self, library_id: str) -> MirroredLibrary | None:
+        path = self._file(library_id)
+        cached = self._cache.get(library_id)
+        if path is None:
+            return None if cached is None else cached[1]
+        current = signature(path)
+        if cached is not None and cached[0] == current:
+            return cached[1]
+        raw = None if current is None else read_json(path)
+        if raw is None:
+            self._cache.pop(library_id, None)
+            return None
+        lib = MirroredLibrary(**raw)
+        self._cache[library_id] = (current, lib)
+        return lib
+
+    def ids(self) -> list[str]:
+        """IDs of all mirrored libraries."""
+        if self._dir is None:
+            return list(self._cache)
+        return [unquote(path.stem) for path in sorted(self._dir.glob("*.json"))]
+
+    async def invalidate(self, library_id: str) -> None:
+        """Drop a library after a write so the next read refetches it."""
+        self._cache.pop(library_id, None)
+        path = self._file(library_id)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    async def library(self, library_id: str) -> MirroredLibrary:
+        """Return the mirrored library, fetching it in full if not mirrored yet."""
+        lib = self.get(library_id)
+        if lib is None:
+            self.misses += 1
+            return await self.fetch(library_id)
+        self.hits += 1
+        return lib
+
+    async def fetch(self, library_id: str) -> MirroredLibrary:
+        """Fetch all documents and notes of a library into the mirror."""
+        lib = await self._download(library_id)
+        await self._store(library_id, lib)
+        return lib
+
+    async def current(self, *library_ids: str) -> list[MirroredLibrary]:
+        """Return libraries as they are on ADS now.
+
+        One listing request tells which mirrored copies are still current;
+        the others are fetched again.
+        """
+        listing = {lib["id"]: lib for lib in await self._list_libraries()}
+
+        async def one(lib_id: str) -> MirroredLibrary:
+            lib = self.get(lib_id)
+            if lib is not None and await self._is_fresh(lib_id, lib, listing):
+                self.hits += 1
+                return lib
+            self.misses += 1
+            return await self.fetch(lib_id)
+
+        return list(await asyncio.gather(*map(one, library_ids)))
+
+    async def sync(self, library_ids: list[str] | None = None) -> SyncReport:
+        """Bring the mirror up to date, refetching only libraries that changed.
+
+        With ``library_ids`` only those libraries are checked; otherwise every
+        library in the account is mirrored and deleted ones are dropped.
+        Each library is saved as soon as it is downloaded, so a failure or
+        an expired deadline keeps the others; failures are listed in the
+        report. Libraries ADS no longer has are dropped.
+        """
+        listing = {lib["id"]: lib for lib in await self._list_libraries()}
+        wanted = list(listing) if library_ids is None else library_ids
+        report = SyncReport()
+
+        stale = []
+        for lib_id in wanted:
+            lib = self.get(lib_id)
+            if lib is not None and await self._is_fresh(lib_id, lib, listing):
+                report.unchanged.append(lib_id)
+            else:
+                stale.append(lib_id)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LIBRARIES)
+
+        async def refetch(lib_id: str) -> None:
+            try:
+                async with semaphore:
+                    lib = await self._download(lib_id)
+            except ADSNotFoundError:
+                await self.invalidate(lib_id)
+                report.removed.append(lib_id)
+            except ADSError as e:
+                report.failed[lib_id] = str(e)
+            else:
+                await self._store(lib_id, lib)
+                report.fetched.append(lib_id)
+
+        await asyncio.gather(*map(refetch, stale))
+        if library_ids is None:
+            for lib_id in self.ids():
+                if lib_id not in listing:
+                    await self.invalidate(lib_id)
+                    report.removed.append(lib_id)
+        return report
+
+    async def _is_fresh(
+        self, library_id: str, lib: MirroredLibrary, listing: dict[str, dict[str, Any]]
+    ) -> bool:
+        """Whether the mirrored ``lib`` still matches ADS.
+
+        Listed libraries are compared with their listing entry. Others are
+        trusted for ``UNLISTED_TTL`` seconds, then compared with the
+        metadata of a one-document page.
+        """
+        if library_id in listing:
+            return _is_current(lib, listing[library_id])
+        if time.time() - lib.synced_at < UNLISTED_TTL:
+            return True
+        try:
+            data = await self._client.get(
+                f"/v1/biblib/libraries/{library_id}",
+                params={"rows": 1, "start": 0, "fl": "bibcode"},
+            )
+        except ADSNotFoundError:
+            await self.invalidate(library_id)
+            return False
+        if not _is_current(lib, data.get("metadata", {})):
+            return False
+        lib.synced_at = time.time()  # good for another UNLISTED_TTL in this process
+        return True
+
+    def _file(self, library_id: str) -> Path | None:
+        if self._dir is None:
+            return None
+        return self._dir / f"{quote(library_id, safe='')}.json"
+
+    async def _store(self, library_id: str, lib: MirroredLibrary) -> None:
+        path = self._file(library_id)
+        if path is None:
+            self._cache[library_id] = (None, lib)
+            return
+        await asyncio.to_thread(write_json, path, asdict(lib))
+        self._cache[library_id] = (signature(path), lib)
+
+    async def _list_libraries(self) -> list[dict[str, Any]]:
+        libraries: list[dict[str, Any]] = []
+        while True:
+            data = await self._client.get(
+                "/v1/biblib/libraries",
+                params={"rows": PAGE_SIZE, "start": len(libraries)},
+            )
+            page = data.get("libraries", [])
+            libraries.extend(page)
+            if len(page) < PAGE_SIZE:
+                return libraries
+
+    async def _download(self, library_id: str) -> MirroredLibrary:
+        path = f"/v1/biblib/libraries/{library_id}"
+        first, notes = await asyncio.gather(
+            self._client.get(path, params={"rows": PAGE_SIZE, "start": 0, "fl": "bibcode"}),
+            self._notes(library_id),
+        )
+        metadata = first.get("metadata", {})
+        documents = list(first.get("documents", []))
+        total = metadata.get("num_documents", len(documents))
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def page(start: int) -> list[str]:
+            async with semaphore:
+                data = await self._client.get(
+                    path, params={"rows": PAGE_SIZE, "start": start, "fl": "bibcode"}
+                )
+            return data.get("documents", [])
+
+        starts = [i * PAGE_SIZE for i in range(1, math.ceil(total / PAGE_SIZE))]
+        for docs in await asyncio.gather(*map(page, starts)):
+            documents.extend(docs)
+        return MirroredLibrary(metadata=metadata, documents=documents, notes=notes)
+
+    async def _notes(self, library_id: str) -> list[dict[str, Any]]:
+        try:
+            data = await self._client.get(f"/v1/biblib/notes/{library_id}")
+        except ADSNotFoundError:
+            return []
+        return data if isinstance(data, list) else []
@@ -0,0 +1,266 @@
+"""Typed records for structured (JSON) tool output."""
+
+from __future__ import annotations
+
+from typing import Annotated, Any, Literal
+
+from fastmcp.tools.tool import ToolResult
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from mcp_server_ads.formatting import parse_reference_resolve
+
+OutputFormat = Annotated[
+    Literal["markdown", "json"],
+    Field(
+        description="Output format: 'markdown' for readable text (default) or 'json' "
+        "for structured records without markdown rendering"
+    ),
+]
+
+
+def structured(record: BaseModel) -> ToolResult:
+    """Wrap a record as FastMCP structured content, dropping empty fields."""
+    return ToolResult(structured_content=record.model_dump(mode="json", exclude_none=True))
+
+
+class Paper(BaseModel):
+    """A search result; only the fields requested via ``fl`` are present."""
+
+    model_config = ConfigDict(extra="allow")
+
+    bibcode: str | None = None
+    title: str | None = None
+    author: list[str] | None = None
+    year: str | None = None
+    pub: str | None = None
+    citation_count: int | None = None
+    abstract: str | None = None
+    identifier: list[str] | None = None
+    doi: list[str] | None = None
+
+    @field_validator("title", mode="before")
+    @classmethod
+    def _first_title(cls, value: Any) -> Any:
+        if isinstance(value, list):
+            return value[0] if value else None
+        return value
+
+
+class SearchResults(BaseModel):
+    num_found: int
+    start: int = 0
+    papers: list[Paper]
+
+    @classmethod
+    def from_response(cls, data: dict[str, Any]) -> SearchResults:
+        response = data.get("response", {})
+        return cls(
+            num_found=response.get("numFound", 0),
+            start=response.get("start", 0),
+            papers=[Paper.model_validate(doc) for doc in response.get("docs", [])],
+        )
+
+
+class Export(BaseModel):
+    format: str
+    text: str
+
+
+class Metrics(BaseModel):
+    total_papers: int | None = None
+    refereed_papers: int | None = None
+    total_reads: int | None = None
+    normalized_paper_count: float | None = None
+    total_citations: int | None = None
+    refereed_citations: int | None = None
+    h_index: int | None = None
+    g_index: int | None = None
+    i10_index: int | None = None
+    h_index_refereed: int | None = None
+    histograms: dict[str, Any] | None = None
+
+    @classmethod
+    def from_response(cls, data: dict[str, Any]) -> Metrics:
+        basic = data.get("basic stats", {})
+        basic_ref = data.get("basic stats refereed", {})
+        citation = data.get("citation stats", {})
+        citation_ref = data.get("citation stats refereed", {})
+        indicators = data.get("indicators", {})
+        indicators_ref = data.get("indicators refereed", {})
+        return cls(
+            total_papers=basic.get("number of papers"),
+            refereed_papers=basic_ref.get("number of papers"),
+            total_reads=basic.get("total number of reads"),
+            normalized_paper_count=basic.get("normalized paper count"),
+            total_citations=citation.get("total number of citations"),
+            refereed_citations=citation_ref.get("total number of citations"),
+            h_index=indicators.get("h"),
+            g_index=indicators.get("g"),
+            i10_index=indicators.get("i10"),
+            h_index_refereed=indicators_ref.get("h"),
+            histograms=data.get("histograms"),
+        )
+
+
+class Library(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    description: str | None = None
+    num_documents: int | None = None
+    public: bool | None = None
+    date_last_modified: str | None = None
+
+
+class Libraries(BaseModel):
+    libraries: list[Library]
+
+
+class LibraryDetail(BaseModel):
+    metadata: Library
+    documents: list[str]
+
+
+class Note(BaseModel):
+    bibcode: str | None = None
+    content: str | None = None
+
+
+class Notes(BaseModel):
+    notes: list[Note]
+
+
+class SetOperationPreview(BaseModel):
+    action: str
+    primary_size: int
+    result_size: int
+    added: int
+    removed: int
+    added_sample: list[str]
+    removed_sample: list[str]
+
+
+class Link(BaseModel):
+    title: str | None = None
+    type: str | None = None
+    url: str | None = None
+
+
+class Links(BaseModel):
+    links: list[Link]
+
+    @classmethod
+    def from_response(cls, data: dict[str, Any]) -> Links:
+        records = data.get("links", {}).get("records", [])
+        return cls(links=[Link.model_validate(record) for record in records])
+
+
+class ObjectQuery(BaseModel):
+    query: str | None = None
+
+
+class Suggestion(BaseModel):
+    bibcode: str | None = None
+    score: float | None = None
+    title: str | None = None
+    author: str | None = None
+
+
+class Suggestions(BaseModel):
+    suggestions: list[Suggestion]
+
+    @classmethod
+    def from_response(cls, data: dict[str, Any] | list) -> Suggestions:
+        items = data if isinstance(data, list) else data.get("new", [])
+        return cls(suggestions=[Suggestion.model_validate(item) for item in items])
+
+
+class ResolvedReference(BaseModel):
+    reference: str
+    bibcode: str | None = None
+    score: str | None = None
+
+
+class ResolvedReferences(BaseModel):
+    references: list[ResolvedReference]
+
+    @classmethod
+    def from_text(cls, text: str) -> ResolvedReferences:
+        return cls(references=[
+            ResolvedReference(reference=ref, bibcode=bibcode or None, score=score)
+            for score, bibcode, ref in parse_reference_resolve(text)
+        ])
+
+
+class NetworkGroup(BaseModel):
+    name: str | None = None
+    size: int | float | None = None
+
+
+class Network(BaseModel):
+    type: Literal["author", "paper"]
+    name: str | None = None
+    groups: list[NetworkGroup]
+    summary: list[Any] | None = None
+
+    @classmethod
+    def from_response(cls, type: Literal["author", "paper"], data: dict[str, Any]) -> Network:
+        d = data.get("data", {})
+        root = d.get("root", {})
+        return cls(
+            type=type,
+            name=root.get("name"),
+            groups=[NetworkGroup.model_validate(group) for group in root.get("children", [])],
+            summary=d.get("summary") or None,
+        )
+
+
+class IdentifierMatch(BaseModel):
+    identifier: str
+    type: Literal["doi", "arxiv", "bibcode"] | None = None
+    bibcode: str | None = None
+
+
+class IdentifierMatches(BaseModel):
+    matches: list[IdentifierMatch]
+    from_index: int
+    not_looked_up: int = Field(
+        default=0, description="Identifiers skipped because the tool's deadline passed"
+    )
+
+
+class Watch(BaseModel):
+    name: str
+    query: str
+    since: str | None = None
+
+
+class Watches(BaseModel):
+    watches: list[Watch]
+
+
+class WatchResults(BaseModel):
+    watch: Watch
+    baseline: bool
+    remaining: int
+    papers: list[Paper]
+
+
+class JobInfo(BaseModel):
+    id: str
+    kind: str
+    status: str
+    done: int
+    total: int | None = None
+    error: str | None = None
+    result_path: str | None = None
+
+
+class Jobs(BaseModel):
+    jobs: list[JobInfo]
+
+
+class Message(BaseModel):
+    """Outcome of an action that has no richer payload."""
+
+    message: str
+    count: int | None = None
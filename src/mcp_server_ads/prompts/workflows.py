@@ -6,6 +6,7 @@ from typing import Annotated
 
 from pydantic import Field
 
+from mcp_server_ads.bibcodes import split_valid
 from mcp_server_ads.server import mcp
 
 
@@ -101,6 +102,14 @@ def generate_bibliography(
     ] = "bibtex",
 ) -> str:
     """Generate a formatted bibliography from a search or bibcode list."""
+    bibcodes, invalid = split_valid(b for b in source.split(",") if b.strip())
+    if bibcodes and not invalid:
+        resolve = (
+            f"   - The source is a list of {len(bibcodes)} bibcodes. "
+            "Use ads_bigquery to verify them."
+        )
+    else:
+        resolve = "   - The source is a search query. Use ads_search to find matching papers."
     return f"""\
 Generate a formatted bibliography from the following source.
 
@@ -109,9 +118,7 @@ Source: {source}
 Steps:
 
 1. **Resolve Papers**:
-   - If the source looks like bibcodes (contains slashes or dots typical of bibcodes),
-     use ads_bigquery to verify them.
-   - Otherwise, use ads_search to find matching papers.
+{resolve}
 
 2. **Review Results**: Show the papers found and confirm they are the intended ones.
 
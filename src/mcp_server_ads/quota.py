@@ -0,0 +1,89 @@
+"""Rate-limit spend history and forecasts of when the ADS quota runs out."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import NamedTuple
+
+HISTORY_SECONDS = 86400.0
+"""How long spends are remembered: one ADS rate-limit window."""
+
+RATE_WINDOW = 3600.0
+"""Spends in this many recent seconds set the forecast spend rate."""
+
+MIN_RATE_SPAN = 60.0
+"""Shortest span a rate is averaged over, so a first burst isn't extrapolated."""
+
+
+class Spend(NamedTuple):
+    """One ADS request, charged to the tool call that made it."""
+
+    at: float
+    tool: str
+    call: str
+
+
+@dataclass
+class ToolCost:
+    tool: str
+    units_per_call: float
+    affordable: int | None
+
+
+@dataclass
+class QuotaForecast:
+    """Where the quota is heading at the recent spend rate.
+
+    ``exhausted_at`` is None when nothing was spent recently or the budget
+    outlasts the current window (``reset``).
+    """
+
+    remaining: int | None
+    reset: float | None
+    per_hour: float
+    exhausted_at: float | None
+    tools: list[ToolCost]
+
+
+def forecast(
+    limit: int | None,
+    remaining: int | None,
+    reset: float | None,
+    spends: Sequence[Spend],
+    now: float | None = None,
+) -> QuotaForecast:
+    """Forecast from the tracked budget and the spends of the last day.
+
+    Units per call of a tool only count calls that spent anything, so tools
+    often answered from a cache are estimated on the expensive side.
+    """
+    now = time.time() if now is None else now
+    if reset is not None and now > reset:
+        # A new window has started since the last response; assume a full budget.
+        remaining, reset = limit, None
+    recent = [s.at for s in spends if s.at >= now - RATE_WINDOW]
+    units: dict[str, int] = {}
+    calls: dict[str, set[str]] = {}
+    for spend in spends:
+        if spend.tool:
+            units[spend.tool] = units.get(spend.tool, 0) + 1
+            calls.setdefault(spend.tool, set()).add(spend.call)
+
+    per_hour = 0.0
+    if recent:
+        per_hour = len(recent) * 3600 / max(now - min(recent), MIN_RATE_SPAN)
+    exhausted_at = None
+    if remaining is not None and per_hour > 0:
+        exhausted_at = now + remaining / per_hour * 3600
+        if reset is not None and exhausted_at >= reset:
+            exhausted_at = None
+
+    tools = []
+    for tool, n in sorted(units.items()):
+        per_call = n / len(calls[tool])
+        affordable = None if remaining is None else math.floor(remaining / per_call)
+        tools.append(ToolCost(tool, per_call, affordable))
+    return QuotaForecast(remaining, reset, per_hour, exhausted_at, tools)
@@ -1,3 +1,3 @@
 """ADS MCP resources."""
 
-from mcp_server_ads.resources import fields, rate_limits, syntax  # noqa: F401
+from mcp_server_ads.resources import fields, rate_limits, stats, syntax  # noqa: F401
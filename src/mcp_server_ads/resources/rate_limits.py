@@ -8,9 +8,15 @@ from mcp_server_ads.server import mcp
 
 @mcp.resource("ads://rate-limits")
 def get_rate_limits(ctx: Context) -> str:
-    """Current ADS API rate-limit status from tracked headers."""
+    """Current ADS API rate-limit status from tracked headers, the recent
+    spend rate, when the budget will run out at that rate and how many
+    calls of each tool it can still afford."""
     try:
         client: ADSClient = ctx.lifespan_context["ads_client"]
-        return client.rate_limits.status_summary()
     except (KeyError, AttributeError):
         return "Rate limit data unavailable (no requests made yet)."
+    # Imported here so startup does not load formatting before the first tool call.
+    from mcp_server_ads.formatting import format_rate_limits
+
+    limits = client.rate_limits
+    return format_rate_limits(limits.status_summary(), limits.forecast())
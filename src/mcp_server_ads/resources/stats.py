@@ -0,0 +1,27 @@
+"""Request/tool statistics resource and Prometheus endpoint."""
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from mcp_server_ads.config import ADS_METRICS_PATH
+from mcp_server_ads.server import mcp
+from mcp_server_ads.stats import STATS
+
+
+@mcp.resource("ads://stats")
+def get_stats() -> str:
+    """Per-endpoint and per-tool call counts, latency percentiles, bytes,
+    rate-limit units spent and cache hit ratios since the server started."""
+    # Imported here so startup does not load formatting before the first tool call.
+    from mcp_server_ads.formatting import format_stats
+
+    return format_stats(STATS.snapshot())
+
+
+if ADS_METRICS_PATH:
+
+    @mcp.custom_route(ADS_METRICS_PATH, methods=["GET"], include_in_schema=False)
+    async def prometheus_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(
+            STATS.prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -6,18 +6,43 @@ from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 from fastmcp import FastMCP
+from starlette.applications import Starlette
 
-from mcp_server_ads.client import ADSClient
+from mcp_server_ads.breaker import StaleNoticeMiddleware
+from mcp_server_ads.config import ADS_CACHE_DIR, ADS_STATE_FILE, ADS_WORKERS
+from mcp_server_ads.crosswalk import CrosswalkIndex
+from mcp_server_ads.deadlines import DeadlineMiddleware
+from mcp_server_ads.shared import StateFile
+from mcp_server_ads.stats import STATS, StatsMiddleware
+from mcp_server_ads.tenants import TenantMiddleware, Tenants, TenantState
 
 
 @asynccontextmanager
-async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
-    """Create and tear down the shared ADS HTTP client."""
-    client = ADSClient.create()
+async def lifespan(server: FastMCP) -> AsyncIterator[TenantState]:
+    """Create and tear down the shared connection pool and local state.
+
+    ``ads_client``, ``library_mirror``, ``watches`` and ``jobs`` belong to
+    the tenant of the current request (see ``mcp_server_ads.tenants``);
+    ``crosswalk`` is shared. ``local_files`` says whether tools may read
+    and write files on the server for the caller, which a multi-tenant
+    server's remote users must not. With several workers, rate limits and
+    public responses are shared through ``ADS_STATE_FILE``.
+    """
+    crosswalk = CrosswalkIndex(ADS_CACHE_DIR / "crosswalk.sqlite")
+    shared = StateFile(ADS_STATE_FILE) if ADS_WORKERS > 1 else None
+    tenants = Tenants(ADS_CACHE_DIR, crosswalk, shared=shared)
+    STATS.register_cache("crosswalk", crosswalk)
+    if tenants.public_cache is not None:
+        STATS.register_cache("public_responses", tenants.public_cache)
     try:
-        yield {"ads_client": client}
+        yield TenantState(
+            tenants, {"crosswalk": crosswalk, "local_files": not tenants.multi_tenant}
+        )
     finally:
-        await client.close()
+        await tenants.close()
+        crosswalk.close()
+        if shared is not None:
+            shared.close()
 
 
 mcp = FastMCP(
@@ -33,7 +58,13 @@ mcp = FastMCP(
         "Read the ads://syntax resource for the full query syntax reference."
     ),
     lifespan=lifespan,
+    # Importing a tool module replaces the stub registered from the manifest.
+    on_duplicate="replace",
 )
+mcp.add_middleware(TenantMiddleware())
+mcp.add_middleware(StatsMiddleware())
+mcp.add_middleware(DeadlineMiddleware())
+mcp.add_middleware(StaleNoticeMiddleware())
 
 # Register tools, resources, and prompts by importing submodules.
 import mcp_server_ads.prompts  # noqa: E402, F401
@@ -41,5 +72,33 @@ import mcp_server_ads.resources  # noqa: E402, F401
 import mcp_server_ads.tools  # noqa: E402, F401
 
 
+def http_app() -> Starlette:
+    """ASGI app for one worker process of a multi-worker server.
+
+    Stateless, since successive requests of one MCP session may reach
+    different workers.
+    """
+    from mcp_server_ads.tracing import configure
+
+    configure()
+    return mcp.http_app(stateless_http=True)
+
+
 def main() -> None:
+    if ADS_WORKERS > 1:
+        import fastmcp
+        import uvicorn
+
+        uvicorn.run(
+            f"{__name__}:http_app",
+            factory=True,
+            workers=ADS_WORKERS,
+            host=fastmcp.settings.host,
+            port=fastmcp.settings.port,
+        )
+        return
+
+    from mcp_server_ads.tracing import configure
+
+    configure()
     mcp.run()
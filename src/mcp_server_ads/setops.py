@@ -0,0 +1,51 @@
+"""Local set algebra over library bibcode sets."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Literal
+
+SetAction = Literal["union", "intersection", "difference"]
+
+
+@dataclass
+class SetPreview:
+    """Outcome of a set operation, relative to the primary library."""
+
+    action: SetAction
+    primary_size: int
+    result: list[str]
+    added: list[str]
+    removed: list[str]
+
+
+def preview_operation(
+    action: SetAction,
+    primary: Iterable[str],
+    others: Iterable[Iterable[str]],
+) -> SetPreview:
+    """Compute what a biblib set operation would leave in the primary library.
+
+    Matches the biblib semantics: ``union`` and ``intersection`` combine the
+    primary with every other library, ``difference`` removes the bibcodes of
+    all other libraries from the primary. Hash sets keep each operation linear
+    in the total number of documents; only the outputs are sorted.
+    """
+    base = set(primary)
+    result = set(base)
+    for other in others:
+        if action == "union":
+            result.update(other)
+        elif action == "intersection":
+            result.intersection_update(other)
+        elif action == "difference":
+            result.difference_update(other)
+        else:
+            raise ValueError(f"Unsupported set operation: {action}")
+    return SetPreview(
+        action=action,
+        primary_size=len(base),
+        result=sorted(result),
+        added=sorted(result - base),
+        removed=sorted(base - result),
+    )
@@ -0,0 +1,361 @@
+"""State shared by the worker processes of a multi-worker server.
+
+With ``ADS_WORKERS`` above 1 every worker opens the same SQLite state file
+(``ADS_STATE_FILE``) in WAL mode. It holds the public response cache and one
+rate-limit row and spend history per tenant, so a response fetched by one
+worker answers the others, and every worker sees the budget the others have
+spent instead of believing the whole ADS daily limit is its own.
+
+Library mirrors, watches and job checkpoints stay in their JSON files. Given
+the ``StateFile``, their stores save a file with ``StateFile.save_json``,
+which bumps a version kept in the database, and reload it when another
+worker bumped that version.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+import httpx
+
+from mcp_server_ads.cache import STALE_FOR, CachedResponse, ResponseCache
+from mcp_server_ads.client import RateLimitTracker
+from mcp_server_ads.config import ADS_PUBLIC_CACHE_BYTES
+from mcp_server_ads.quota import HISTORY_SECONDS, QuotaForecast, Spend
+from mcp_server_ads.stats import current_call
+from mcp_server_ads.storage import write_json_beside
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY, body BLOB NOT NULL, content_type TEXT NOT NULL, expires REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rate_limits (
+    tenant TEXT PRIMARY KEY, "limit" INTEGER, remaining INTEGER, reset REAL
+);
+CREATE TABLE IF NOT EXISTS spends (
+    tenant TEXT NOT NULL, at REAL NOT NULL, tool TEXT NOT NULL, call TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spends_by_time ON spends (tenant, at);
+CREATE TABLE IF NOT EXISTS versions (path TEXT PRIMARY KEY, version INTEGER NOT NULL);
+"""
+
+T = TypeVar("T")
+
+PRUNE_EVERY = 100
+"""Cache writes between sweeps of expired, excess and oversized responses."""
+
+
+class StateFile:
+    """SQLite database opened by every worker, plus a lock electing one leader.
+
+    Anything that writes, and so may wait up to ``timeout`` seconds for
+    another worker's write lock, runs on one writer thread with its own
+    connection (``run`` and ``run_soon``); the event loop only reads, through
+    ``db``, which WAL mode never makes wait.
+    """
+
+    def __init__(self, path: Path, timeout: float = 10):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+        self._writer_db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._writer_db.execute("PRAGMA synchronous=NORMAL")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-file")
+        self._in_transaction = contextvars.ContextVar(f"in_transaction_{id(self)}", default=False)
+        self._lock: sqlite3.Connection | None = None
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call ``fn(*args)`` on the writer thread and wait for its result."""
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._writer, ctx.run, fn, *args)
+
+    def run_soon(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Queue ``fn(*args)`` on the writer thread without waiting for it."""
+        self._writer.submit(fn, *args)
+
+    def flush(self) -> None:
+        """Wait for the writes queued so far."""
+        self._writer.submit(lambda: None).result()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Read-modify-write without another worker writing in between.
+
+        Only for the writer thread. Reentrant: a transaction opened inside
+        another joins it.
+        """
+        if self._in_transaction.get():
+            yield self._writer_db
+            return
+        reset = self._in_transaction.set(True)
+        self._writer_db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._writer_db
+        except BaseException:
+            self._writer_db.execute("ROLLBACK")
+            raise
+        else:
+            self._writer_db.execute("COMMIT")
+        finally:
+            self._in_transaction.reset(reset)
+
+    def version(self, path: Path) -> int:
+        """How many times ``path`` was saved through ``save_json``."""
+        row = self.db.execute(
+            "SELECT version FROM versions WHERE path = ?", (str(path),)
+        ).fetchone()
+        return 0 if row is None else row[0]
+
+    async def save_json(
+        self,
+        path: Path,
+        data: Any,
+        version: int | None,
+        check: Callable[[], None] | None = None,
+    ) -> int | None:
+        """Replace the JSON file ``path`` unless another worker saved it after ``version``.
+
+        The file is written next to ``path`` first, off the event loop. Only
+        moving it into place and bumping its version happen under the write
+        lock, after ``check``, which may raise to keep the old file. Returns
+        the new version, or None if ``path`` is at a later version (reread it
+        and try again). A ``version`` of None replaces whatever is there.
+        """
+        tmp = await asyncio.to_thread(write_json_beside, path, data)
+
+        def publish() -> int | None:
+            with self.transaction() as db:
+                row = db.execute(
+                    "SELECT version FROM versions WHERE path = ?", (str(path),)
+                ).fetchone()
+                current = 0 if row is None else row[0]
+                if version is not None and version != current:
+                    return None
+                if check is not None:
+                    check()
+                os.replace(tmp, path)
+                db.execute(
+                    "INSERT OR REPLACE INTO versions VALUES (?, ?)", (str(path), current + 1)
+                )
+                return current + 1
+
+        try:
+            saved = await self.run(publish)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return saved
+
+    def lead(self) -> bool:
+        """Whether this process is the leader, becoming it if no one else is.
+
+        The leader holds an exclusive lock on ``<state file>.lock`` until it
+        exits, so exactly one worker does once-per-deployment work such as
+        resuming background jobs.
+        """
+        if self._lock is not None:
+            return True
+        path = self.path.with_name(self.path.name + ".lock")
+        lock = sqlite3.connect(path, timeout=0, isolation_level=None)
+        try:
+            lock.execute("BEGIN EXCLUSIVE")
+        except sqlite3.OperationalError:
+            lock.close()
+            return False
+        self._lock = lock
+        return True
+
+    def close(self) -> None:
+        self._writer.shutdown()
+        self._writer_db.close()
+        self.db.close()
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+
+class SharedResponseCache(ResponseCache):
+    """``ResponseCache`` kept in the state file, so one worker's fetch serves all."""
+
+    def __init__(
+        self,
+        state: StateFile,
+        ttl: float,
+        max_entries: int = 10000,
+        max_bytes: int = ADS_PUBLIC_CACHE_BYTES,
+    ):
+        super().__init__(ttl, max_entries, max_bytes)
+        self._state = state
+        self._db = state.db
+        self._writes = 0
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> CachedResponse | None:
+        row = self._db.execute(
+            "SELECT body, content_type, expires FROM responses WHERE key = ? AND expires >= ?",
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse(*row)
+
+    def age(self, entry: CachedResponse) -> float:
+        return time.time() - (entry.expires - self.ttl)
+
+    def stale(self, key: str) -> CachedResponse | None:
+        row = self._db.execute(
+            "SELECT body, content_type, expires FROM responses WHERE key = ? AND expires >= ?",
+            (key, time.time() - STALE_FOR),
+        ).fetchone()
+        return None if row is None else CachedResponse(*row)
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        """Store a response, in the background on the state file's writer thread."""
+        if not self.fits(body):
+            return
+        self._state.run_soon(self._insert, key, body, content_type, time.time() + self.ttl)
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self._state.run_soon(self.prune)
+
+    def _insert(self, key: str, body: bytes, content_type: str, expires: float) -> None:
+        with self._state.transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, body, content_type, expires),
+            )
+
+    def prune(self) -> None:
+        """Drop responses too old to serve stale, then the oldest beyond the limits.
+
+        Blocks on the write lock, so only for the writer thread.
+        """
+        with self._state.transaction() as db:
+            db.execute("DELETE FROM responses WHERE expires < ?", (time.time() - STALE_FOR,))
+            db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM "
+                "(SELECT key, sum(length(body)) OVER (ORDER BY expires DESC) AS total "
+                "FROM responses) WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+
+class SharedRateLimitTracker(RateLimitTracker):
+    """``RateLimitTracker`` for one tenant whose counts live in the state file.
+
+    Each request is charged to the shared row as it is sent, so workers
+    see each other's requests in flight. Within one rate-limit window the
+    lowest ``remaining`` reported wins, since responses from different
+    workers arrive out of order. Writes go to the state file's writer
+    thread; reads see them once it has caught up.
+    """
+
+    def __init__(self, state: StateFile, tenant: str):
+        super().__init__()
+        self._state = state
+        self._tenant = tenant
+        self.refresh()
+
+    def refresh(self) -> None:
+        row = self._state.db.execute(
+            'SELECT "limit", remaining, reset FROM rate_limits WHERE tenant = ?', (self._tenant,)
+        ).fetchone()
+        if row is not None:
+            self.limit, self.remaining, self.reset = row
+
+    def update(self, headers: httpx.Headers) -> None:
+        seen = RateLimitTracker()
+        seen.update(headers)
+        self._merge(self, seen)
+        self._state.run_soon(self._store, seen)
+        self._last_updated = time.monotonic()
+
+    @staticmethod
+    def _merge(into: RateLimitTracker, seen: RateLimitTracker) -> None:
+        if seen.limit is not None:
+            into.limit = seen.limit
+        if seen.remaining is not None:
+            if seen.reset == into.reset and into.remaining is not None:
+                into.remaining = min(into.remaining, seen.remaining)
+            elif into.reset is None or seen.reset is None or seen.reset > into.reset:
+                into.remaining = seen.remaining
+        if seen.reset is not None and (into.reset is None or seen.reset > into.reset):
+            into.reset = seen.reset
+
+    def _store(self, seen: RateLimitTracker) -> None:
+        """Merge reported limits into the shared row (on the writer thread)."""
+        with self._state.transaction() as db:
+            row = db.execute(
+                'SELECT "limit", remaining, reset FROM rate_limits WHERE tenant = ?',
+                (self._tenant,),
+            ).fetchone()
+            merged = RateLimitTracker(*row) if row is not None else RateLimitTracker()
+            self._merge(merged, seen)
+            db.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?)",
+                (self._tenant, merged.limit, merged.remaining, merged.reset),
+            )
+            db.execute(
+                "DELETE FROM spends WHERE tenant = ? AND at < ?",
+                (self._tenant, time.time() - HISTORY_SECONDS),
+            )
+
+    def spend(self) -> None:
+        if self.remaining:
+            self.remaining -= 1
+        self.record(Spend(time.time(), *current_call()))
+
+    def record(self, spend: Spend) -> None:
+        self._state.run_soon(self._charge, spend)
+
+    def _charge(self, spend: Spend) -> None:
+        with self._state.transaction() as db:
+            db.execute(
+                "UPDATE rate_limits SET remaining = remaining - 1 "
+                "WHERE tenant = ? AND remaining > 0",
+                (self._tenant,),
+            )
+            db.execute("INSERT INTO spends VALUES (?, ?, ?, ?)", (self._tenant, *spend))
+
+    def recent(self, since: float) -> list[Spend]:
+        rows = self._state.db.execute(
+            "SELECT at, tool, call FROM spends WHERE tenant = ? AND at >= ? ORDER BY at",
+            (self._tenant, since),
+        )
+        return [Spend(*row) for row in rows]
+
+    def forecast(self, now: float | None = None) -> QuotaForecast:
+        self.refresh()
+        return super().forecast(now)
+
+    @property
+    def exhausted(self) -> bool:
+        self.refresh()
+        return super().exhausted
+
+    def status_summary(self) -> str:
+        self.refresh()
+        return super().status_summary()
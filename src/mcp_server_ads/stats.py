@@ -0,0 +1,222 @@
+"""Request and tool instrumentation: counters, bytes and latency histograms."""
+
+from __future__ import annotations
+
+import bisect
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""Histogram upper bounds in seconds (Prometheus ``le`` labels)."""
+
+_ENDPOINT_PART = re.compile(r"^[a-z_-]+$")
+
+
+def endpoint_name(path: str) -> str:
+    """Collapse an API path to its endpoint, dropping IDs and bibcodes.
+
+    ``/v1/biblib/documents/abc123`` -> ``/v1/biblib/documents``,
+    ``/v1/resolver/2016PhRvL.116f1102A/esource`` -> ``/v1/resolver``.
+    """
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    kept = parts[:2]
+    if len(parts) > 2 and _ENDPOINT_PART.match(parts[2]):
+        kept.append(parts[2])
+    return "/" + "/".join(kept)
+
+
+class Histogram:
+    """Fixed-bucket histogram with interpolated quantiles."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile, interpolating linearly within a bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return LATENCY_BUCKETS[-1]
+
+
+@dataclass
+class Series:
+    """Counters for one endpoint or tool.
+
+    ``units`` counts ADS requests, each of which spends one unit of the
+    daily rate limit. ``hedges`` counts duplicate requests sent because
+    the first was slow.
+    """
+
+    count: int = 0
+    errors: int = 0
+    bytes: int = 0
+    units: int = 0
+    hedges: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+    def summary(self) -> dict[str, Any]:
+        def ms(q: float) -> float | None:
+            value = self.latency.quantile(q)
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "units": self.units,
+            "hedges": self.hedges,
+            "p50_ms": ms(0.5),
+            "p95_ms": ms(0.95),
+            "p99_ms": ms(0.99),
+        }
+
+
+class CacheSource(Protocol):
+    hits: int
+    misses: int
+
+
+_current_tool: ContextVar[Series | None] = ContextVar("current_tool", default=None)
+_current_call: ContextVar[tuple[str, str]] = ContextVar("current_call", default=("", ""))
+
+
+def current_call() -> tuple[str, str]:
+    """Name and ID of the tool call being run, or empty strings outside one."""
+    return _current_call.get()
+
+
+class Stats:
+    """Per-endpoint and per-tool series plus registered cache hit counters."""
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.endpoints: dict[str, Series] = {}
+        self.tools: dict[str, Series] = {}
+        self._caches: dict[str, CacheSource] = {}
+
+    def register_cache(self, name: str, source: CacheSource) -> None:
+        """Report ``source.hits``/``source.misses`` under ``name``."""
+        self._caches[name] = source
+
+    def record_request(self, path: str, seconds: float, nbytes: int, error: bool) -> None:
+        """Record one ADS request, also charging it to the tool being run."""
+        series = self.endpoints.setdefault(endpoint_name(path), Series())
+        tool = _current_tool.get()
+        for s in (series,) if tool is None else (series, tool):
+            s.bytes += nbytes
+            s.units += 1
+        series.count += 1
+        series.errors += error
+        series.latency.observe(seconds)
+
+    def record_hedge(self, path: str) -> None:
+        self.endpoints.setdefault(endpoint_name(path), Series()).hedges += 1
+
+    def record_tool(self, series: Series, seconds: float, error: bool) -> None:
+        series.count += 1
+        series.errors += error
+        series.latency.observe(seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        caches = {}
+        for name, source in self._caches.items():
+            total = source.hits + source.misses
+            caches[name] = {
+                "hits": source.hits,
+                "misses": source.misses,
+                "hit_ratio": round(source.hits / total, 3) if total else None,
+            }
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "endpoints": {k: v.summary() for k, v in sorted(self.endpoints.items())},
+            "tools": {k: v.summary() for k, v in sorted(self.tools.items())},
+            "caches": caches,
+        }
+
+    def prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for kind, table in (("endpoint", self.endpoints), ("tool", self.tools)):
+            prefix = f"ads_{kind}"
+            for metric, attr, help_text in (
+                ("requests_total", "count", "Calls"),
+                ("errors_total", "errors", "Failed calls"),
+                ("response_bytes_total", "bytes", "Response bytes received from ADS"),
+                ("rate_limit_units_total", "units", "ADS rate-limit units spent"),
+                ("hedges_total", "hedges", "Duplicate requests sent for slow reads"),
+            ):
+                lines.append(f"# HELP {prefix}_{metric} {help_text} per {kind}.")
+                lines.append(f"# TYPE {prefix}_{metric} counter")
+                for name, series in sorted(table.items()):
+                    lines.append(f'{prefix}_{metric}{{{kind}="{name}"}} {getattr(series, attr)}')
+            lines.append(f"# HELP {prefix}_latency_seconds Latency per {kind}.")
+            lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+            for name, series in sorted(table.items()):
+                hist = series.latency
+                cumulative = 0
+                for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), hist.counts):
+                    cumulative += n
+                    lines.append(
+                        f'{prefix}_latency_seconds_bucket{{{kind}="{name}",le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f'{prefix}_latency_seconds_sum{{{kind}="{name}"}} {hist.sum}')
+                lines.append(f'{prefix}_latency_seconds_count{{{kind}="{name}"}} {hist.count}')
+        lines.append("# HELP ads_cache_hits_total Cache hits.")
+        lines.append("# TYPE ads_cache_hits_total counter")
+        lines.append("# HELP ads_cache_misses_total Cache misses.")
+        lines.append("# TYPE ads_cache_misses_total counter")
+        for name, source in sorted(self._caches.items()):
+            lines.append(f'ads_cache_hits_total{{cache="{name}"}} {source.hits}')
+            lines.append(f'ads_cache_misses_total{{cache="{name}"}} {source.misses}')
+        return "\n".join(lines) + "\n"
+
+
+STATS = Stats()
+"""Process-wide statistics shared by the client, the middleware and the resource."""
+
+
+class StatsMiddleware(Middleware):
+    """Times every tool call and attributes the ADS requests it makes."""
+
+    def __init__(self, stats: Stats = STATS):
+        self.stats = stats
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        name = context.message.name
+        series = self.stats.tools.setdefault(name, Series())
+        token = _current_tool.set(series)
+        call = _current_call.set((name, uuid.uuid4().hex[:12]))
+        start = time.perf_counter()
+        error = True
+        try:
+            result = await call_next(context)
+            error = bool(getattr(result, "is_error", False))
+            return result
+        finally:
+            _current_tool.reset(token)
+            _current_call.reset(call)
+            self.stats.record_tool(series, time.perf_counter() - start, error)
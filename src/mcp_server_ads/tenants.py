@@ -0,0 +1,260 @@
+"""Per-token ADS clients and private state for serving several users at once.
+
+Each tenant (one ADS token) gets its own ``ADSClient`` with its own
+``RateLimitTracker``, library mirror, watches and jobs, all stored under a
+directory named after a digest of the token; the token itself is never
+written to disk. All tenants share one HTTP connection pool, the identifier
+crosswalk and the public response cache.
+
+In single-tenant mode the only tenant is ``ADS_API_TOKEN`` and its state
+lives directly in ``ADS_CACHE_DIR``, as before. With ``ADS_MULTI_TENANT``,
+``TenantMiddleware`` reads the token from the ``ADS_TOKEN_HEADER`` request
+header and ``TenantState`` resolves the per-tenant lifespan keys for it.
+A token is checked with ADS before its first tool call runs or its first
+request is sent (see ``ADSClient.verify``); until then it is served no
+cached responses, writes nothing to disk and has no jobs resumed, and a
+token ADS rejects is forgotten.
+
+Only ``ADS_MAX_TENANTS`` tenants are kept in memory. Beyond that the least
+recently used tenant without running jobs is unloaded; its state is on disk
+and reloaded if its token comes back.
+
+Given a ``StateFile`` (multi-worker mode), rate limits and the public cache
+live in it instead of in process memory, library mirrors, watches and jobs
+are kept consistent across workers through it (see ``mcp_server_ads.shared``),
+and only the leader worker resumes background jobs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from mcp_server_ads.cache import ResponseCache
+from mcp_server_ads.client import ADSClient, RateLimitTracker, http_pool
+from mcp_server_ads.config import (
+    ADS_MAX_TENANTS,
+    ADS_MULTI_TENANT,
+    ADS_PUBLIC_CACHE_TTL,
+    ADS_REPLAY,
+    ADS_TOKEN_HEADER,
+)
+from mcp_server_ads.crosswalk import CrosswalkIndex
+from mcp_server_ads.errors import ADSAuthError
+from mcp_server_ads.jobs import JobManager
+from mcp_server_ads.mirror import LibraryMirror
+from mcp_server_ads.shared import SharedRateLimitTracker, SharedResponseCache, StateFile
+from mcp_server_ads.stats import STATS
+from mcp_server_ads.watch import WatchStore
+
+TENANT_KEYS = ("ads_client", "library_mirror", "watches", "jobs")
+"""Lifespan context keys that hold per-tenant state."""
+
+_request_token: ContextVar[str | None] = ContextVar("request_token", default=None)
+
+
+def tenant_id(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+@dataclass
+class Tenant:
+    id: str
+    ads_client: ADSClient
+    library_mirror: LibraryMirror
+    watches: WatchStore
+    jobs: JobManager
+    started: bool = False
+
+
+class Tenants:
+    """Creates a tenant, resuming its unfinished jobs, the first time its token is seen."""
+
+    def __init__(
+        self,
+        directory: Path,
+        crosswalk: CrosswalkIndex,
+        default_token: str | None = None,
+        multi_tenant: bool = ADS_MULTI_TENANT,
+        public_cache_ttl: float = ADS_PUBLIC_CACHE_TTL,
+        http: httpx.AsyncClient | None = None,
+        shared: StateFile | None = None,
+        max_tenants: int = ADS_MAX_TENANTS,
+    ):
+        self._dir = directory
+        self._crosswalk = crosswalk
+        self._http = http
+        self.multi_tenant = multi_tenant
+        self.default_token = default_token or os.environ.get("ADS_API_TOKEN") or None
+        self._shared = shared
+        self.max_tenants = max_tenants
+        self.public_cache: ResponseCache | None = None
+        if public_cache_ttl > 0:
+            self.public_cache = (
+                ResponseCache(public_cache_ttl)
+                if shared is None
+                else SharedResponseCache(shared, public_cache_ttl)
+            )
+        self._tenants: OrderedDict[str, Tenant] = OrderedDict()
+        self._single: Tenant | None = None
+        if not multi_tenant:
+            # Fail at startup rather than on the first call, as a single server always has.
+            if self.default_token is None and not ADS_REPLAY:
+                raise ADSAuthError("ADS_API_TOKEN environment variable is not set.")
+            self._single = self.get(self.default_token or "")
+
+    def _pool(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = http_pool()
+        return self._http
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def get(self, token: str) -> Tenant:
+        key = tenant_id(token)
+        tenant = self._tenants.get(key)
+        if tenant is not None:
+            self._tenants.move_to_end(key)
+            return tenant
+        directory = self._dir / "tenants" / key if self.multi_tenant else self._dir
+        client = ADSClient(
+            self._pool,
+            headers={"Authorization": f"Bearer {token}"},
+            public_cache=self.public_cache,
+            verified=not self.multi_tenant,
+            rate_limits=(
+                RateLimitTracker(path=directory / "rate_limits.json", tenant=key)
+                if self._shared is None
+                else SharedRateLimitTracker(self._shared, key)
+            ),
+        )
+        client.add_doc_listener(self._crosswalk.observe)
+        tenant = Tenant(
+            id=key,
+            ads_client=client,
+            library_mirror=LibraryMirror(client, directory / "libraries"),
+            watches=WatchStore(client, directory / "watches.json", self._shared),
+            jobs=JobManager(client, directory / "jobs", self._shared),
+        )
+        if not self.multi_tenant:
+            # A tenant's hit counts are its own business, not the shared /metrics'.
+            STATS.register_cache("library_mirror", tenant.library_mirror)
+        self._tenants[key] = tenant
+        if self.multi_tenant:
+            self._evict()
+        else:
+            self._start(tenant)
+        return tenant
+
+    async def verify(self) -> Tenant:
+        """The current tenant, once ADS has accepted its token.
+
+        Raises ``ToolError`` for a token ADS rejects, which is then forgotten.
+        """
+        tenant = self.current()
+        try:
+            await tenant.ads_client.verify()
+        except ADSAuthError as exc:
+            if self._tenants.get(tenant.id) is tenant:
+                self._unload(tenant)
+            raise ToolError(str(exc)) from exc
+        self._start(tenant)
+        return tenant
+
+    def _start(self, tenant: Tenant) -> None:
+        """Resume the tenant's unfinished jobs, on one worker only."""
+        if not tenant.started and (self._shared is None or self._shared.lead()):
+            tenant.jobs.start()
+        tenant.started = True
+
+    def _unload(self, tenant: Tenant) -> None:
+        del self._tenants[tenant.id]
+        if tenant.ads_client.verified:
+            tenant.ads_client.rate_limits.save()
+
+    def _evict(self) -> None:
+        """Unload least recently used tenants beyond ``max_tenants``, skipping busy ones."""
+        for tenant in list(self._tenants.values()):
+            if len(self._tenants) <= self.max_tenants:
+                return
+            if tenant.jobs.running:
+                continue
+            self._unload(tenant)
+
+    def current(self) -> Tenant:
+        """The tenant for the token of the request being handled.
+
+        In multi-tenant mode a request must send its own token; ``ADS_API_TOKEN``
+        is the operator's and is never lent to anonymous callers.
+        """
+        if self._single is not None:
+            return self._single
+        token = _request_token.get()
+        if token is None:
+            raise ToolError(f"No ADS token: send it in the {ADS_TOKEN_HEADER} header.")
+        return self.get(token)
+
+    async def close(self) -> None:
+        for tenant in self._tenants.values():
+            await tenant.jobs.close()
+            if tenant.ads_client.verified:
+                tenant.ads_client.rate_limits.save()
+        if self._http is not None:
+            await self._http.aclose()
+
+
+class TenantState(Mapping[str, Any]):
+    """Lifespan context whose per-tenant keys resolve to the current tenant."""
+
+    def __init__(self, tenants: Tenants, shared: dict[str, Any]):
+        self.tenants = tenants
+        self._shared = shared
+
+    def __getitem__(self, key: str) -> Any:
+        if key in TENANT_KEYS:
+            return getattr(self.tenants.current(), key)
+        return self._shared[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from TENANT_KEYS
+        yield from self._shared
+
+    def __len__(self) -> int:
+        return len(TENANT_KEYS) + len(self._shared)
+
+
+class TenantMiddleware(Middleware):
+    """Makes the ADS token sent with an HTTP request current while it is handled.
+
+    Tool calls of a multi-tenant server run only once ADS accepted the token.
+    """
+
+    def __init__(self, header: str = ADS_TOKEN_HEADER):
+        self.header = header.lower()
+
+    async def on_request(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        token = get_http_headers(include={self.header}).get(self.header)
+        reset = _request_token.set(token or None)
+        try:
+            return await call_next(context)
+        finally:
+            _request_token.reset(reset)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        ctx = context.fastmcp_context
+        state = None if ctx is None else ctx.lifespan_context
+        if isinstance(state, TenantState) and state.tenants.multi_tenant:
+            await state.tenants.verify()
+        return await call_next(context)
@@ -1,13 +1,10 @@
-"""ADS MCP tools."""
+"""ADS MCP tools.
 
-from mcp_server_ads.tools import (  # noqa: F401
-    citation_helper,
-    export,
-    libraries,
-    metrics,
-    network,
-    objects,
-    reference,
-    resolver,
-    search,
-)
+Tools are registered from ``manifest.json`` so the server starts without
+importing the tool modules; each module is imported on its first call.
+"""
+
+from mcp_server_ads.server import mcp
+from mcp_server_ads.tools.manifest import register
+
+register(mcp)
@@ -0,0 +1,5 @@
+"""Regenerate the tool manifest: ``python -m mcp_server_ads.tools``."""
+
+from mcp_server_ads.tools.manifest import main
+
+main()
@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import format_citation_helper
+from mcp_server_ads.models import OutputFormat, Suggestions, structured
 from mcp_server_ads.server import mcp
 
 
@@ -21,8 +23,9 @@ async def ads_citation_helper(
         list[str],
         Field(description="List of bibcodes already in the bibliography"),
     ],
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Suggest papers that should be cited alongside the given set.
 
     Given a set of bibcodes (e.g. from a paper's bibliography), the citation
@@ -34,4 +37,6 @@ async def ads_citation_helper(
         "/v1/citation_helper",
         json={"bibcodes": bibcodes},
     )
+    if output == "json":
+        return structured(Suggestions.from_response(data))
     return format_citation_helper(data)
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Annotated, Literal
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
+from mcp_server_ads.bibfile import BibEntry, BibFile, parse_entries
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import format_export
+from mcp_server_ads.jobs import EXPORT_CHUNK_SIZE
+from mcp_server_ads.models import Export, Message, OutputFormat, structured
 from mcp_server_ads.server import mcp
 
 EXPORT_FORMATS = Literal[
@@ -21,7 +26,7 @@ EXPORT_FORMATS = Literal[
 
 
 @mcp.tool(
-    annotations={"readOnlyHint": True, "destructiveHint": False},
+    annotations={"readOnlyHint": False, "destructiveHint": False},
     tags={"export", "core"},
 )
 async def ads_export(
@@ -44,16 +49,72 @@ async def ads_export(
         Literal["AASTeX macro", "Journal Abbreviation", "Journal Full Name"] | None,
         Field(description="Journal name format (only for some export formats)"),
     ] = None,
+    bib_path: Annotated[
+        str | None,
+        Field(
+            description="Path of a local .bib file to update instead of returning text. "
+            "Only bibcodes missing from the file are exported and appended; a file "
+            "that doesn't parse as BibTeX is left alone "
+            "(bibtex/bibtexabs only; not on multi-tenant servers)"
+        ),
+    ] = None,
+    refresh: Annotated[
+        bool,
+        Field(description="With bib_path: re-export all given bibcodes and replace "
+              "their existing entries"),
+    ] = False,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Export paper records in various citation formats.
 
     Supports 18+ formats including BibTeX, AASTeX, RIS, EndNote, CSL-JSON,
     Dublin Core XML, VOTable, and more. Returns formatted citation text.
+
+    With bib_path, maintains a local BibTeX file: existing entries are indexed
+    by bibcode and citekey, only missing records are fetched, and the file is
+    rewritten atomically.
     """
     client: ADSClient = ctx.lifespan_context["ads_client"]
     payload: dict = {"bibcode": bibcodes, "sort": [sort]}
     if journalformat:
         payload["journalformat"] = journalformat
+
+    if bib_path is not None:
+        if not ctx.lifespan_context["local_files"]:
+            return "bib_path is not available on a multi-tenant server."
+        if format not in ("bibtex", "bibtexabs"):
+            return "bib_path requires format 'bibtex' or 'bibtexabs'."
+        path = Path(bib_path).expanduser()
+        if path.suffix.lower() != ".bib":
+            return "bib_path must name a .bib file."
+        try:
+            bib = BibFile.load(path)
+        except ValueError as e:
+            return f"Not rewriting `{path}`: it doesn't parse as BibTeX ({e})."
+        wanted = list(dict.fromkeys(bibcodes))
+        missing = wanted if refresh else [b for b in wanted if b not in bib]
+        added = replaced = 0
+        if missing:
+            entries: list[BibEntry] = []
+            for start in range(0, len(missing), EXPORT_CHUNK_SIZE):
+                payload["bibcode"] = missing[start : start + EXPORT_CHUNK_SIZE]
+                data = await client.post(f"/v1/export/{format}", json=payload)
+                entries.extend(
+                    segment for segment in parse_entries(format_export(data))
+                    if isinstance(segment, BibEntry)
+                )
+            added, replaced = bib.merge(entries)
+            bib.write(path)
+        message = (
+            f"Updated `{path}`: {added} added, {replaced} replaced, "
+            f"{len(wanted) - len(missing)} already present ({len(bib)} entries)."
+        )
+        if output == "json":
+            return structured(Message(message=message, count=added + replaced))
+        return message
+
     data = await client.post(f"/v1/export/{format}", json=payload)
+    if output == "json":
+        return structured(Export(format=format, text=format_export(data)))
     return format_export(data)
@@ -0,0 +1,100 @@
+"""Identifier crosswalk tool: ads_identifiers."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Annotated
+
+from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
+from pydantic import Field
+
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.crosswalk import CrosswalkIndex, classify, query_term
+from mcp_server_ads.errors import ADSDeadlineError
+from mcp_server_ads.formatting import format_identifier_matches
+from mcp_server_ads.models import IdentifierMatch, IdentifierMatches, OutputFormat, structured
+from mcp_server_ads.server import mcp
+
+QUERY_CHUNK_SIZE = 50
+"""Identifiers OR-ed together per search request."""
+
+MAX_CONCURRENT_QUERIES = 4
+
+
+@mcp.tool(
+    annotations={"readOnlyHint": True, "destructiveHint": False},
+    tags={"identifiers"},
+)
+async def ads_identifiers(
+    identifiers: Annotated[
+        list[str],
+        Field(
+            description="DOIs, arXiv IDs and/or bibcodes to map to canonical bibcodes "
+            "(e.g. ['10.1103/PhysRevLett.116.061102', 'arXiv:1602.03837'])"
+        ),
+    ],
+    output: OutputFormat = "markdown",
+    ctx: Context | None = None,
+) -> str | ToolResult:
+    """Map DOIs, arXiv IDs and alternate bibcodes to canonical ADS bibcodes.
+
+    Handles thousands of mixed identifiers at once. Identifiers already seen in
+    earlier ADS responses are answered from a local index; the rest are looked
+    up with chunked identifier: searches. If the deadline passes first, the
+    identifiers resolved so far are returned.
+    """
+    client: ADSClient = ctx.lifespan_context["ads_client"]
+    crosswalk: CrosswalkIndex = ctx.lifespan_context["crosswalk"]
+
+    classified = {ident: classify(ident) for ident in identifiers}
+    keys = {found[1]: found[0] for found in classified.values() if found is not None}
+    known = crosswalk.lookup(keys)
+    cached = len(known)
+
+    missing = [key for key in keys if key not in known]
+    skipped: set[str] = set()
+    if missing:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+        async def search(chunk: list[str]) -> None:
+            # Responses feed the crosswalk through the client's doc listener.
+            async with semaphore:
+                try:
+                    await client.get(
+                        "/v1/search/query",
+                        params={
+                            "q": " OR ".join(query_term(keys[key], key) for key in chunk),
+                            "fl": "bibcode,identifier,doi,alternate_bibcode",
+                            "rows": min(2 * len(chunk), 2000),
+                        },
+                    )
+                except ADSDeadlineError:
+                    skipped.update(chunk)
+
+        chunks = [
+            missing[i : i + QUERY_CHUNK_SIZE] for i in range(0, len(missing), QUERY_CHUNK_SIZE)
+        ]
+        await asyncio.gather(*map(search, chunks))
+        known.update(crosswalk.lookup(missing, record=False))
+
+    matches = [
+        IdentifierMatch(
+            identifier=ident,
+            type=found[0] if found else None,
+            bibcode=known.get(found[1]) if found else None,
+        )
+        for ident, found in classified.items()
+    ]
+    not_looked_up = sum(
+        1 for found in classified.values() if found is not None and found[1] in skipped
+    )
+    if output == "json":
+        return structured(
+            IdentifierMatches(matches=matches, from_index=cached, not_looked_up=not_looked_up)
+        )
+    return format_identifier_matches(
+        [(m.identifier, m.type, m.bibcode) for m in matches],
+        from_index=cached,
+        not_looked_up=not_looked_up,
+    )
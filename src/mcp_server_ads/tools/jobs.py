@@ -0,0 +1,181 @@
+"""Background job tool: ads_jobs."""
+
+from __future__ import annotations
+
+from typing import Annotated, Literal
+
+from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
+from pydantic import Field
+
+from mcp_server_ads.formatting import (
+    format_job,
+    format_jobs,
+    format_search_results,
+    tokens_to_chars,
+)
+from mcp_server_ads.jobs import Job, JobManager
+from mcp_server_ads.models import (
+    Export,
+    JobInfo,
+    Jobs,
+    Message,
+    OutputFormat,
+    SearchResults,
+    structured,
+)
+from mcp_server_ads.server import mcp
+from mcp_server_ads.tools.export import EXPORT_FORMATS
+from mcp_server_ads.tools.search import DEFAULT_FIELDS
+
+
+def _info(job: Job, manager: JobManager, local_files: bool) -> JobInfo:
+    return JobInfo(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        done=job.cursor,
+        total=job.total,
+        error=job.error,
+        result_path=str(manager.result_path(job.id)) if local_files else None,
+    )
+
+
+def _reply(text: str, output: str) -> str | ToolResult:
+    if output == "json":
+        return structured(Message(message=text))
+    return text
+
+
+@mcp.tool(
+    annotations={"readOnlyHint": False, "destructiveHint": False},
+    tags={"jobs"},
+)
+async def ads_jobs(
+    action: Annotated[
+        Literal["submit", "status", "result", "cancel"],
+        Field(description="Action to perform"),
+    ],
+    kind: Annotated[
+        Literal["search", "export"] | None,
+        Field(
+            description="Job kind for submit: 'search' harvests every result of a query, "
+            "'export' exports a large bibcode list"
+        ),
+    ] = None,
+    query: Annotated[
+        str | None,
+        Field(
+            description="ADS query for search jobs, e.g. "
+            "'citations(docs(library/<id>))' for all citations of a library"
+        ),
+    ] = None,
+    fields: Annotated[
+        str,
+        Field(description="Comma-separated fields for search jobs"),
+    ] = DEFAULT_FIELDS,
+    sort: Annotated[
+        str,
+        Field(description="Sort order. Default: 'date desc'"),
+    ] = "date desc",
+    bibcodes: Annotated[
+        list[str] | None,
+        Field(description="Bibcodes for export jobs"),
+    ] = None,
+    format: Annotated[
+        EXPORT_FORMATS,
+        Field(description="Export format for export jobs. Default: 'bibtex'"),
+    ] = "bibtex",
+    job_id: Annotated[
+        str | None,
+        Field(description="Job ID (required for result/cancel; optional for status)"),
+    ] = None,
+    start: Annotated[
+        int,
+        Field(description="First record to return for search job results. Default: 0", ge=0),
+    ] = 0,
+    rows: Annotated[
+        int,
+        Field(
+            description="Records to return for search job results. Default: 50",
+            ge=1,
+            le=2000,
+        ),
+    ] = 50,
+    max_tokens: Annotated[
+        int,
+        Field(description="Approximate output budget in tokens for result. Default: 20000",
+              ge=100),
+    ] = 20000,
+    output: OutputFormat = "markdown",
+    ctx: Context | None = None,
+) -> str | ToolResult:
+    """Run long harvests and exports in the background.
+
+    Jobs run on the server's shared ADS client, wait out rate limits, and
+    checkpoint after every page, so they resume after a server restart.
+
+    Actions:
+    - submit: Start a job (requires kind, plus query for search or bibcodes
+      for export). Returns the job ID immediately.
+    - status: Show progress of one job, or of all jobs without job_id
+    - result: Read results collected so far (requires job_id). On a
+      single-user server the complete result file path is included for
+      large outputs.
+    - cancel: Stop a job (requires job_id)
+    """
+    manager: JobManager = ctx.lifespan_context["jobs"]
+    local_files: bool = ctx.lifespan_context["local_files"]
+
+    if action == "submit":
+        if kind is None:
+            return _reply("submit requires kind 'search' or 'export'.", output)
+        if kind == "export" and not bibcodes:
+            return _reply("Export jobs require bibcodes.", output)
+        if kind == "search" and not query:
+            return _reply("Search jobs require a query.", output)
+        if kind == "export":
+            job = await manager.submit(
+                "export", {"bibcodes": bibcodes, "format": format, "sort": sort}
+            )
+        else:
+            job = await manager.submit("search", {"query": query, "fields": fields, "sort": sort})
+        return _reply(f"Job `{job.id}` submitted ({job.kind}).", output)
+
+    if action == "status" and job_id is None:
+        if output == "json":
+            return structured(Jobs(jobs=[_info(j, manager, local_files) for j in manager.all()]))
+        return format_jobs(manager.all())
+
+    job = manager.get(job_id)
+    if job is None:
+        return _reply(f"No job with ID '{job_id}'.", output)
+
+    if action == "status":
+        if output == "json":
+            return structured(_info(job, manager, local_files))
+        return format_job(job)
+
+    if action == "cancel":
+        if await manager.cancel(job_id):
+            return _reply(f"Job `{job_id}` cancelled.", output)
+        return _reply(f"Job `{job_id}` already {job.status}.", output)
+
+    max_chars = tokens_to_chars(max_tokens)
+    header = format_job(job)
+    if local_files:
+        header += f"\n  Results: `{manager.result_path(job.id)}`"
+    if job.kind == "search":
+        data = {"response": {
+            "numFound": job.cursor,
+            "start": start,
+            "docs": manager.read_docs(job.id, start=start, rows=rows),
+        }}
+        if output == "json":
+            return structured(SearchResults.from_response(data))
+        return f"{header}\n\n{format_search_results(data, max_chars=max_chars)}"
+
+    text = manager.read_text(job.id, max_chars=max_chars)
+    if output == "json":
+        return structured(Export(format=job.params["format"], text=text))
+    return f"{header}\n\n{text}"
@@ -2,18 +2,89 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Annotated, Literal
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
+from mcp_server_ads import deadlines
+from mcp_server_ads.bibcodes import split_valid
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import (
     format_libraries,
     format_library_detail,
     format_library_notes,
+    format_set_preview,
+    tokens_to_chars,
+)
+from mcp_server_ads.mirror import LibraryMirror
+from mcp_server_ads.models import (
+    Libraries,
+    Library,
+    LibraryDetail,
+    Message,
+    Note,
+    Notes,
+    OutputFormat,
+    SetOperationPreview,
+    structured,
 )
 from mcp_server_ads.server import mcp
+from mcp_server_ads.setops import preview_operation
+
+WRITE_CHUNK_SIZE = 500
+"""Bibcodes sent per add/remove request."""
+
+MAX_CONCURRENT_WRITES = 3
+
+
+def _reply(text: str, output: str, count: int | None = None) -> str | ToolResult:
+    if output == "json":
+        return structured(Message(message=text, count=count))
+    return text
+
+
+async def _bulk_update(
+    client: ADSClient,
+    library_id: str,
+    action: Literal["add", "remove"],
+    bibcodes: list[str],
+    ctx: Context,
+) -> tuple[int, list[str]]:
+    """Send add/remove requests in chunks with bounded concurrency.
+
+    Chunks already sent are allowed to finish past the call's deadline, so
+    no write is cut off halfway; chunks not started by then are skipped.
+    Returns the aggregated number of documents added or removed and the
+    bibcodes left unsent.
+    """
+    chunks = [
+        bibcodes[i : i + WRITE_CHUNK_SIZE] for i in range(0, len(bibcodes), WRITE_CHUNK_SIZE)
+    ]
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
+    done = 0
+    unsent: list[str] = []
+
+    async def write(chunk: list[str]) -> int:
+        nonlocal done
+        async with semaphore:
+            left = deadlines.remaining()
+            if left is not None and left <= 0:
+                unsent.extend(chunk)
+                return 0
+            with deadlines.unbounded():
+                data = await client.post(
+                    f"/v1/biblib/documents/{library_id}",
+                    json={"bibcode": chunk, "action": action},
+                )
+        done += len(chunk)
+        await ctx.report_progress(done, len(bibcodes))
+        return data.get("number_added" if action == "add" else "number_removed", 0)
+
+    count = sum(await asyncio.gather(*map(write, chunks)))
+    return count, unsent
 
 
 @mcp.tool(
@@ -22,12 +93,15 @@ from mcp_server_ads.server import mcp
 )
 async def ads_library(
     action: Annotated[
-        Literal["list", "get", "create", "edit", "delete"],
+        Literal["list", "get", "sync", "create", "edit", "delete"],
         Field(description="Action to perform on a library"),
     ],
     library_id: Annotated[
         str | None,
-        Field(description="Library ID (required for get/edit/delete)"),
+        Field(
+            description="Library ID (required for get/edit/delete; "
+            "optional for sync to refresh a single library)"
+        ),
     ] = None,
     name: Annotated[
         str | None,
@@ -53,32 +127,65 @@ async def ads_library(
         int,
         Field(description="Starting index for pagination. Default: 0", ge=0),
     ] = 0,
+    max_tokens: Annotated[
+        int | None,
+        Field(
+            description="Approximate output budget in tokens. For get, the bibcode "
+            "list is cut to fit. Default: no limit",
+            ge=100,
+        ),
+    ] = None,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Manage ADS libraries (saved paper collections).
 
     Actions:
     - list: List all your libraries
-    - get: Get a library's details and bibcodes (requires library_id)
+    - get: Get a library's details and bibcodes (requires library_id).
+      Served from the local mirror once the library listing shows it unchanged.
+    - sync: Refresh the local mirror, refetching only libraries that changed
     - create: Create a new library (requires name)
     - edit: Edit library metadata (requires library_id)
     - delete: Permanently delete a library (requires library_id)
     """
     client: ADSClient = ctx.lifespan_context["ads_client"]
+    mirror: LibraryMirror = ctx.lifespan_context["library_mirror"]
 
     if action == "list":
         data = await client.get(
             "/v1/biblib/libraries",
             params={"rows": rows, "start": start},
         )
+        if output == "json":
+            return structured(Libraries(libraries=[
+                Library.model_validate(lib) for lib in data.get("libraries", [])
+            ]))
         return format_libraries(data.get("libraries", []))
 
     if action == "get":
-        data = await client.get(
-            f"/v1/biblib/libraries/{library_id}",
-            params={"rows": rows, "start": start},
+        [lib] = await mirror.current(library_id)
+        if output == "json":
+            detail = lib.detail(rows=rows, start=start)
+            return structured(LibraryDetail(
+                metadata=Library.model_validate(detail["metadata"]),
+                documents=detail["documents"],
+            ))
+        return format_library_detail(
+            lib.detail(rows=rows, start=start), max_chars=tokens_to_chars(max_tokens)
         )
-        return format_library_detail(data)
+
+    if action == "sync":
+        report = await mirror.sync([library_id] if library_id else None)
+        result = (
+            f"Library mirror synced: {len(report.fetched)} fetched, "
+            f"{len(report.unchanged)} unchanged, {len(report.removed)} removed."
+        )
+        if report.failed:
+            result += " Failed: " + "; ".join(
+                f"`{lib_id}` ({error})" for lib_id, error in report.failed.items()
+            )
+        return _reply(result, output, count=len(report.fetched))
 
     if action == "create":
         payload: dict = {"name": name, "description": description or ""}
@@ -88,7 +195,7 @@ async def ads_library(
             payload["public"] = public
         data = await client.post("/v1/biblib/libraries", json=payload)
         lib_id = data.get("id", "?")
-        return f"Library created: **{name}** (ID: `{lib_id}`)"
+        return _reply(f"Library created: **{name}** (ID: `{lib_id}`)", output)
 
     if action == "edit":
         payload = {}
@@ -101,13 +208,15 @@ async def ads_library(
         data = await client.put(
             f"/v1/biblib/documents/{library_id}", json=payload
         )
-        return f"Library `{library_id}` updated. {data.get('msg', '')}"
+        await mirror.invalidate(library_id)
+        return _reply(f"Library `{library_id}` updated. {data.get('msg', '')}", output)
 
     if action == "delete":
         await client.delete(f"/v1/biblib/documents/{library_id}")
-        return f"Library `{library_id}` deleted."
+        await mirror.invalidate(library_id)
+        return _reply(f"Library `{library_id}` deleted.", output)
 
-    return f"Unknown action: {action}"
+    return _reply(f"Unknown action: {action}", output)
 
 
 @mcp.tool(
@@ -130,7 +239,10 @@ async def ads_library_documents(
     ],
     bibcodes: Annotated[
         list[str] | None,
-        Field(description="Bibcodes to add/remove"),
+        Field(
+            description="Bibcodes to add/remove. Large lists are sent in chunks; "
+            "adds skip bibcodes already in the library"
+        ),
     ] = None,
     libraries: Annotated[
         list[str] | None,
@@ -144,31 +256,81 @@ async def ads_library_documents(
         str | None,
         Field(description="Note content (for add_note/edit_note)"),
     ] = None,
+    preview: Annotated[
+        bool,
+        Field(
+            description="For union/intersection/difference: compute the result locally "
+            "and report counts and samples without modifying the library"
+        ),
+    ] = False,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Manage documents and notes within an ADS library.
 
     Document actions:
     - add/remove: Add or remove bibcodes from the library
-    - union/intersection/difference/copy/empty: Set operations with other libraries
+    - union/intersection/difference/copy/empty: Set operations with other libraries.
+      Set preview=True to see the outcome of union/intersection/difference
+      without changing anything.
 
     Note actions:
     - get_notes: List all notes in the library
     - add_note/edit_note/delete_note: Manage notes on individual papers
     """
     client: ADSClient = ctx.lifespan_context["ads_client"]
+    mirror: LibraryMirror = ctx.lifespan_context["library_mirror"]
 
-    # Add/remove documents
+    # Add/remove documents. Adds skip bibcodes the library already holds;
+    # removes send every bibcode, since ADS also matches alternate bibcodes.
     if action in ("add", "remove"):
-        data = await client.post(
-            f"/v1/biblib/documents/{library_id}",
-            json={"bibcode": bibcodes or [], "action": action},
-        )
-        count = data.get("number_added", data.get("number_removed", 0))
-        return (
-            f"{action.capitalize()}d {count} document(s) "
-            f"in library `{library_id}`."
+        valid, invalid = split_valid(bibcodes or [])
+        requested = list(dict.fromkeys(valid))
+        pending = requested
+        if action == "add":
+            [lib] = await mirror.current(library_id)
+            present = set(lib.documents)
+            pending = [b for b in requested if b not in present]
+        count, unsent = 0, []
+        if pending:
+            try:
+                count, unsent = await _bulk_update(client, library_id, action, pending, ctx)
+            finally:
+                await mirror.invalidate(library_id)
+        if action == "add":
+            verb, skipped, state = "Added", len(requested) - len(pending), "present"
+        else:
+            verb, skipped, state = "Removed", len(requested) - len(unsent) - count, "absent"
+        result = f"{verb} {count} document(s) in library `{library_id}`."
+        if skipped:
+            result += f" Skipped {skipped} already {state}."
+        if unsent:
+            result += (
+                f" Deadline reached before {len(unsent)} bibcode(s) were sent "
+                f"(first: {', '.join(unsent[:5])}); repeat the call to send them."
+            )
+        if invalid:
+            result += f" Ignored {len(invalid)} invalid bibcode(s): {', '.join(invalid[:5])}"
+        return _reply(result, output, count=count)
+
+    # Set operation previews, computed over mirrored bibcode sets
+    if preview and action in ("union", "intersection", "difference"):
+        ids = [library_id, *(libraries or [])]
+        libs = await mirror.current(*ids)
+        result = preview_operation(
+            action, libs[0].documents, [lib.documents for lib in libs[1:]]
         )
+        if output == "json":
+            return structured(SetOperationPreview(
+                action=action,
+                primary_size=result.primary_size,
+                result_size=len(result.result),
+                added=len(result.added),
+                removed=len(result.removed),
+                added_sample=result.added[:10],
+                removed_sample=result.removed[:10],
+            ))
+        return format_set_preview(result)
 
     # Set operations
     if action in ("union", "intersection", "difference", "copy", "empty"):
@@ -176,36 +338,43 @@ async def ads_library_documents(
             f"/v1/biblib/libraries/operations/{library_id}",
             json={"libraries": libraries or [], "action": action},
         )
+        await mirror.invalidate(library_id)
         lib_name = data.get("name", library_id)
-        return (
+        return _reply(
             f"Operation '{action}' completed on library "
-            f"**{lib_name}**. {data.get('description', '')}"
+            f"**{lib_name}**. {data.get('description', '')}",
+            output,
         )
 
     # Note operations
     if action == "get_notes":
-        data = await client.get(f"/v1/biblib/notes/{library_id}")
-        return format_library_notes(data)
+        [lib] = await mirror.current(library_id)
+        if output == "json":
+            return structured(Notes(notes=[Note.model_validate(n) for n in lib.notes]))
+        return format_library_notes(lib.notes)
 
     if action == "add_note":
         await client.post(
             f"/v1/biblib/notes/{library_id}",
             json={"bibcode": bibcode, "content": content},
         )
-        return f"Note added for `{bibcode}` in library `{library_id}`."
+        await mirror.invalidate(library_id)
+        return _reply(f"Note added for `{bibcode}` in library `{library_id}`.", output)
 
     if action == "edit_note":
         await client.put(
             f"/v1/biblib/notes/{library_id}",
             json={"bibcode": bibcode, "content": content},
         )
-        return f"Note updated for `{bibcode}` in library `{library_id}`."
+        await mirror.invalidate(library_id)
+        return _reply(f"Note updated for `{bibcode}` in library `{library_id}`.", output)
 
     if action == "delete_note":
         await client.delete(
             f"/v1/biblib/notes/{library_id}",
             params={"bibcode": bibcode},
         )
-        return f"Note deleted for `{bibcode}` in library `{library_id}`."
+        await mirror.invalidate(library_id)
+        return _reply(f"Note deleted for `{bibcode}` in library `{library_id}`.", output)
 
-    return f"Unknown action: {action}"
+    return _reply(f"Unknown action: {action}", output)
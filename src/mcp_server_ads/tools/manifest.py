@@ -0,0 +1,96 @@
+"""Tool manifest: register tools without importing their modules.
+
+``manifest.json`` holds each tool's MCP definition (schema, description,
+annotations, tags) and the module implementing it. ``register`` adds a
+``LazyTool`` stub per entry; the first call imports the module, whose
+``@mcp.tool`` registrations replace the stubs, and delegates to the real
+tool. Regenerate after changing a tool's signature or docstring::
+
+    python -m mcp_server_ads.tools
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import pkgutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fastmcp.exceptions import ToolError
+from fastmcp.tools import Tool
+from fastmcp.tools.tool import ToolResult
+from mcp.types import ToolAnnotations
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+MANIFEST_PATH = Path(__file__).with_name("manifest.json")
+
+
+class LazyTool(Tool):
+    """A tool declared from the manifest whose module is imported on first call."""
+
+    module: str
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        from mcp_server_ads.server import mcp
+
+        importlib.import_module(self.module)
+        tool = await mcp.get_tool(self.name)
+        if tool is None or isinstance(tool, LazyTool):
+            raise ToolError(f"{self.module} did not register tool {self.name!r}")
+        return await tool.run(arguments)
+
+
+def tool_modules() -> list[str]:
+    package = importlib.import_module("mcp_server_ads.tools")
+    return [
+        f"{package.__name__}.{info.name}"
+        for info in pkgutil.iter_modules(package.__path__)
+        if info.name != "manifest" and not info.name.startswith("_")
+    ]
+
+
+def definition(tool: Tool) -> dict[str, Any]:
+    """The manifest entry for a registered tool."""
+    mcp_tool = tool.to_mcp_tool().model_dump(mode="json", exclude_none=True)
+    return {
+        "name": tool.name,
+        "module": tool.fn.__module__,  # type: ignore[attr-defined]
+        "description": tool.description,
+        "parameters": mcp_tool["inputSchema"],
+        "output_schema": mcp_tool.get("outputSchema"),
+        "annotations": mcp_tool.get("annotations"),
+        "tags": sorted(tool.tags),
+    }
+
+
+async def build(mcp: FastMCP) -> list[dict[str, Any]]:
+    """Import every tool module and describe the tools they register."""
+    for module in tool_modules():
+        importlib.import_module(module)
+    tools = await mcp.list_tools(run_middleware=False)
+    return sorted((definition(t) for t in tools), key=lambda d: (d["module"], d["name"]))
+
+
+def register(mcp: FastMCP, path: Path = MANIFEST_PATH) -> None:
+    for entry in json.loads(path.read_text()):
+        annotations = entry["annotations"]
+        mcp.add_tool(LazyTool(
+            name=entry["name"],
+            module=entry["module"],
+            description=entry["description"],
+            parameters=entry["parameters"],
+            output_schema=entry["output_schema"],
+            annotations=ToolAnnotations(**annotations) if annotations else None,
+            tags=set(entry["tags"]),
+        ))
+
+
+def main() -> None:
+    from mcp_server_ads.server import mcp
+
+    MANIFEST_PATH.write_text(json.dumps(asyncio.run(build(mcp)), indent=2) + "\n")
+    print(f"Wrote {MANIFEST_PATH}")
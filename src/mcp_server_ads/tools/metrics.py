@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import format_metrics
+from mcp_server_ads.models import Metrics, OutputFormat, structured
 from mcp_server_ads.server import mcp
 
 
@@ -28,8 +30,9 @@ async def ads_metrics(
             "'indicators', 'histograms'. Default: all."
         ),
     ] = ["basic", "citations", "indicators", "histograms"],
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Compute citation metrics for a set of papers.
 
     Returns h-index, g-index, i10-index, citation counts, read counts,
@@ -40,4 +43,6 @@ async def ads_metrics(
         "/v1/metrics",
         json={"bibcodes": bibcodes, "types": types},
     )
+    if output == "json":
+        return structured(Metrics.from_response(data))
     return format_metrics(data)
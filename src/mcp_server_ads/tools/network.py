@@ -5,10 +5,16 @@ from __future__ import annotations
 from typing import Annotated, Literal
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
-from mcp_server_ads.formatting import format_author_network, format_paper_network
+from mcp_server_ads.formatting import (
+    format_author_network,
+    format_paper_network,
+    tokens_to_chars,
+)
+from mcp_server_ads.models import Network, OutputFormat, structured
 from mcp_server_ads.server import mcp
 
 
@@ -28,8 +34,17 @@ async def ads_network(
             "'paper' for citation clusters"
         ),
     ] = "author",
+    max_tokens: Annotated[
+        int | None,
+        Field(
+            description="Approximate output budget in tokens. The group and summary lists "
+            "are cut to fit. Default: no limit",
+            ge=100,
+        ),
+    ] = None,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Generate a collaboration or citation network from a set of papers.
 
     - author: Groups authors who frequently co-author together
@@ -38,6 +53,9 @@ async def ads_network(
     client: ADSClient = ctx.lifespan_context["ads_client"]
     endpoint = f"/v1/vis/{type}-network"
     data = await client.post(endpoint, json={"bibcodes": bibcodes})
+    if output == "json":
+        return structured(Network.from_response(type, data))
+    max_chars = tokens_to_chars(max_tokens)
     if type == "author":
-        return format_author_network(data)
-    return format_paper_network(data)
+        return format_author_network(data, max_chars=max_chars)
+    return format_paper_network(data, max_chars=max_chars)
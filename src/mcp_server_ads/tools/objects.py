@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import format_object_results
+from mcp_server_ads.models import ObjectQuery, OutputFormat, structured
 from mcp_server_ads.server import mcp
 
 
@@ -21,8 +23,9 @@ async def ads_object_search(
         list[str],
         Field(description="List of astronomical object identifiers (e.g. ['M31', 'NGC 1234'])"),
     ],
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Translate astronomical object names to ADS search queries via SIMBAD/NED.
 
     Provide object identifiers (e.g. 'M31', 'Crab Nebula', 'NGC 1234') and get
@@ -33,4 +36,6 @@ async def ads_object_search(
         "/v1/objects",
         json={"identifiers": identifiers},
     )
+    if output == "json":
+        return structured(ObjectQuery(query=data.get("query")))
     return format_object_results(data)
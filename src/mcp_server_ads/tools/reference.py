@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import format_reference_resolve
+from mcp_server_ads.models import OutputFormat, ResolvedReferences, structured
 from mcp_server_ads.server import mcp
 
 
@@ -24,8 +26,9 @@ async def ads_resolve_reference(
             "(e.g. ['Einstein 1905 Annalen der Physik 17 891'])"
         ),
     ],
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Resolve free-text reference strings to ADS bibcodes.
 
     Accepts human-readable reference strings and attempts to match them to
@@ -36,4 +39,6 @@ async def ads_resolve_reference(
         "/v1/reference/text",
         json={"reference": references},
     )
+    if output == "json":
+        return structured(ResolvedReferences.from_text(text))
     return format_reference_resolve(text)
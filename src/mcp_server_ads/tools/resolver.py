@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
 from mcp_server_ads.formatting import format_resolver_links
+from mcp_server_ads.models import Links, OutputFormat, structured
 from mcp_server_ads.server import mcp
 
 
@@ -25,12 +27,15 @@ async def ads_resolve_links(
             "'reference', 'coreads'). If omitted, returns all available links."
         ),
     ] = None,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Resolve available links for a paper (full text, data, citations, etc.)."""
     client: ADSClient = ctx.lifespan_context["ads_client"]
     path = f"/v1/resolver/{bibcode}"
     if link_type:
         path += f"/{link_type}"
     data = await client.get(path)
+    if output == "json":
+        return structured(Links.from_response(data))
     return format_resolver_links(data)
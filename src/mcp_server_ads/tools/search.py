@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
 from pydantic import Field
 
 from mcp_server_ads.client import ADSClient
-from mcp_server_ads.formatting import format_search_results
+from mcp_server_ads.formatting import format_search_results, tokens_to_chars
+from mcp_server_ads.models import OutputFormat, SearchResults, structured
 from mcp_server_ads.server import mcp
 
 DEFAULT_FIELDS = "bibcode,title,author,year,pub,citation_count,identifier"
@@ -46,8 +48,17 @@ async def ads_search(
         int,
         Field(description="Starting index for pagination. Default: 0", ge=0),
     ] = 0,
+    max_tokens: Annotated[
+        int | None,
+        Field(
+            description="Approximate output budget in tokens. Per-record detail "
+            "(abstract length, authors, identifiers) is reduced to fit. Default: no limit",
+            ge=100,
+        ),
+    ] = None,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Search the NASA ADS database.
 
     Supports the full ADS query syntax including field-qualified searches,
@@ -79,7 +90,9 @@ async def ads_search(
             "start": start,
         },
     )
-    return format_search_results(data)
+    if output == "json":
+        return structured(SearchResults.from_response(data))
+    return format_search_results(data, max_chars=tokens_to_chars(max_tokens))
 
 
 @mcp.tool(
@@ -107,8 +120,17 @@ async def ads_bigquery(
         int,
         Field(description="Number of results (1-200). Default: 10", ge=1, le=200),
     ] = 10,
+    max_tokens: Annotated[
+        int | None,
+        Field(
+            description="Approximate output budget in tokens. Per-record detail "
+            "(abstract length, authors, identifiers) is reduced to fit. Default: no limit",
+            ge=100,
+        ),
+    ] = None,
+    output: OutputFormat = "markdown",
     ctx: Context | None = None,
-) -> str:
+) -> str | ToolResult:
     """Search within a specific set of bibcodes (big-query).
 
     Useful for filtering, sorting, or retrieving metadata for a known set of papers.
@@ -127,4 +149,6 @@ async def ads_bigquery(
         content=bibcode_block,
         headers={"Content-Type": "big-query/csv"},
     )
-    return format_search_results(data)
+    if output == "json":
+        return structured(SearchResults.from_response(data))
+    return format_search_results(data, max_chars=tokens_to_chars(max_tokens))
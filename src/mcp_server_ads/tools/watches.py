@@ -0,0 +1,119 @@
+"""Saved watch query tool: ads_watch."""
+
+from __future__ import annotations
+
+from typing import Annotated, Literal
+
+from fastmcp import Context
+from fastmcp.tools.tool import ToolResult
+from pydantic import Field
+
+from mcp_server_ads.formatting import format_watch_run, format_watches, tokens_to_chars
+from mcp_server_ads.models import (
+    Message,
+    OutputFormat,
+    Paper,
+    Watch,
+    Watches,
+    WatchResults,
+    structured,
+)
+from mcp_server_ads.server import mcp
+from mcp_server_ads.tools.search import DEFAULT_FIELDS
+from mcp_server_ads.watch import WatchQuery, WatchStore
+
+
+def _watch(watch: WatchQuery) -> Watch:
+    return Watch(name=watch.name, query=watch.query, since=watch.since)
+
+
+def _reply(text: str, output: str) -> str | ToolResult:
+    if output == "json":
+        return structured(Message(message=text))
+    return text
+
+
+@mcp.tool(
+    annotations={"readOnlyHint": False, "destructiveHint": False},
+    tags={"search", "watch"},
+)
+async def ads_watch(
+    action: Annotated[
+        Literal["list", "create", "run", "delete"],
+        Field(description="Action to perform on a saved watch query"),
+    ],
+    name: Annotated[
+        str | None,
+        Field(description="Watch name (required for create/run/delete)"),
+    ] = None,
+    query: Annotated[
+        str | None,
+        Field(
+            description="ADS search query to watch (required for create), e.g. "
+            "'author:\"Smith, J\"' or 'citations(bibcode:2016PhRvL.116f1102A)'"
+        ),
+    ] = None,
+    fields: Annotated[
+        str,
+        Field(description="Comma-separated fields to return for run"),
+    ] = DEFAULT_FIELDS,
+    rows: Annotated[
+        int,
+        Field(
+            description="Most results returned by one run; anything beyond is "
+            "returned by the next run. Default: 50",
+            ge=1,
+            le=2000,
+        ),
+    ] = 50,
+    max_tokens: Annotated[
+        int | None,
+        Field(
+            description="Approximate output budget in tokens for run. Default: no limit",
+            ge=100,
+        ),
+    ] = None,
+    output: OutputFormat = "markdown",
+    ctx: Context | None = None,
+) -> str | ToolResult:
+    """Monitor an ADS search and fetch only papers added since the last run.
+
+    Actions:
+    - list: List saved watch queries
+    - create: Save a watch query (requires name and query)
+    - run: Return results entered in ADS since the previous run (requires name).
+      The first run returns the most recent results and sets the starting point.
+    - delete: Remove a watch query (requires name)
+    """
+    store: WatchStore = ctx.lifespan_context["watches"]
+
+    if action == "list":
+        if output == "json":
+            return structured(Watches(watches=[_watch(w) for w in store.all()]))
+        return format_watches(store.all())
+
+    if not name or not name.strip():
+        return _reply(f"{action} requires a name.", output)
+
+    if action == "create":
+        if not query or not query.strip():
+            return _reply("create requires a query.", output)
+        await store.create(name, query)
+        return _reply(f"Watch **{name}** saved for `{query}`.", output)
+
+    if name not in store:
+        return _reply(f"No watch named '{name}'.", output)
+
+    if action == "delete":
+        await store.delete(name)
+        return _reply(f"Watch **{name}** deleted.", output)
+
+    run = await store.run(name, fields, rows)
+    if output == "json":
+        return structured(WatchResults(
+            watch=_watch(run.watch),
+            baseline=run.baseline,
+            remaining=run.remaining,
+            papers=[Paper.model_validate(doc) for doc in run.docs],
+        ))
+    return format_watch_run(run, max_chars=tokens_to_chars(max_tokens))
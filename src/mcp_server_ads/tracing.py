@@ -0,0 +1,73 @@
+"""Optional OpenTelemetry spans for ADS requests, decoding and formatting.
+
+Disabled unless ``ADS_TRACING`` is set. Tool invocations already get a span
+from FastMCP; the spans here nest beneath it. Only the OpenTelemetry API is
+used, so spans are exported wherever the configured tracer provider sends
+them; ``configure`` sets up OTLP export when the ``tracing`` extra is
+installed and nothing else configured a provider.
+"""
+
+from __future__ import annotations
+
+import functools
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, TypeVar
+
+from opentelemetry import trace
+
+from mcp_server_ads.config import ADS_TRACING
+
+ENABLED: bool = ADS_TRACING
+"""Checked when a span would start; decorated functions are resolved at import."""
+
+INSTRUMENTATION_NAME = "mcp_server_ads"
+
+_NOOP = nullcontext()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def span(name: str, **attributes: Any) -> ContextManager[trace.Span | None]:
+    """Start a child span of the current one, or do nothing when disabled."""
+    if not ENABLED:
+        return _NOOP
+    return trace.get_tracer(INSTRUMENTATION_NAME).start_as_current_span(
+        name, attributes=attributes
+    )
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Wrap a function in a span when tracing is enabled at decoration time.
+
+    With tracing disabled the function is returned unchanged, so the
+    decorator costs nothing at call time.
+    """
+
+    def decorate(func: F) -> F:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def configure() -> None:
+    """Export spans over OTLP if tracing is on and no tracer provider is set."""
+    if not ENABLED or not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        return
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        return
+    provider = TracerProvider(resource=Resource.create({"service.name": "mcp-server-ads"}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
@@ -0,0 +1,195 @@
+"""Saved watch queries that fetch only results entered since the last run."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.shared import StateFile
+from mcp_server_ads.storage import read_json, signature, write_json
+
+T = TypeVar("T")
+
+MAX_RUN_ROWS = 2000
+"""Most results fetched by one run; the rest are picked up by the next one."""
+
+MAX_EXCLUDED = 100
+"""Most ``seen`` bibcodes excluded in the query itself, keeping its URL short.
+
+Any others are fetched and dropped from the results instead.
+"""
+
+
+@dataclass
+class WatchQuery:
+    """A saved query and its ``entry_date`` high-water mark.
+
+    ``since`` is the latest ``entry_date`` reported so far and ``seen`` the
+    bibcodes reported with exactly that date, which the next run excludes so
+    the inclusive date range doesn't return them again.
+    """
+
+    name: str
+    query: str
+    since: str | None = None
+    seen: list[str] = field(default_factory=list)
+    last_run: float | None = None
+
+    def delta_query(self) -> str:
+        if self.since is None:
+            return self.query
+        q = f'({self.query}) entry_date:["{self.since}" TO *]'
+        if self.seen:
+            excluded = self.seen[:MAX_EXCLUDED]
+            q += " -bibcode:(" + " OR ".join(f'"{b}"' for b in excluded) + ")"
+        return q
+
+    def unexcluded(self) -> set[str]:
+        """``seen`` bibcodes left out of ``delta_query``, to drop from its results."""
+        return set(self.seen[MAX_EXCLUDED:])
+
+    def advance(self, docs: list[dict[str, Any]]) -> None:
+        """Move the mark past ``docs`` (sorted by ``entry_date``)."""
+        self.last_run = time.time()
+        dated = [doc for doc in docs if doc.get("entry_date")]
+        if not dated:
+            return
+        latest = max(doc["entry_date"] for doc in dated)
+        at_latest = [doc["bibcode"] for doc in dated if doc["entry_date"] == latest]
+        if latest == self.since:
+            self.seen = sorted(set(self.seen) | set(at_latest))
+        else:
+            self.since, self.seen = latest, at_latest
+
+
+@dataclass
+class WatchRun:
+    watch: WatchQuery
+    docs: list[dict[str, Any]]
+    remaining: int
+    baseline: bool
+
+
+class WatchStore:
+    """Named watch queries, persisted to ``path`` as JSON.
+
+    The first run of a watch returns the newest matches and sets the mark;
+    later runs add an ``entry_date`` range to the query and fetch only the
+    papers entered since, oldest first, so a run capped by ``rows`` never
+    skips anything.
+
+    With a ``shared`` state file (several workers), the file is reread
+    whenever another worker saved it, and a change that lost the race to
+    another worker's save is applied again on top of it.
+    """
+
+    def __init__(
+        self, client: ADSClient, path: Path | None = None, shared: StateFile | None = None
+    ):
+        self._client = client
+        self._path = path
+        self._shared = shared
+        self._watches: dict[str, WatchQuery] = {}
+        self._loaded: tuple[int, int] | int | None = None
+        self._load()
+
+    def __contains__(self, name: str) -> bool:
+        self._refresh()
+        return name in self._watches
+
+    def get(self, name: str) -> WatchQuery | None:
+        self._refresh()
+        return self._watches.get(name)
+
+    def all(self) -> list[WatchQuery]:
+        self._refresh()
+        return sorted(self._watches.values(), key=lambda w: w.name)
+
+    async def create(self, name: str, query: str) -> WatchQuery:
+        def add() -> WatchQuery:
+            self._watches[name] = watch = WatchQuery(name=name, query=query)
+            return watch
+
+        return await self._update(add)
+
+    async def delete(self, name: str) -> bool:
+        return await self._update(lambda: self._watches.pop(name, None) is not None)
+
+    async def run(self, name: str, fields: str, rows: int = 50) -> WatchRun:
+        """Fetch what is new for watch ``name`` and advance its mark."""
+        self._refresh()
+        watch = self._watches[name]
+        for required in ("bibcode", "entry_date"):
+            if required not in fields.split(","):
+                fields += "," + required
+        baseline = watch.since is None
+        rows = min(rows, MAX_RUN_ROWS)
+        hidden = watch.unexcluded()
+        data = await self._client.get(
+            "/v1/search/query",
+            params={
+                "q": watch.delta_query(),
+                "fl": fields,
+                "sort": "entry_date desc" if baseline else "entry_date asc",
+                "rows": min(rows + len(hidden), MAX_RUN_ROWS),
+            },
+        )
+        response = data.get("response", {})
+        docs = [doc for doc in response.get("docs", []) if doc.get("bibcode") not in hidden]
+        docs = docs[:rows]
+
+        def advance() -> WatchQuery:
+            # Another worker may have replaced or deleted the watch meanwhile.
+            current = self._watches.get(name)
+            if current is None:
+                return watch
+            current.advance(docs)
+            return current
+
+        watch = await self._update(advance)
+        found = response.get("numFound", 0) - len(hidden)
+        remaining = 0 if baseline else max(found - len(docs), 0)
+        return WatchRun(watch=watch, docs=docs, remaining=remaining, baseline=baseline)
+
+    def save(self) -> None:
+        if self._path is not None:
+            write_json(self._path, self._dump())
+            self._loaded = signature(self._path)
+
+    def _dump(self) -> dict[str, Any]:
+        return {name: asdict(w) for name, w in self._watches.items()}
+
+    def _load(self) -> None:
+        if self._path is None:
+            return
+        current = (
+            signature(self._path) if self._shared is None else self._shared.version(self._path)
+        )
+        if current is None or current == self._loaded:
+            return
+        self._watches = {
+            name: WatchQuery(**raw) for name, raw in (read_json(self._path, {}) or {}).items()
+        }
+        self._loaded = current
+
+    def _refresh(self) -> None:
+        if self._shared is not None:
+            self._load()
+
+    async def _update(self, change: Callable[[], T]) -> T:
+        """Apply ``change`` to the watches and save them, again if another worker saved first."""
+        while True:
+            self._refresh()
+            result = change()
+            if self._shared is None or self._path is None:
+                self.save()
+                return result
+            saved = await self._shared.save_json(self._path, self._dump(), self._loaded)
+            if saved is not None:
+                self._loaded = saved
+                return result
+            self._loaded = None  # reread the other worker's save
@@ -11,6 +11,10 @@ import pytest
 import respx
 
 from mcp_server_ads.client import ADSClient, RateLimitTracker
+from mcp_server_ads.crosswalk import CrosswalkIndex
+from mcp_server_ads.jobs import JobManager
+from mcp_server_ads.mirror import LibraryMirror
+from mcp_server_ads.watch import WatchStore
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -43,10 +47,42 @@ def ads_client(mock_httpx):
 
 
 @pytest.fixture
-def mock_ctx(ads_client):
-    """Fake FastMCP Context that provides ads_client via lifespan_context."""
+def library_mirror(ads_client, tmp_path):
+    return LibraryMirror(ads_client, tmp_path / "libraries")
+
+
+@pytest.fixture
+def crosswalk(ads_client, tmp_path):
+    index = CrosswalkIndex(tmp_path / "crosswalk.sqlite")
+    ads_client.add_doc_listener(index.observe)
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def watches(ads_client, tmp_path):
+    return WatchStore(ads_client, tmp_path / "watches.json")
+
+
+@pytest.fixture
+async def jobs(ads_client, tmp_path):
+    manager = JobManager(ads_client, tmp_path / "jobs")
+    yield manager
+    await manager.close()
+
+
+@pytest.fixture
+def mock_ctx(ads_client, library_mirror, crosswalk, watches, jobs):
+    """Fake FastMCP Context that provides lifespan state via lifespan_context."""
     ctx = MagicMock()
-    ctx.lifespan_context = {"ads_client": ads_client}
+    ctx.lifespan_context = {
+        "ads_client": ads_client,
+        "library_mirror": library_mirror,
+        "crosswalk": crosswalk,
+        "watches": watches,
+        "jobs": jobs,
+        "local_files": True,
+    }
     ctx.info = AsyncMock()
     ctx.warning = AsyncMock()
     ctx.error = AsyncMock()
@@ -0,0 +1,35 @@
+"""Tests for bibcode parsing and validation."""
+
+import pytest
+
+from mcp_server_ads.bibcodes import is_valid, normalize, parse, split_valid
+
+LIGO = "2016PhRvL.116f1102A"
+EINSTEIN = "1905AnP...322..891E"
+AA = "2016A&A...589A..12S"
+
+
+def test_parse():
+    parts = parse(LIGO)
+    assert parts.year == 2016
+    assert parts.journal == "PhRvL"
+    assert parts.volume == "116"
+    assert parts.qualifier == "f"
+    assert parts.page == "1102"
+    assert parts.initial == "A"
+    assert parse(EINSTEIN).qualifier == ""
+
+
+def test_validation():
+    assert is_valid(LIGO)
+    assert not is_valid("2016PhRvL.116f1102")
+    assert not is_valid("abcdPhRvL.116f1102A")
+    assert normalize(" 2016A%26A...589A..12S ") == AA
+    with pytest.raises(ValueError):
+        parse("nope")
+
+
+def test_split_valid():
+    valid, invalid = split_valid([LIGO, "dark matter", "2016A%26A...589A..12S"])
+    assert valid == [LIGO, AA]
+    assert invalid == ["dark matter"]
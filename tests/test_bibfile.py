@@ -0,0 +1,73 @@
+"""Tests for local BibTeX file maintenance."""
+
+import pytest
+
+from mcp_server_ads.bibfile import BibEntry, BibFile, parse_entries
+
+SOURCE = """\
+@string{apj = {The Astrophysical Journal}}
+
+@ARTICLE{2016PhRvL.116f1102A,
+       author = {{Abbott}, B.~P. and others},
+        title = "{Observation of Gravitational Waves}",
+       adsurl = {https://ui.adsabs.harvard.edu/abs/2016PhRvL.116f1102A},
+}
+
+% my own entry
+@misc{einstein1905,
+  title = {Zur {Elektrodynamik} bewegter K{\\"o}rper},
+  adsurl = {https://ui.adsabs.harvard.edu/abs/1905AnP...322..891E},
+}
+"""
+
+
+def _entry(key: str, body: str = "x") -> BibEntry:
+    return parse_entries(f"@ARTICLE{{{key},\n  note = {{{body}}}\n}}")[0]
+
+
+def test_parse_and_index():
+    bib = BibFile(parse_entries(SOURCE))
+    assert len(bib) == 2
+    assert "2016PhRvL.116f1102A" in bib
+    assert "1905AnP...322..891E" in bib
+    assert "einstein1905" in bib
+    assert bib.by_bibcode["1905AnP...322..891E"].key == "einstein1905"
+
+
+def test_roundtrip_is_verbatim(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text(SOURCE)
+    BibFile.load(path).write(path)
+    assert path.read_text() == SOURCE
+
+
+def test_merge_appends_and_replaces(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text(SOURCE)
+    bib = BibFile.load(path)
+    added, replaced = bib.merge([
+        _entry("2016PhRvL.116f1102A", "new"), _entry("2020ApJ...900..100A"),
+    ])
+    assert (added, replaced) == (1, 1)
+    bib.write(path)
+    text = path.read_text()
+    assert "Observation of Gravitational Waves" not in text
+    assert text.index("2016PhRvL") < text.index("einstein1905") < text.index("2020ApJ")
+    assert "% my own entry" in text
+    assert len(BibFile.load(path)) == 3
+
+
+def test_bibcode_keys_must_be_valid_bibcodes():
+    bib = BibFile(parse_entries("@misc{2020ApJ...900..100A,}\n@misc{2020abcdefghijklmn_,}\n"))
+    assert "2020ApJ...900..100A" in bib.by_bibcode
+    assert "2020abcdefghijklmn_" not in bib.by_bibcode
+
+
+@pytest.mark.parametrize("text", [
+    "@ARTICLE{key,\n  title = {Unclosed\n",
+    "import os\n\n@property\ndef f(): ...\n",
+])
+def test_text_that_is_not_bibtex_is_refused(text):
+    with pytest.raises(ValueError):
+        parse_entries(text)
+    assert parse_entries("% just a comment\n\n") == ["% just a comment\n\n"]
@@ -0,0 +1,110 @@
+"""Tests for circuit breakers and serving stale responses."""
+
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.tools.tool import ToolResult
+
+from mcp_server_ads.breaker import (
+    FAILURE_THRESHOLD,
+    CircuitBreaker,
+    StaleNoticeMiddleware,
+    family,
+    note_stale,
+)
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.errors import ADSServerError, ADSUnavailableError
+
+
+def test_family():
+    assert family("/v1/search/query?q=x") == "/v1/search"
+    assert family("/v1/biblib/documents/abc") == "/v1/biblib"
+
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker("/v1/search", threshold=3, cooldown=0.05)
+    for _ in range(3):
+        assert breaker.allow() is False
+        breaker.failed()
+    assert breaker.state == "open"
+    with pytest.raises(ADSUnavailableError) as info:
+        breaker.allow()
+    assert 0 < info.value.retry_in <= 0.05
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    with pytest.raises(ADSUnavailableError):
+        breaker.allow()  # one probe at a time
+    breaker.failed()
+    assert breaker.state == "open" and breaker.retry_in() > 0.05
+
+    time.sleep(0.11)
+    assert breaker.allow() is True
+    breaker.succeeded()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+    breaker.failed(retry_after=60)
+    breaker.failed()
+    breaker.failed()
+    assert breaker.retry_in() > 50
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_serves_stale_reads_and_fails_fast(ads_client, mock_httpx):
+    search = mock_httpx.get("/v1/search/query").mock(side_effect=[
+        httpx.Response(200, json={"response": {"numFound": 7, "docs": []}}),
+        *[httpx.Response(503, json={"error": "down"})] * FAILURE_THRESHOLD,
+    ])
+    libraries = mock_httpx.get("/v1/biblib/libraries").mock(return_value=httpx.Response(503))
+
+    params = {"q": "x"}
+    await ads_client.get("/v1/search/query", params=params, batch=False)
+    for i in range(FAILURE_THRESHOLD):
+        with pytest.raises(ADSServerError):
+            await ads_client.get("/v1/search/query", params={"q": i}, batch=False)
+    assert ads_client.breakers["/v1/search"].state == "open"
+
+    data = await ads_client.get("/v1/search/query", params=params, batch=False)
+    assert data["response"]["numFound"] == 7
+    with pytest.raises(ADSUnavailableError, match="retry in"):
+        await ads_client.get("/v1/search/query", params={"q": "never seen"}, batch=False)
+    assert search.call_count == 1 + FAILURE_THRESHOLD
+
+    with pytest.raises(ADSServerError):
+        await ads_client.get("/v1/biblib/libraries")
+    assert libraries.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_results_are_marked():
+    server = FastMCP("test")
+    server.add_middleware(StaleNoticeMiddleware())
+
+    @server.tool
+    def lookup(stale: bool) -> ToolResult:
+        if stale:
+            note_stale("ADS /v1/search is failing repeatedly; retry in 30s.", 600.0, 30.0)
+        return ToolResult("result", structured_content={"count": 1})
+
+    async with Client(server) as client:
+        fresh = await client.call_tool("lookup", {"stale": False})
+        stale = await client.call_tool("lookup", {"stale": True})
+    assert [c.text for c in fresh.content] == ["result"]
+    assert fresh.structured_content == {"count": 1}
+    assert stale.content[0].text.startswith("**Stale result:** ADS /v1/search")
+    assert stale.content[1].text == "result"
+    assert stale.structured_content == {"count": 1, "stale": {
+        "notice": "ADS /v1/search is failing repeatedly; retry in 30s.",
+        "age_seconds": 600.0,
+        "retry_in_seconds": 30.0,
+    }}
+
+
+def test_client_keeps_stale_store_without_public_cache():
+    client = ADSClient(httpx.AsyncClient())
+    assert client.public_cache is None and client._stale is not None
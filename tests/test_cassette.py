@@ -0,0 +1,128 @@
+"""Tests for cassette recording and replay."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+
+import httpx
+import pytest
+
+from mcp_server_ads.cassette import RecordingTransport, ReplayTransport, load_cassette
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.errors import ADSNotFoundError, ADSResponseTooLargeError
+from mcp_server_ads.fake import FakeConfig, Latency, create_app
+from mcp_server_ads.stats import Stats
+
+
+def _client(transport: httpx.AsyncBaseTransport) -> ADSClient:
+    http = httpx.AsyncClient(
+        transport=transport, base_url="http://fake", headers={"Authorization": "Bearer secret"}
+    )
+    return ADSClient(http, batch_window=0, stats=Stats())
+
+
+async def _session(client: ADSClient, bibcodes: list[str]) -> tuple:
+    search = await client.get("/v1/search/query", params={"q": "*:*", "rows": 5, "fl": "bibcode"})
+    bigquery = await client.post(
+        "/v1/search/bigquery", params={"q": "*:*", "fl": "bibcode,title"},
+        content="bibcode\n" + "\n".join(bibcodes),
+    )
+    export = await client.post_raw("/v1/export/bibtex", json={"bibcode": bibcodes})
+    return search, bigquery, export
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["session.jsonl", "session.jsonl.gz"])
+async def test_record_then_replay(tmp_path, name):
+    app = create_app(FakeConfig(corpus_size=200, rate_limit=100, latency=Latency("fixed", 20)))
+    bibcodes = [p.bibcode for p in app.state.fake.corpus.papers[:3]]
+    path = tmp_path / name
+    recording = RecordingTransport(httpx.ASGITransport(app=app), path)
+    recorder = _client(recording)
+    live = await _session(recorder, bibcodes)
+    await recorder.close()
+
+    if name.endswith(".gz"):
+        assert gzip.open(path).read()
+    entries = load_cassette(path)
+    assert [e["path"] for e in entries] == [
+        "/v1/search/query", "/v1/search/bigquery", "/v1/export/bibtex"
+    ]
+    assert all(e["elapsed"] >= 0.02 for e in entries)
+    assert "secret" not in path.read_bytes().decode("latin-1")
+
+    replayer = _client(ReplayTransport(path))
+    start = time.perf_counter()
+    assert await _session(replayer, bibcodes) == live
+    assert time.perf_counter() - start < 0.05
+    assert replayer.rate_limits.remaining == 97
+    await replayer.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_original_timing_and_misses(tmp_path):
+    app = create_app(FakeConfig(corpus_size=50, latency=Latency("fixed", 30)))
+    path = tmp_path / "c.jsonl"
+    recorder = _client(RecordingTransport(httpx.ASGITransport(app=app), path))
+    await recorder.get("/v1/search/query", params={"q": "*:*", "rows": 1})
+    await recorder.close()
+
+    transport = ReplayTransport(path, timing="original")
+    client = _client(transport)
+    start = time.perf_counter()
+    # Query parameter order does not matter; repeats reuse the last recording.
+    await client.get("/v1/search/query", params={"rows": 1, "q": "*:*"})
+    await client.get("/v1/search/query", params={"q": "*:*", "rows": 1})
+    assert time.perf_counter() - start >= 0.06
+
+    with pytest.raises(ADSNotFoundError, match="no recorded response"):
+        await client.get("/v1/search/query", params={"q": "other"})
+    assert transport.misses == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_original_timing_keeps_gaps_between_requests(tmp_path):
+    app = create_app(FakeConfig(corpus_size=50))
+    path = tmp_path / "c.jsonl"
+    recorder = _client(RecordingTransport(httpx.ASGITransport(app=app), path))
+    await recorder.get("/v1/search/query", params={"q": "a"})
+    await asyncio.sleep(0.1)
+    await recorder.get("/v1/search/query", params={"q": "b"})
+    await recorder.close()
+    assert [round(e["offset"], 1) for e in load_cassette(path)] == [0.0, 0.1]
+
+    client = _client(ReplayTransport(path, timing="original"))
+    start = time.perf_counter()
+    await client.get("/v1/search/query", params={"q": "a"})
+    await client.get("/v1/search/query", params={"q": "b"})
+    assert time.perf_counter() - start >= 0.1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_recording_caps_response_size(tmp_path):
+    app = create_app(FakeConfig(corpus_size=50))
+    path = tmp_path / "c.jsonl"
+    recorder = _client(RecordingTransport(httpx.ASGITransport(app=app), path, max_bytes=100))
+    with pytest.raises(ADSResponseTooLargeError):
+        await recorder.get("/v1/search/query", params={"q": "*:*", "rows": 10})
+    await recorder.close()
+    assert load_cassette(path) == []
+
+
+def test_create_with_replay_needs_no_token(tmp_path, monkeypatch):
+    monkeypatch.delenv("ADS_API_TOKEN", raising=False)
+    path = tmp_path / "c.jsonl"
+    path.write_text('{"cassette": 1}\n')
+    client = ADSClient.create(replay=path)
+    assert isinstance(client._http._transport, ReplayTransport)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "c.jsonl"
+    path.write_text('{"not": "a cassette"}\n')
+    with pytest.raises(ValueError):
+        load_cassette(path)
@@ -2,18 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import sqlite3
 import time
 
 import httpx
 import pytest
 
-from mcp_server_ads.client import ADSClient, _raise_for_status
+from mcp_server_ads.batching import single_bibcode
+from mcp_server_ads.client import (
+    HEDGE_MIN_SAMPLES,
+    ADSClient,
+    RateLimitTracker,
+    _raise_for_status,
+)
+from mcp_server_ads.deadlines import deadline
 from mcp_server_ads.errors import (
     ADSAuthError,
+    ADSDeadlineError,
     ADSNotFoundError,
     ADSRateLimitError,
+    ADSResponseTooLargeError,
     ADSServerError,
 )
+from mcp_server_ads.quota import HISTORY_SECONDS
+from mcp_server_ads.stats import Series, Stats
 
 
 class TestRateLimitTracker:
@@ -64,6 +78,50 @@ class TestRateLimitTracker:
         summary = rate_limits.status_summary()
         assert "4500/5000" in summary
 
+    def test_state_survives_restart(self, tmp_path):
+        path = tmp_path / "rate_limits.json"
+        tracker = RateLimitTracker(path=path)
+        tracker.spend()
+        tracker.update(httpx.Headers({
+            "x-ratelimit-limit": "5000",
+            "x-ratelimit-remaining": "0",
+            "x-ratelimit-reset": str(time.time() + 3600),
+        }))
+        restarted = RateLimitTracker(path=path)
+        assert restarted.exhausted
+        assert [s.tool for s in restarted.history] == [""]
+
+    def test_state_of_another_token_is_discarded(self, tmp_path):
+        path = tmp_path / "rate_limits.json"
+        old = RateLimitTracker(path=path, tenant="old")
+        old.spend()
+        old.update(httpx.Headers({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "3e9"}))
+        assert RateLimitTracker(path=path, tenant="old").exhausted
+
+        new = RateLimitTracker(path=path, tenant="new")
+        assert not new.exhausted and not new.history
+        assert path.with_suffix(".jsonl").read_text() == ""
+
+    def test_spends_are_appended_and_compacted(self, tmp_path, monkeypatch):
+        path = tmp_path / "rate_limits.json"
+        log = path.with_suffix(".jsonl")
+        tracker = RateLimitTracker(path=path)
+        for _ in range(3):
+            tracker.spend()
+            tracker.save()
+        assert "history" not in json.loads(path.read_text())
+        assert len(log.read_text().splitlines()) == 3
+
+        log.write_text(log.read_text() + '[1e12, "cut')  # interrupted append
+        restarted = RateLimitTracker(path=path)
+        assert len(restarted.history) == 3
+        assert len(log.read_text().splitlines()) == 3
+        later = time.time() + HISTORY_SECONDS + 10
+        monkeypatch.setattr(time, "time", lambda: later)
+        restarted.spend()
+        restarted.save()
+        assert len(log.read_text().splitlines()) == 1
+
 
 class TestRaiseForStatus:
     def test_success(self):
@@ -109,6 +167,19 @@ class TestADSClient:
         assert data == {"result": "ok"}
         assert ads_client.rate_limits.remaining == 4999
 
+    @pytest.mark.asyncio
+    async def test_failing_doc_listener_does_not_fail_request(self, ads_client, mock_httpx):
+        mock_httpx.get("/v1/search/query").mock(return_value=httpx.Response(
+            200, json={"response": {"docs": [{"bibcode": "2020ApJ...900..100A"}]}}
+        ))
+
+        def broken(docs):
+            raise sqlite3.OperationalError("database is locked")
+
+        ads_client.add_doc_listener(broken)
+        data = await ads_client.get("/v1/search/query", params={"q": "x"}, batch=False)
+        assert data["response"]["docs"][0]["bibcode"] == "2020ApJ...900..100A"
+
     @pytest.mark.asyncio
     async def test_post(self, ads_client, mock_httpx):
         mock_httpx.post("/v1/test").mock(
@@ -125,3 +196,159 @@ class TestADSClient:
         from fastmcp.exceptions import ToolError
         with pytest.raises(ToolError):
             await ads_client.get("/v1/test")
+
+
+class TestBibcodeBatching:
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_bigquery(self, ads_client, mock_httpx):
+        docs = [
+            {"bibcode": "1905AnP...322..891E", "title": ["Relativity"]},
+            {"bibcode": "1916AnP...354..769E", "title": ["General relativity"]},
+        ]
+        bigquery = mock_httpx.post("/v1/search/bigquery").mock(
+            return_value=httpx.Response(200, json={"response": {"numFound": 2, "docs": docs}})
+        )
+        results = await asyncio.gather(*(
+            ads_client.get(
+                "/v1/search/query",
+                params={"q": f"bibcode:{bib}", "fl": "bibcode,title", "rows": 1, "start": 0},
+            )
+            for bib in ("1905AnP...322..891E", "1916AnP...354..769E", "1905AnP...322..891E")
+        ))
+        assert bigquery.call_count == 1
+        assert b"1916AnP...354..769E" in bigquery.calls[0].request.content
+        assert [r["response"]["docs"][0]["bibcode"] for r in results] == [
+            "1905AnP...322..891E", "1916AnP...354..769E", "1905AnP...322..891E",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_single_lookup_uses_plain_query(self, ads_client, mock_httpx):
+        query = mock_httpx.get("/v1/search/query").mock(
+            return_value=httpx.Response(200, json={"response": {"numFound": 1, "docs": []}})
+        )
+        await ads_client.get(
+            "/v1/search/query", params={"q": 'bibcode:"1905AnP...322..891E"'},
+        )
+        assert query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_doc_falls_back_to_query(self, ads_client, mock_httpx):
+        mock_httpx.post("/v1/search/bigquery").mock(
+            return_value=httpx.Response(200, json={"response": {"numFound": 1, "docs": [
+                {"bibcode": "1905AnP...322..891E"},
+            ]}})
+        )
+        query = mock_httpx.get("/v1/search/query").mock(
+            return_value=httpx.Response(200, json={"response": {"numFound": 1, "docs": [
+                {"bibcode": "2016PhRvL.116f1102A"},
+            ]}})
+        )
+        _, alt = await asyncio.gather(
+            ads_client.get("/v1/search/query", params={"q": "bibcode:1905AnP...322..891E"}),
+            ads_client.get("/v1/search/query", params={"q": "bibcode:2016arXiv160203837T"}),
+        )
+        assert query.call_count == 1
+        assert alt["response"]["docs"][0]["bibcode"] == "2016PhRvL.116f1102A"
+
+    def test_single_bibcode_detection(self):
+        assert single_bibcode({"q": "bibcode:1905AnP...322..891E"}) == "1905AnP...322..891E"
+        assert single_bibcode({"q": "bibcode:1905AnP...322..891E", "start": 10}) is None
+        assert single_bibcode({"q": "bibcode:1905AnP* year:1905"}) is None
+
+
+class TestStreaming:
+    @pytest.mark.asyncio
+    async def test_stream_to_path(self, ads_client, mock_httpx, tmp_path):
+        mock_httpx.post("/v1/export/bibtex").mock(
+            return_value=httpx.Response(200, content=b"@ARTICLE{x}\n" * 1000)
+        )
+        target = tmp_path / "out.bib"
+        written = await ads_client.stream_to("POST", "/v1/export/bibtex", target, json={})
+        assert written == target.stat().st_size == 12_000
+
+    @pytest.mark.asyncio
+    async def test_stream_to_callback(self, ads_client, mock_httpx):
+        mock_httpx.post("/v1/export/bibtex").mock(
+            return_value=httpx.Response(200, content=b"abc")
+        )
+        chunks = []
+        await ads_client.stream_to("POST", "/v1/export/bibtex", chunks.append)
+        assert b"".join(chunks) == b"abc"
+
+    @pytest.mark.asyncio
+    async def test_stream_limit_leaves_no_file(self, ads_client, mock_httpx, tmp_path):
+        mock_httpx.post("/v1/export/bibtex").mock(
+            return_value=httpx.Response(200, content=b"x" * 5000)
+        )
+        target = tmp_path / "out.bib"
+        with pytest.raises(ADSResponseTooLargeError):
+            await ads_client.stream_to(
+                "POST", "/v1/export/bibtex", target, max_bytes=1000,
+            )
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_buffered_requests_are_capped(self, ads_client, mock_httpx):
+        ads_client.max_response_bytes = 100
+        mock_httpx.post("/v1/search/bigquery").mock(
+            return_value=httpx.Response(200, json={"docs": ["x" * 200]})
+        )
+        with pytest.raises(ADSResponseTooLargeError):
+            await ads_client.post("/v1/search/bigquery")
+
+
+class TestHedgingAndDeadlines:
+    @pytest.fixture
+    def client(self, mock_httpx):
+        stats = Stats()
+        series = stats.endpoints.setdefault("/v1/search/query", Series())
+        for _ in range(HEDGE_MIN_SAMPLES):
+            series.latency.observe(0.004)
+        client = ADSClient(
+            httpx.AsyncClient(base_url="https://api.adsabs.harvard.edu"),
+            batch_window=0, stats=stats, hedging=True,
+        )
+        client.rate_limits.limit = client.rate_limits.remaining = 5000
+        return client
+
+    @staticmethod
+    def _slow_then_fast(mock_httpx):
+        calls = []
+
+        async def respond(request):
+            calls.append(request)
+            await asyncio.sleep(1 if len(calls) == 1 else 0)
+            return httpx.Response(200, json={"n": len(calls)})
+
+        mock_httpx.get("/v1/search/query").mock(side_effect=respond)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_slow_read_is_hedged(self, client, mock_httpx):
+        calls = self._slow_then_fast(mock_httpx)
+        start = time.perf_counter()
+        assert await client.get("/v1/search/query", params={"q": "x"}) == {"n": 2}
+        assert time.perf_counter() - start < 0.5
+        assert len(calls) == 2
+        series = client.stats.endpoints["/v1/search/query"]
+        assert series.hedges == 1 and series.errors == 0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_for_writes_or_low_budget(self, client, mock_httpx):
+        calls = self._slow_then_fast(mock_httpx)
+        client.rate_limits.remaining = 100
+        assert await client.get("/v1/search/query", params={"q": "x"}) == {"n": 1}
+        assert len(calls) == 1
+        assert client._hedge_delay("POST", "/v1/biblib/documents/abc") is None
+
+    @pytest.mark.asyncio
+    async def test_deadline_cuts_request_short(self, client, mock_httpx):
+        calls = self._slow_then_fast(mock_httpx)
+        client.hedging = False
+        with deadline(0.05):
+            with pytest.raises(ADSDeadlineError):
+                await client.get("/v1/search/query", params={"q": "x"})
+            with pytest.raises(ADSDeadlineError):
+                await client.get("/v1/search/query", params={"q": "y"})
+        assert len(calls) == 1
+        assert await client.get("/v1/search/query", params={"q": "z"}) == {"n": 2}
@@ -0,0 +1,72 @@
+"""Tests for the identifier crosswalk."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from mcp_server_ads import crosswalk
+from mcp_server_ads.crosswalk import CrosswalkIndex, classify, query_term
+
+DOC = {
+    "bibcode": "2016PhRvL.116f1102A",
+    "identifier": ["2016arXiv160203837T", "arXiv:1602.03837", "10.1103/PhysRevLett.116.061102"],
+    "doi": ["10.1103/PhysRevLett.116.061102"],
+    "alternate_bibcode": ["2016arXiv160203837T"],
+}
+
+
+def test_classify():
+    assert classify("https://doi.org/10.1103/PhysRevLett.116.061102") == (
+        "doi", "10.1103/physrevlett.116.061102"
+    )
+    assert classify("arXiv:1602.03837v2") == ("arxiv", "arxiv:1602.03837")
+    assert classify("astro-ph/0601001") == ("arxiv", "arxiv:astro-ph/0601001")
+    assert classify(" 2016PhRvL.116f1102A ") == ("bibcode", "2016PhRvL.116f1102A")
+    assert classify("not an identifier") is None
+
+
+def test_query_term():
+    assert query_term("arxiv", "arxiv:1602.03837") == 'identifier:"arXiv:1602.03837"'
+    assert query_term("doi", "10.1/x") == 'identifier:"10.1/x"'
+
+
+def test_observe_and_lookup():
+    index = CrosswalkIndex()
+    index.observe([DOC, {"identifier": ["no bibcode"]}])
+    keys = ["10.1103/physrevlett.116.061102", "arxiv:1602.03837", "2016arXiv160203837T", "10.1/x"]
+    found = index.lookup(keys)
+    assert set(found.values()) == {"2016PhRvL.116f1102A"}
+    assert "10.1/x" not in found
+    assert (index.hits, index.misses) == (3, 1)
+    index.lookup(keys, record=False)
+    assert (index.hits, index.misses) == (3, 1)
+
+
+def test_persistence(tmp_path):
+    path = tmp_path / "crosswalk.sqlite"
+    index = CrosswalkIndex(path)
+    index.observe([DOC])
+    index.flush()
+    count = len(index)
+    index.close()
+
+    reopened = CrosswalkIndex(path)
+    assert len(reopened) == count
+    assert reopened.lookup(["arxiv:1602.03837"]) == {"arxiv:1602.03837": "2016PhRvL.116f1102A"}
+    reopened.close()
+
+
+def test_busy_file_neither_blocks_nor_fails_observe(tmp_path, monkeypatch):
+    monkeypatch.setattr(crosswalk, "BUSY_TIMEOUT", 0.1)
+    path = tmp_path / "crosswalk.sqlite"
+    index = CrosswalkIndex(path)
+    other = sqlite3.connect(path)
+    other.execute("BEGIN IMMEDIATE")  # another worker writing
+
+    index.observe([DOC])
+    assert index.lookup(["arxiv:1602.03837"]) == {"arxiv:1602.03837": "2016PhRvL.116f1102A"}
+    index.flush()  # the write gave up and the batch was dropped
+    assert index.lookup(["arxiv:1602.03837"]) == {}
+    other.rollback()
+    other.close()
+    index.close()
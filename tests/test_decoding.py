@@ -0,0 +1,44 @@
+"""Tests for JSON decoding."""
+
+import json
+
+import pytest
+
+from mcp_server_ads import decoding
+
+PAYLOAD = {"response": {"numFound": 1, "docs": [{"bibcode": "1905AnP...322..891E",
+                                                 "title": ["Zur Elektrodynamik ä"]}]}}
+
+
+def test_loads_bytes():
+    assert decoding.loads(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+
+def test_loads_without_orjson(monkeypatch):
+    monkeypatch.setattr(decoding, "orjson", None)
+    assert decoding.loads(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+
+def _stream_field(body: bytes, size: int) -> str:
+    pieces: list[str] = []
+    reader = decoding.StringField("export", pieces.append)
+    for i in range(0, len(body), size):
+        reader.feed(body[i : i + size])
+    reader.close()
+    return "".join(pieces)
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+@pytest.mark.parametrize("ascii_only", [True, False])
+def test_string_field_decodes_across_chunks(size, ascii_only):
+    text = '@ARTICLE{a,\n  title = "{\\"Zur\\"} Elektrodynamik ä 😀",\n}\t/'
+    body = json.dumps(
+        {"msg": "x {\"}\" [1]", "skip": [1, {"export": "no"}], "export": text, "n": 2.5},
+        ensure_ascii=ascii_only,
+    ).encode()
+    assert _stream_field(body, size) == text
+
+
+def test_string_field_rejects_a_truncated_body():
+    with pytest.raises(ValueError):
+        _stream_field(b'{"export": "@a{1}\\n@a', 4)
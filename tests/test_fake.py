@@ -0,0 +1,102 @@
+"""Tests for the local fake ADS API."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from mcp_server_ads.bibcodes import is_valid
+from mcp_server_ads.bibfile import BibEntry, parse_entries
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.errors import ADSRateLimitError, ADSServerError
+from mcp_server_ads.fake import Corpus, FakeConfig, create_app
+from mcp_server_ads.stats import Stats
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return Corpus(500, seed=1)
+
+
+def _client(config: FakeConfig) -> tuple[ADSClient, object]:
+    app = create_app(config)
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake")
+    return ADSClient(http, batch_window=0, stats=Stats()), app.state.fake
+
+
+def test_corpus_is_deterministic_and_valid(corpus):
+    again = Corpus(500, seed=1)
+    assert [p.bibcode for p in corpus.papers] == [p.bibcode for p in again.papers]
+    assert all(is_valid(p.bibcode) for p in corpus.papers)
+    cited = corpus.papers[0]
+    assert all(cited.bibcode in corpus.by_bibcode[b].reference for b in cited.citation)
+
+
+def test_query_evaluation(corpus):
+    paper = corpus.papers[-1]
+    surname = paper.author[0].split(",")[0]
+    assert paper in corpus.search(f'author:"{surname}" year:{paper.year}')
+    assert corpus.search(f"bibcode:{paper.bibcode}") == [paper]
+    assert corpus.search(f'identifier:"{paper.doi}" OR bibcode:{corpus.papers[0].bibcode}',
+                         sort="bibcode asc") == sorted([paper, corpus.papers[0]],
+                                                       key=lambda p: p.bibcode)
+    citing = corpus.search(f"citations(bibcode:{corpus.papers[0].bibcode})")
+    assert {p.bibcode for p in citing} == set(corpus.papers[0].citation)
+    newest, second = corpus.search("*:*", sort="entry_date desc")[:2]
+    later = corpus.search(
+        f'*:* entry_date:["{second.entry_date}" TO *] -bibcode:"{newest.bibcode}"'
+    )
+    assert second in later
+    assert newest not in later
+
+
+@pytest.mark.asyncio
+async def test_client_against_fake():
+    client, fake = _client(FakeConfig(corpus_size=300, token="t", rate_limit=100))
+    client._http.headers["Authorization"] = "Bearer t"
+    paper = fake.corpus.papers[10]
+
+    data = await client.get("/v1/search/query", params={
+        "q": f"bibcode:{paper.bibcode}", "fl": "bibcode,title", "rows": 5,
+    })
+    assert data["response"]["docs"] == [{"bibcode": paper.bibcode, "title": [paper.title]}]
+    assert client.rate_limits.limit == 100
+    assert client.rate_limits.remaining == 99
+
+    bibcodes = [p.bibcode for p in fake.corpus.papers[:5]]
+    data = await client.post(
+        "/v1/search/bigquery", params={"q": "*:*", "fl": "bibcode", "rows": 10},
+        content="bibcode\n" + "\n".join(bibcodes), headers={"Content-Type": "big-query/csv"},
+    )
+    assert {d["bibcode"] for d in data["response"]["docs"]} == set(bibcodes)
+
+    export = await client.post("/v1/export/bibtex", json={"bibcode": bibcodes})
+    entries = [e for e in parse_entries(export["export"]) if isinstance(e, BibEntry)]
+    assert {e.bibcode for e in entries} == set(bibcodes)
+
+    metrics = await client.post("/v1/metrics", json={"bibcodes": bibcodes})
+    assert metrics["basic stats"]["number of papers"] == 5
+
+    lib = await client.post("/v1/biblib/libraries", json={"name": "L", "bibcode": bibcodes[:2]})
+    await client.post(f"/v1/biblib/documents/{lib['id']}",
+                      json={"bibcode": bibcodes[1:], "action": "add"})
+    detail = await client.get(f"/v1/biblib/libraries/{lib['id']}", params={"rows": 100})
+    assert detail["documents"] == bibcodes
+    data = await client.get("/v1/search/query", params={
+        "q": f"docs(library/{lib['id']})", "fl": "bibcode", "rows": 10,
+    })
+    assert data["response"]["numFound"] == 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_and_error_injection():
+    client, fake = _client(FakeConfig(corpus_size=50, rate_limit=2))
+    fake.inject(503)
+    with pytest.raises(ADSServerError):
+        await client.get("/v1/search/query", params={"q": "*:*"})
+    await client.get("/v1/search/query", params={"q": "*:*"})
+    assert client.rate_limits.remaining == 0
+    client.rate_limits.remaining = 1  # bypass the client-side check to reach the server
+    with pytest.raises(ADSRateLimitError):
+        await client.get("/v1/search/query", params={"q": "*:*"})
+    assert fake.requests["/v1/search/query"] == 3
@@ -13,7 +13,9 @@ from mcp_server_ads.formatting import (
     format_reference_resolve,
     format_resolver_links,
     format_search_results,
+    format_set_preview,
 )
+from mcp_server_ads.setops import preview_operation
 from tests.conftest import load_fixture
 
 
@@ -124,3 +126,43 @@ def test_format_library_notes():
 def test_format_library_notes_empty():
     result = format_library_notes([])
     assert "No notes" in result
+
+
+def test_format_set_preview():
+    preview = preview_operation("difference", ["a", "b", "c"], [["c"]])
+    result = format_set_preview(preview, sample=1)
+    assert "2 documents" in result
+    assert "-1 removed" in result
+    assert "and 1 more" in result
+
+
+def _big_search(n: int = 200) -> dict:
+    doc = {
+        "bibcode": "2020ApJ...900..100A",
+        "title": ["A long title about dark matter halos"],
+        "author": [f"Author, {i}" for i in range(8)],
+        "year": "2020",
+        "pub": "The Astrophysical Journal",
+        "abstract": "x" * 1000,
+        "identifier": ["arXiv:2001.00001", "10.3847/1538-4357/abc123"],
+    }
+    return {"response": {"numFound": n, "docs": [doc] * n}}
+
+
+def test_format_search_results_budget():
+    data = _big_search()
+    unbudgeted = format_search_results(data)
+    for budget in (1_000, 10_000, 40_000):
+        result = format_search_results(data, max_chars=budget)
+        assert len(result) <= budget
+    # A generous budget keeps full detail; a tight one drops abstracts first
+    assert format_search_results(data, max_chars=len(unbudgeted) + 200) == unbudgeted
+    assert "  > " not in format_search_results(data, max_chars=40_000)
+    assert "omitted to fit" in format_search_results(data, max_chars=1_000)
+
+
+def test_format_library_detail_budget():
+    data = {"metadata": {"name": "L"}, "documents": ["2020ApJ...900..100A"] * 500}
+    result = format_library_detail(data, max_chars=1_000)
+    assert len(result) <= 1_000
+    assert "more" in result
@@ -0,0 +1,102 @@
+"""Tests for the background job manager."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from mcp_server_ads import jobs as jobs_mod
+from mcp_server_ads.jobs import Job, JobManager
+
+
+def _search_page(request: httpx.Request, num: int = 5) -> httpx.Response:
+    start = int(request.url.params["start"])
+    rows = int(request.url.params["rows"])
+    docs = [{"bibcode": f"2020ApJ...{i:03d}..001A"} for i in range(start, min(start + rows, num))]
+    return httpx.Response(200, json={"response": {"numFound": num, "docs": docs}})
+
+
+@pytest.fixture
+def small_steps(monkeypatch):
+    monkeypatch.setattr(jobs_mod, "SEARCH_PAGE_SIZE", 2)
+    monkeypatch.setattr(jobs_mod, "EXPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(jobs_mod, "RETRY_DELAY", 0)
+
+
+async def test_search_job_harvests_all_pages(jobs, mock_httpx, small_steps):
+    route = mock_httpx.get("/v1/search/query").mock(side_effect=_search_page)
+    job = await jobs.submit("search", {"query": "q", "fields": "bibcode", "sort": "date desc"})
+    job = await jobs.wait(job.id)
+    assert job.status == "done"
+    assert route.call_count == 3
+    assert [d["bibcode"][10:13] for d in jobs.read_docs(job.id)] == [
+        "000", "001", "002", "003", "004",
+    ]
+    assert jobs.read_docs(job.id, start=3, rows=1) == [{"bibcode": "2020ApJ...003..001A"}]
+
+
+async def test_export_job_retries_server_errors(jobs, mock_httpx, small_steps):
+    route = mock_httpx.post("/v1/export/bibtex").mock(side_effect=[
+        httpx.Response(200, json={"export": "@a{1}\n@a{2}\n"}),
+        httpx.Response(503, json={"error": "busy"}),
+        httpx.Response(200, json={"export": "@a{3}"}),
+    ])
+    params = {"bibcodes": ["1", "2", "3"], "format": "bibtex", "sort": "x"}
+    job = await jobs.submit("export", params)
+    job = await jobs.wait(job.id)
+    assert job.status == "done"
+    assert route.call_count == 3
+    assert jobs.read_text(job.id) == "@a{1}\n@a{2}\n@a{3}\n"
+
+
+async def test_export_job_drops_text_of_a_failed_attempt(jobs, mock_httpx, small_steps):
+    mock_httpx.post("/v1/export/bibtex").mock(side_effect=[
+        httpx.Response(200, json={"export": "@a{1}\n@a{2}\n"}),
+        httpx.Response(200, content=b'{"export": "@a{3}\\n@a{'),  # cut off mid-body
+    ])
+    params = {"bibcodes": ["1", "2", "3"], "format": "bibtex", "sort": "x"}
+    job = await jobs.submit("export", params)
+    job = await jobs.wait(job.id)
+    assert job.status == "failed"
+    assert job.cursor == 2
+    assert jobs.read_text(job.id) == "@a{1}\n@a{2}\n"
+
+
+async def test_resume_from_checkpoint(ads_client, mock_httpx, tmp_path, small_steps):
+    directory = tmp_path / "jobs"
+    directory.mkdir()
+    job = Job(
+        id="j1", kind="search", params={"query": "q", "fields": "bibcode", "sort": "s"},
+        status="running", cursor=2, total=5,
+    )
+    done = "".join(json.dumps({"bibcode": f"2020ApJ...{i:03d}..001A"}) + "\n" for i in range(2))
+    job.result_bytes = len(done)
+    (directory / "j1.json").write_text(json.dumps(job.__dict__))
+    # A step that was interrupted after writing but before its checkpoint
+    (directory / "j1.result").write_text(done + '{"bibcode": "partial"}\n')
+
+    route = mock_httpx.get("/v1/search/query").mock(side_effect=_search_page)
+    manager = JobManager(ads_client, directory)
+    manager.start()
+    job = await manager.wait("j1")
+    assert job.status == "done"
+    assert [int(c.request.url.params["start"]) for c in route.calls] == [2, 4]
+    assert len(manager.read_docs("j1")) == 5
+    assert "partial" not in (directory / "j1.result").read_text()
+
+
+async def test_cancel_while_waiting_for_rate_limit(jobs, ads_client):
+    ads_client.rate_limits.remaining = 0
+    ads_client.rate_limits.reset = time.time() + 3600
+    job = await jobs.submit("search", {"query": "q", "fields": "bibcode", "sort": "s"})
+    await asyncio.sleep(0.01)
+    assert jobs.get(job.id).status == "running"
+    assert await jobs.cancel(job.id)
+    assert jobs.get(job.id).status == "cancelled"
+    assert not await jobs.cancel(job.id)
+    reloaded = json.loads((jobs.result_path(job.id).with_suffix(".json")).read_text())
+    assert reloaded["status"] == "cancelled"
@@ -0,0 +1,113 @@
+"""Tests for the local library mirror."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from mcp_server_ads import mirror as mirror_mod
+from mcp_server_ads.mirror import LibraryMirror
+
+
+def _listing(modified: str = "2024-06-15T12:00:00", num: int = 5) -> dict:
+    return {"libraries": [
+        {"id": "abc123", "name": "Big", "num_documents": num, "date_last_modified": modified},
+    ]}
+
+
+def _paged_detail(request: httpx.Request, num: int = 5) -> httpx.Response:
+    start = int(request.url.params["start"])
+    rows = int(request.url.params["rows"])
+    docs = [f"2020ApJ...{i:03d}..001A" for i in range(start, min(start + rows, num))]
+    meta = {
+        "id": "abc123", "name": "Big", "num_documents": num,
+        "date_last_modified": "2024-06-15T12:00:00",
+    }
+    return httpx.Response(200, json={"metadata": meta, "documents": docs})
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(mirror_mod, "PAGE_SIZE", 2)
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_pages(library_mirror, mock_httpx, small_pages):
+    detail = mock_httpx.get("/v1/biblib/libraries/abc123").mock(side_effect=_paged_detail)
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(
+        return_value=httpx.Response(200, json=[{"bibcode": "x", "content": "note"}])
+    )
+    lib = await library_mirror.fetch("abc123")
+    assert detail.call_count == 3
+    assert len(lib.documents) == 5
+    assert lib.notes[0]["content"] == "note"
+    assert lib.detail(rows=2, start=4)["documents"] == ["2020ApJ...004..001A"]
+
+
+@pytest.mark.asyncio
+async def test_sync_refetches_only_changed(ads_client, library_mirror, mock_httpx, tmp_path):
+    listing = mock_httpx.get("/v1/biblib/libraries").mock(
+        return_value=httpx.Response(200, json=_listing())
+    )
+    detail = mock_httpx.get("/v1/biblib/libraries/abc123").mock(side_effect=_paged_detail)
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(return_value=httpx.Response(200, json=[]))
+
+    report = await library_mirror.sync()
+    assert report.fetched == ["abc123"]
+
+    # Reloaded from disk, an unchanged library is not refetched
+    reloaded = LibraryMirror(ads_client, tmp_path / "libraries")
+    report = await reloaded.sync()
+    assert report.unchanged == ["abc123"]
+    assert detail.call_count == 1
+
+    listing.mock(return_value=httpx.Response(200, json=_listing(modified="2024-07-01T00:00:00")))
+    report = await reloaded.sync()
+    assert report.fetched == ["abc123"]
+    assert detail.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_drops_deleted_libraries(library_mirror, mock_httpx):
+    mock_httpx.get("/v1/biblib/libraries").mock(
+        side_effect=[
+            httpx.Response(200, json=_listing()),
+            httpx.Response(200, json={"libraries": []}),
+        ]
+    )
+    mock_httpx.get("/v1/biblib/libraries/abc123").mock(side_effect=_paged_detail)
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(return_value=httpx.Response(200, json=[]))
+    await library_mirror.sync()
+    report = await library_mirror.sync()
+    assert report.removed == ["abc123"]
+    assert "abc123" not in library_mirror
+
+
+@pytest.mark.asyncio
+async def test_each_library_has_its_own_file(library_mirror, mock_httpx, tmp_path):
+    mock_httpx.get("/v1/biblib/libraries/abc123").mock(side_effect=_paged_detail)
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(return_value=httpx.Response(200, json=[]))
+    await library_mirror.fetch("abc123")
+    assert [p.name for p in (tmp_path / "libraries").iterdir()] == ["abc123.json"]
+    await library_mirror.invalidate("abc123")
+    assert not any((tmp_path / "libraries").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_unlisted_libraries_are_rechecked_after_a_while(library_mirror, mock_httpx,
+                                                              monkeypatch):
+    mock_httpx.get("/v1/biblib/libraries").mock(return_value=httpx.Response(200, json={
+        "libraries": [],
+    }))
+    detail = mock_httpx.get("/v1/biblib/libraries/abc123").mock(side_effect=_paged_detail)
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(return_value=httpx.Response(200, json=[]))
+    await library_mirror.current("abc123")
+    await library_mirror.current("abc123")
+    assert detail.call_count == 1
+
+    # Past the TTL, one small page shows the library unchanged.
+    monkeypatch.setattr(mirror_mod, "UNLISTED_TTL", 0)
+    await library_mirror.current("abc123")
+    assert detail.call_count == 2
+    assert detail.calls[-1].request.url.params["rows"] == "1"
+    assert library_mirror.hits == 2
@@ -25,3 +25,9 @@ def test_generate_bibliography():
     result = generate_bibliography(source="dark matter", format="bibtex")
     assert "bibtex" in result
     assert "dark matter" in result
+
+
+def test_generate_bibliography_bibcodes():
+    result = generate_bibliography(source="2016PhRvL.116f1102A, 1905AnP...322..891E")
+    assert "list of 2 bibcodes" in result
+    assert "ads_bigquery" in result
@@ -0,0 +1,41 @@
+"""Tests for rate-limit spend forecasts."""
+
+from __future__ import annotations
+
+from mcp_server_ads.formatting import format_rate_limits
+from mcp_server_ads.quota import Spend, forecast
+
+NOW = 1_800_000_000.0
+
+
+def _spends() -> list[Spend]:
+    # Over the last 30 minutes: ten single-request searches, five two-request exports.
+    spends = [Spend(NOW - 1800 + i * 60, "ads_search", f"s{i}") for i in range(10)]
+    for i in range(5):
+        spends += [Spend(NOW - 900 + i * 60, "ads_export", f"e{i}")] * 2
+    return spends + [Spend(NOW - 7200, "ads_search", "old")]
+
+
+def test_forecast_extrapolates_recent_rate():
+    result = forecast(5000, 100, NOW + 86400, _spends(), now=NOW)
+    assert result.per_hour == 40
+    assert result.exhausted_at == NOW + 2.5 * 3600
+    costs = {c.tool: (c.units_per_call, c.affordable) for c in result.tools}
+    assert costs == {"ads_export": (2.0, 50), "ads_search": (1.0, 100)}
+
+
+def test_forecast_within_reset_and_after_reset():
+    assert forecast(5000, 100, NOW + 3600, _spends(), now=NOW).exhausted_at is None
+    stale = forecast(5000, 0, NOW - 10, _spends(), now=NOW)
+    assert (stale.remaining, stale.reset) == (5000, None)
+    assert forecast(None, None, None, [], now=NOW).per_hour == 0
+
+
+def test_format_rate_limits():
+    text = format_rate_limits(
+        "100/5000 requests remaining", forecast(5000, 100, NOW + 86400, _spends(), now=NOW), NOW
+    )
+    assert "40 requests/hour" in text
+    assert "in 2.5 h" in text
+    assert "| `ads_export` | 2.0 | 50 |" in text
+    assert "No requests in the last hour" in format_rate_limits("x", forecast(None, None, None, []))
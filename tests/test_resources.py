@@ -1,6 +1,7 @@
 """Tests for resources."""
 
 from mcp_server_ads.resources.fields import get_fields
+from mcp_server_ads.resources.stats import get_stats
 from mcp_server_ads.resources.syntax import get_syntax
 
 
@@ -16,3 +17,9 @@ def test_syntax_resource():
     assert "Boolean" in result
     assert "author:" in result
     assert "citations(" in result
+
+
+def test_stats_resource():
+    result = get_stats()
+    assert "ADS endpoints" in result
+    assert "Tools" in result
@@ -0,0 +1,40 @@
+"""Tests for local library set algebra."""
+
+import pytest
+
+from mcp_server_ads.setops import preview_operation
+
+A = ["a", "b", "c", "d"]
+B = ["c", "d", "e"]
+C = ["d", "f"]
+
+
+def test_union():
+    p = preview_operation("union", A, [B, C])
+    assert p.result == ["a", "b", "c", "d", "e", "f"]
+    assert p.added == ["e", "f"]
+    assert p.removed == []
+    assert p.primary_size == 4
+
+
+def test_intersection():
+    p = preview_operation("intersection", A, [B, C])
+    assert p.result == ["d"]
+    assert p.removed == ["a", "b", "c"]
+
+
+def test_difference():
+    p = preview_operation("difference", A, [B])
+    assert p.result == ["a", "b"]
+    assert p.removed == ["c", "d"]
+
+
+def test_large_sets():
+    big = [f"{i:019d}" for i in range(50_000)]
+    p = preview_operation("intersection", big, [big[25_000:]])
+    assert len(p.result) == 25_000
+
+
+def test_unknown_action():
+    with pytest.raises(ValueError):
+        preview_operation("copy", A, [B])
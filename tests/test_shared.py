@@ -0,0 +1,186 @@
+"""Tests for state shared between server worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+
+from mcp_server_ads.cache import STALE_FOR
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.jobs import JobManager
+from mcp_server_ads.mirror import LibraryMirror
+from mcp_server_ads.shared import SharedRateLimitTracker, SharedResponseCache, StateFile
+from mcp_server_ads.watch import WatchStore
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two connections to one state file, standing in for two worker processes."""
+    states = [StateFile(tmp_path / "state.sqlite") for _ in range(2)]
+    yield states
+    for state in states:
+        state.close()
+
+
+def _headers(remaining: int, reset: float = 2e9) -> httpx.Headers:
+    return httpx.Headers({
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-reset": str(reset),
+    })
+
+
+def test_rate_limits_are_shared_and_count_requests_in_flight(workers):
+    a, b = (SharedRateLimitTracker(state, "tenant") for state in workers)
+
+    def settle():
+        for state in workers:
+            state.flush()
+
+    a.update(_headers(100))
+    settle()
+    assert b.status_summary().startswith("100/5000")
+
+    a.spend()
+    b.spend()
+    settle()
+    a.refresh()
+    b.refresh()
+    assert a.remaining == b.remaining == 98
+    assert len(b.recent(0)) == 2 and b.forecast().per_hour > 0
+    # Responses arrive out of order: the older, higher count must not win.
+    b.update(_headers(98))
+    a.update(_headers(99))
+    settle()
+    assert b.exhausted is False and b.remaining == 98
+
+    b.update(_headers(5000, reset=3e9))
+    settle()
+    a.refresh()
+    assert (a.remaining, a.reset) == (5000, 3e9)
+    assert SharedRateLimitTracker(workers[0], "other").remaining is None
+
+    a.update(_headers(0, reset=3e9))
+    settle()
+    assert b.exhausted
+
+
+@pytest.mark.asyncio
+async def test_response_cache_is_shared(workers, mock_httpx):
+    route = mock_httpx.get("/v1/search/query").mock(
+        return_value=httpx.Response(200, json={"response": {"numFound": 3, "docs": []}})
+    )
+    http = httpx.AsyncClient(base_url="https://api.adsabs.harvard.edu")
+    clients = [
+        ADSClient(http, public_cache=SharedResponseCache(state, ttl=60), batch_window=0)
+        for state in workers
+    ]
+    for client, state in zip(clients, workers):
+        data = await client.get("/v1/search/query", params={"q": "x"})
+        assert data["response"]["numFound"] == 3
+        state.flush()
+    assert route.call_count == 1
+    assert clients[1].public_cache.hits == 1
+    await http.aclose()
+
+
+def test_response_cache_prunes_expired_and_excess(workers):
+    cache = SharedResponseCache(workers[0], ttl=60, max_entries=2)
+    for key in "abc":
+        cache.put(key, b"{}", "application/json")
+    SharedResponseCache(workers[1], ttl=-STALE_FOR - 1).put("old", b"{}", "application/json")
+    workers[1].flush()
+    cache.prune()
+    assert len(cache) == 2
+    assert cache.get("a") is None and cache.get("c") is not None
+
+    cache.max_bytes = 100
+    cache.put("d", b"x" * 10, "text/plain")
+    cache.put("big", b"x" * 11, "text/plain")  # over a tenth of the budget
+    workers[0].flush()
+    cache.max_bytes = 11
+    cache.prune()
+    assert cache.get("big") is None and cache.get("d") is not None
+    assert len(cache) == 1
+
+
+def test_one_worker_leads(workers):
+    a, b = workers
+    assert a.lead() and a.lead()
+    assert not b.lead()
+    a.close()
+    assert b.lead()
+
+
+@pytest.mark.asyncio
+async def test_watches_are_shared(workers, ads_client, tmp_path):
+    a, b = (WatchStore(ads_client, tmp_path / "watches.json", state) for state in workers)
+    await a.create("alpha", "abs:a")
+    await b.create("beta", "abs:b")
+    assert [w.name for w in a.all()] == ["alpha", "beta"]
+    await b.delete("alpha")
+    assert "alpha" not in a and a.get("beta").query == "abs:b"
+
+
+@pytest.mark.asyncio
+async def test_racing_saves_from_two_workers_are_both_kept(workers, ads_client, tmp_path):
+    a, b = (WatchStore(ads_client, tmp_path / "watches.json", state) for state in workers)
+    await asyncio.gather(*(store.create(f"w{i}", "abs:x") for i, store in enumerate([a, b] * 4)))
+    assert len(a.all()) == len(b.all()) == 8
+    assert workers[0].version(tmp_path / "watches.json") == 8
+
+
+@pytest.mark.asyncio
+async def test_transactions_nest_within_one_call_only(workers, tmp_path):
+    state = workers[0]
+    other = StateFile(tmp_path / "state.sqlite", timeout=0.1)
+
+    def nested():
+        with state.transaction() as outer, state.transaction() as inner:
+            assert outer is inner
+            with pytest.raises(sqlite3.OperationalError, match="locked"), other.transaction():
+                pass
+
+    await state.run(nested)
+    # Another call isn't inside the transaction just because it overlaps it.
+    assert not state._in_transaction.get()
+    other.close()
+
+
+@pytest.mark.asyncio
+async def test_library_mirror_is_shared(workers, ads_client, mock_httpx, tmp_path):
+    mock_httpx.get("/v1/biblib/libraries/abc123").mock(return_value=httpx.Response(
+        200, json={"metadata": {"num_documents": 1}, "documents": ["2020ApJ...900..100A"]}
+    ))
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(return_value=httpx.Response(200, json=[]))
+    a, b = (LibraryMirror(ads_client, tmp_path / "libraries") for _ in workers)
+    await a.fetch("abc123")
+    assert b.get("abc123").documents == ["2020ApJ...900..100A"]
+    await b.invalidate("abc123")
+    assert "abc123" not in a
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_visible_and_cancellable_from_any_worker(
+    workers, ads_client, mock_httpx, tmp_path
+):
+    mock_httpx.get("/v1/search/query").mock(return_value=httpx.Response(
+        200, json={"response": {"numFound": 1, "docs": [{"bibcode": "x"}]}}
+    ))
+    a, b = (JobManager(ads_client, tmp_path / "jobs", state) for state in workers)
+    params = {"query": "x", "fields": "bibcode", "sort": "date desc"}
+    done = await a.submit("search", params)
+    await a.wait(done.id)
+    assert b.get(done.id).status == "done" and b.get(done.id).cursor == 1
+
+    # Cancelled through the other worker before its next checkpoint
+    job = await a.submit("search", params)
+    assert await b.cancel(job.id)
+    await a.wait(job.id)
+    assert a.get(job.id).status == b.get(job.id).status == "cancelled"
+    assert [j.id for j in b.all()] == [job.id, done.id]
+    assert b.get("../jobs") is None
+    await a.close()
@@ -0,0 +1,89 @@
+"""Tests for lazy tool registration and the startup import budget."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.server import mcp
+from mcp_server_ads.tools.manifest import MANIFEST_PATH, LazyTool, build, register
+
+STARTUP_BUDGET_MS = float(os.environ.get("ADS_STARTUP_BUDGET_MS", "150"))
+"""Import time allowed for this package's own modules (excluding dependencies)."""
+
+
+@pytest.mark.asyncio
+async def test_manifest_is_current():
+    """Fails when a tool changed without ``python -m mcp_server_ads.tools``."""
+    assert await build(mcp) == json.loads(MANIFEST_PATH.read_text())
+
+
+@pytest.mark.asyncio
+async def test_lazy_tools_list_like_real_tools():
+    await build(mcp)
+    lazy_server = FastMCP("lazy")
+    register(lazy_server)
+    lazy = {t.name: t for t in await lazy_server.list_tools(run_middleware=False)}
+    real = {t.name: t for t in await mcp.list_tools(run_middleware=False)}
+    assert lazy.keys() == real.keys()
+    for name, tool in lazy.items():
+        assert isinstance(tool, LazyTool)
+        assert tool.to_mcp_tool() == real[name].to_mcp_tool()
+
+
+def _run(code: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, env={**os.environ, **env},
+    )
+
+
+def test_server_import_defers_tool_modules_and_stays_in_budget():
+    proc = _run("import json, sys, mcp_server_ads.server; print(json.dumps(list(sys.modules)))")
+    modules = set(json.loads(proc.stdout))
+    assert "mcp_server_ads.tools.manifest" in modules
+    assert "mcp_server_ads.tools.search" not in modules
+    assert "mcp_server_ads.formatting" not in modules
+    assert "mcp_server_ads.models" not in modules
+
+    own_us = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, _, name = line.removeprefix("import time:").split("|")
+            if name.strip().split(".")[0] == "mcp_server_ads":
+                own_us += int(self_us)
+    assert own_us / 1000 < STARTUP_BUDGET_MS
+
+
+def test_first_call_imports_tool_module(tmp_path):
+    cassette = tmp_path / "empty.jsonl"
+    cassette.write_text('{"cassette": 1}\n')
+    code = """
+import asyncio, sys
+from fastmcp import Client
+from mcp_server_ads.server import mcp
+
+async def main():
+    async with Client(mcp) as client:
+        assert "mcp_server_ads.tools.search" not in sys.modules
+        result = await client.call_tool("ads_search", {"query": "x"}, raise_on_error=False)
+        assert "mcp_server_ads.tools.search" in sys.modules
+        print(result.content[0].text)
+
+asyncio.run(main())
+"""
+    proc = _run(code, ADS_REPLAY=str(cassette), ADS_CACHE_DIR=str(tmp_path))
+    assert "no recorded response" in proc.stdout
+
+
+def test_create_defers_http_client():
+    client = ADSClient.create(token="t", base_url="https://example.org")
+    assert client._http_client is None
+    assert client._http.base_url == "https://example.org"
+    assert client._http_client is not None
@@ -0,0 +1,89 @@
+"""Tests for request and tool instrumentation."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from mcp_server_ads.client import ADSClient
+from mcp_server_ads.errors import ADSNotFoundError
+from mcp_server_ads.stats import Histogram, Stats, StatsMiddleware, endpoint_name
+
+
+def test_endpoint_name():
+    assert endpoint_name("/v1/search/query") == "/v1/search/query"
+    assert endpoint_name("/v1/biblib/documents/abc123") == "/v1/biblib/documents"
+    assert endpoint_name("/v1/resolver/2016PhRvL.116f1102A/esource") == "/v1/resolver"
+    assert endpoint_name("/v1/metrics") == "/v1/metrics"
+
+
+def test_histogram_quantiles():
+    hist = Histogram()
+    assert hist.quantile(0.5) is None
+    for _ in range(90):
+        hist.observe(0.02)
+    for _ in range(10):
+        hist.observe(3.0)
+    assert 0.01 < hist.quantile(0.5) <= 0.025
+    assert 2.5 < hist.quantile(0.99) <= 5.0
+    assert hist.count == 100
+
+
+@pytest.mark.asyncio
+async def test_client_records_requests(mock_httpx):
+    stats = Stats()
+    client = ADSClient(
+        httpx.AsyncClient(base_url="https://api.adsabs.harvard.edu"), batch_window=0, stats=stats
+    )
+    mock_httpx.get("/v1/search/query").mock(
+        return_value=httpx.Response(200, json={"response": {"docs": []}})
+    )
+    mock_httpx.get("/v1/biblib/libraries/x").mock(return_value=httpx.Response(404))
+    await client.get("/v1/search/query", params={"q": "a"})
+    with pytest.raises(ADSNotFoundError):
+        await client.get("/v1/biblib/libraries/x")
+
+    search = stats.endpoints["/v1/search/query"]
+    assert (search.count, search.errors, search.units) == (1, 0, 1)
+    assert search.bytes > 0
+    assert stats.endpoints["/v1/biblib/libraries"].errors == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_attributes_requests_to_tools(mock_httpx):
+    stats = Stats()
+    client = ADSClient(
+        httpx.AsyncClient(base_url="https://api.adsabs.harvard.edu"), batch_window=0, stats=stats
+    )
+    mock_httpx.get("/v1/search/query").mock(
+        return_value=httpx.Response(200, json={"response": {"docs": []}})
+    )
+    server = FastMCP("test")
+    server.add_middleware(StatsMiddleware(stats))
+
+    @server.tool
+    async def two_searches() -> str:
+        await client.get("/v1/search/query", params={"q": "a"})
+        await client.get("/v1/search/query", params={"q": "b"})
+        return "ok"
+
+    class Cache:
+        hits, misses = 3, 1
+
+    stats.register_cache("test", Cache())
+    async with Client(server) as mcp_client:
+        await mcp_client.call_tool("two_searches", {})
+
+    snapshot = stats.snapshot()
+    assert snapshot["tools"]["two_searches"]["count"] == 1
+    assert snapshot["tools"]["two_searches"]["units"] == 2
+    assert snapshot["caches"]["test"]["hit_ratio"] == 0.75
+    spends = list(client.rate_limits.history)
+    assert [s.tool for s in spends] == ["two_searches"] * 2
+    assert spends[0].call == spends[1].call != ""
+
+    text = stats.prometheus()
+    assert 'ads_tool_rate_limit_units_total{tool="two_searches"} 2' in text
+    assert 'ads_endpoint_latency_seconds_count{endpoint="/v1/search/query"} 2' in text
+    assert 'le="+Inf"' in text
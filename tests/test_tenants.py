@@ -0,0 +1,191 @@
+"""Tests for multi-tenant clients, state and the shared public cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastmcp.exceptions import ToolError
+
+from mcp_server_ads import tenants as tenants_module
+from mcp_server_ads.cache import ResponseCache
+from mcp_server_ads.crosswalk import CrosswalkIndex
+from mcp_server_ads.errors import ADSAuthError
+from mcp_server_ads.stats import STATS
+from mcp_server_ads.tenants import TenantMiddleware, Tenants, TenantState, tenant_id
+
+
+@pytest.fixture
+async def tenants(tmp_path, mock_httpx):
+    crosswalk = CrosswalkIndex()
+    registry = Tenants(
+        tmp_path, crosswalk, multi_tenant=True, public_cache_ttl=60,
+        http=httpx.AsyncClient(base_url="https://api.adsabs.harvard.edu"),
+    )
+    yield registry
+    await registry.close()
+    crosswalk.close()
+
+
+def _search_route(mock_httpx, remaining: str):
+    return mock_httpx.get("/v1/search/query").mock(return_value=httpx.Response(
+        200,
+        json={"response": {"numFound": 1, "docs": [{"bibcode": "2020ApJ...900..100A"}]}},
+        headers={"x-ratelimit-limit": "5000", "x-ratelimit-remaining": remaining},
+    ))
+
+
+@pytest.mark.asyncio
+async def test_tenants_have_own_clients_and_state_on_one_pool(tenants, mock_httpx, tmp_path):
+    route = _search_route(mock_httpx, "4999")
+    alice, bob = tenants.get("alice-token"), tenants.get("bob-token")
+    assert tenants.get("alice-token") is alice
+    assert alice.ads_client._http is bob.ads_client._http
+
+    await alice.ads_client.get("/v1/search/query", params={"q": "x"}, batch=False)
+    assert route.calls[0].request.headers["authorization"] == "Bearer alice-token"
+    assert alice.ads_client.rate_limits.remaining == 4999
+    assert bob.ads_client.rate_limits.remaining is None
+
+    await alice.watches.create("w", "abs:x")
+    assert (tmp_path / "tenants" / tenant_id("alice-token") / "watches.json").exists()
+    assert "w" not in bob.watches
+    assert "alice-token" not in str(list(tmp_path.rglob("*")))
+
+
+@pytest.mark.asyncio
+async def test_public_responses_are_shared_private_ones_are_not(tenants, mock_httpx):
+    search = _search_route(mock_httpx, "4999")
+    libraries = mock_httpx.get("/v1/biblib/libraries").mock(
+        return_value=httpx.Response(200, json={"libraries": []})
+    )
+    alice, bob = tenants.get("alice-token"), tenants.get("bob-token")
+    alice.ads_client.verified = bob.ads_client.verified = True
+
+    for tenant in (alice, bob):
+        data = await tenant.ads_client.get("/v1/search/query", params={"q": "x"}, batch=False)
+        assert data["response"]["numFound"] == 1
+        await tenant.ads_client.get("/v1/biblib/libraries")
+    assert search.call_count == 1
+    assert libraries.call_count == 2
+    assert tenants.public_cache.hits == 1
+
+    await bob.ads_client.get("/v1/search/query", params={"q": "y"}, batch=False)
+    assert search.call_count == 2
+
+    # Searches can read a private library, so those are not shared
+    for tenant in (alice, bob):
+        await tenant.ads_client.get(
+            "/v1/search/query", params={"q": "docs(library/abc123)"}, batch=False
+        )
+    assert search.call_count == 4
+
+
+def test_public_cache_is_bounded_by_bytes():
+    cache = ResponseCache(60, max_bytes=100)
+    for key in "abc":
+        cache.put(key, b"x" * 10, "text/plain")
+    cache.put("huge", b"x" * 11, "text/plain")
+    assert cache.get("huge") is None
+    cache.max_bytes = 25
+    cache.put("d", b"x" * 2, "text/plain")
+    assert cache.get("a") is None and cache.get("b") is not None
+    assert cache.size == 22 and len(cache) == 3
+
+
+@pytest.mark.asyncio
+async def test_state_follows_request_token(tenants, monkeypatch):
+    state = TenantState(tenants, {"crosswalk": "shared"})
+    assert state["crosswalk"] == "shared"
+    with pytest.raises(ToolError, match="X-ADS-API-Token"):
+        state["ads_client"]
+
+    seen = []
+
+    async def call_next(context):
+        seen.append(state["ads_client"])
+
+    middleware = TenantMiddleware()
+    for token in ("alice-token", "bob-token", "alice-token"):
+        monkeypatch.setattr(
+            tenants_module, "get_http_headers", lambda include, t=token: {"x-ads-api-token": t}
+        )
+        await middleware.on_request(None, call_next)
+    assert seen[0] is seen[2] is not seen[1]
+    assert len(tenants) == 2
+
+    # The operator's token is not lent to requests that send none
+    tenants.default_token = "operator-token"
+    with pytest.raises(ToolError, match="X-ADS-API-Token"):
+        state["ads_client"]
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_checked_before_serving_cache_or_keeping_state(
+    tenants, mock_httpx, monkeypatch, tmp_path
+):
+    def answer(request):
+        if request.headers["authorization"] != "Bearer alice-token":
+            return httpx.Response(401, json={"error": "Unauthorized"})
+        return httpx.Response(200, json={"response": {"numFound": 0, "docs": []}})
+
+    search = mock_httpx.get("/v1/search/query").mock(side_effect=answer)
+    alice = tenants.get("alice-token")
+    await alice.ads_client.get("/v1/search/query", params={"q": "x"}, batch=False)
+    assert search.call_count == 2  # the check, then the search
+    assert alice.ads_client.verified
+
+    forged = tenants.get("forged-token")
+    with pytest.raises(ADSAuthError):
+        await forged.ads_client.get("/v1/search/query", params={"q": "x"}, batch=False)
+    assert tenants.public_cache.hits == 0
+
+    state = TenantState(tenants, {})
+    monkeypatch.setattr(
+        tenants_module, "get_http_headers", lambda include: {"x-ads-api-token": "forged-token"}
+    )
+    calls = []
+
+    async def call_tool(context):
+        calls.append(await state["watches"].create("w", "abs:x"))
+
+    context = SimpleNamespace(fastmcp_context=SimpleNamespace(lifespan_context=state))
+
+    async def on_request(context):
+        return await TenantMiddleware().on_call_tool(context, call_tool)
+
+    with pytest.raises(ToolError, match="Authentication failed"):
+        await TenantMiddleware().on_request(context, on_request)
+    assert not calls
+    assert len(tenants) == 1
+    assert not (tmp_path / "tenants" / tenant_id("forged-token")).exists()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_idle_tenants_are_unloaded(tenants, tmp_path):
+    tenants.max_tenants = 2
+    caches = dict(STATS._caches)
+    alice = tenants.get("alice-token")
+    await alice.jobs.submit("search", {"query": "x", "fields": "bibcode", "sort": "date desc"})
+    bob = tenants.get("bob-token")
+    bob.ads_client.verified = True
+    tenants.get("carol-token")
+    assert len(tenants) == 2
+    assert tenants.get("alice-token") is alice  # busy with a job, so kept
+    assert STATS._caches == caches  # per-tenant mirrors stay out of the shared stats
+    assert (tmp_path / "tenants" / tenant_id("bob-token") / "rate_limits.json").exists()
+    assert tenants.get("bob-token") is not bob
+
+
+@pytest.mark.asyncio
+async def test_single_tenant_uses_cache_dir_and_requires_token(tmp_path, monkeypatch):
+    monkeypatch.delenv("ADS_API_TOKEN", raising=False)
+    with pytest.raises(ADSAuthError):
+        Tenants(tmp_path, CrosswalkIndex(), multi_tenant=False)
+
+    single = Tenants(tmp_path, CrosswalkIndex(), default_token="t", multi_tenant=False)
+    state = TenantState(single, {})
+    await state["watches"].create("w", "abs:x")
+    assert (tmp_path / "watches.json").exists()
+    await single.close()
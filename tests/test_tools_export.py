@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import json
+
 import httpx
 import pytest
 
+from mcp_server_ads.tools import export as export_mod
 from mcp_server_ads.tools.export import ads_export
 from tests.conftest import load_fixture
 
@@ -20,3 +23,62 @@ async def test_ads_export_bibtex(mock_ctx, mock_httpx):
     )
     assert "@ARTICLE" in result
     assert "Einstein" in result
+
+
+@pytest.mark.asyncio
+async def test_ads_export_bib_path(mock_ctx, mock_httpx, tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text("@ARTICLE{2016PhRvL.116f1102A,\n  title = {GW}\n}\n")
+    route = mock_httpx.post("/v1/export/bibtex").mock(
+        return_value=httpx.Response(200, json=load_fixture("export_response.json"))
+    )
+    result = await ads_export(
+        bibcodes=["2016PhRvL.116f1102A", "1905AnP...322..891E"],
+        bib_path=str(path), ctx=mock_ctx,
+    )
+    assert "1 added" in result
+    assert "1 already present" in result
+    assert json.loads(route.calls[0].request.content)["bibcode"] == ["1905AnP...322..891E"]
+    text = path.read_text()
+    assert "{GW}" in text and "Electrodynamics" in text
+
+    # Everything present now: no request is made
+    await ads_export(bibcodes=["1905AnP...322..891E"], bib_path=str(path), ctx=mock_ctx)
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_ads_export_bib_path_chunks_missing_bibcodes(mock_ctx, mock_httpx, tmp_path,
+                                                           monkeypatch):
+    monkeypatch.setattr(export_mod, "EXPORT_CHUNK_SIZE", 2)
+    route = mock_httpx.post("/v1/export/bibtex").mock(
+        return_value=httpx.Response(200, json=load_fixture("export_response.json"))
+    )
+    bibcodes = [f"2020ApJ...{i:03d}..001A" for i in range(5)]
+    await ads_export(bibcodes=bibcodes, bib_path=str(tmp_path / "refs.bib"), ctx=mock_ctx)
+    assert [json.loads(c.request.content)["bibcode"] for c in route.calls] == [
+        bibcodes[:2], bibcodes[2:4], bibcodes[4:],
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("name", "text", "expected"), [
+    ("notes.txt", "my notes\n", "must name a .bib file"),
+    ("refs.bib", "import os\n", "doesn't parse as BibTeX"),
+])
+async def test_ads_export_bib_path_leaves_other_files_alone(mock_ctx, tmp_path,
+                                                            name, text, expected):
+    path = tmp_path / name
+    path.write_text(text)
+    result = await ads_export(bibcodes=["1905AnP...322..891E"], bib_path=str(path), ctx=mock_ctx)
+    assert expected in result
+    assert path.read_text() == text
+
+
+@pytest.mark.asyncio
+async def test_ads_export_bib_path_refused_for_remote_users(mock_ctx, tmp_path):
+    mock_ctx.lifespan_context["local_files"] = False
+    path = tmp_path / "refs.bib"
+    result = await ads_export(bibcodes=["1905AnP...322..891E"], bib_path=str(path), ctx=mock_ctx)
+    assert "not available on a multi-tenant server" in result
+    assert not path.exists()
@@ -0,0 +1,68 @@
+"""Tests for identifiers tool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_server_ads.deadlines import deadline
+from mcp_server_ads.tools import identifiers
+from mcp_server_ads.tools.identifiers import ads_identifiers
+
+DOC = {
+    "bibcode": "2016PhRvL.116f1102A",
+    "identifier": ["arXiv:1602.03837", "10.1103/PhysRevLett.116.061102"],
+    "doi": ["10.1103/PhysRevLett.116.061102"],
+}
+
+
+@pytest.mark.asyncio
+async def test_ads_identifiers_queries_misses(mock_ctx, mock_httpx):
+    route = mock_httpx.get("/v1/search/query").mock(
+        return_value=httpx.Response(200, json={"response": {"numFound": 1, "docs": [DOC]}})
+    )
+    result = await ads_identifiers(
+        identifiers=["arXiv:1602.03837v1", "10.1103/PhysRevLett.116.061102", "10.9999/none"],
+        ctx=mock_ctx,
+    )
+    assert route.call_count == 1
+    query = route.calls[0].request.url.params["q"]
+    assert 'identifier:"arXiv:1602.03837"' in query
+    assert " OR " in query
+    assert "Resolved 2 of 3" in result
+    assert "not found" in result
+
+
+@pytest.mark.asyncio
+async def test_ads_identifiers_from_index(mock_ctx, mock_httpx, crosswalk):
+    crosswalk.observe([DOC])
+    result = await ads_identifiers(
+        identifiers=["doi:10.1103/physrevlett.116.061102", "garbage"], output="json", ctx=mock_ctx,
+    )
+    assert not mock_httpx.calls
+    matches = result.structured_content["matches"]
+    assert matches[0]["bibcode"] == "2016PhRvL.116f1102A"
+    assert matches[1] == {"identifier": "garbage"}
+    assert result.structured_content["from_index"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ads_identifiers_returns_partial_results_at_deadline(
+    mock_ctx, mock_httpx, monkeypatch
+):
+    monkeypatch.setattr(identifiers, "QUERY_CHUNK_SIZE", 1)
+
+    async def respond(request):
+        if "none" in request.url.params["q"]:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"response": {"numFound": 1, "docs": [DOC]}})
+
+    mock_httpx.get("/v1/search/query").mock(side_effect=respond)
+    with deadline(0.2):
+        result = await ads_identifiers(
+            identifiers=["arXiv:1602.03837", "10.9999/none"], output="json", ctx=mock_ctx
+        )
+    assert result.structured_content["matches"][0]["bibcode"] == "2016PhRvL.116f1102A"
+    assert result.structured_content["not_looked_up"] == 1
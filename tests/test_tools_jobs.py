@@ -0,0 +1,63 @@
+"""Tests for jobs tool."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from mcp_server_ads.tools.jobs import ads_jobs
+
+
+@pytest.mark.asyncio
+async def test_ads_jobs_search(mock_ctx, mock_httpx, jobs):
+    mock_httpx.get("/v1/search/query").mock(return_value=httpx.Response(200, json={
+        "response": {"numFound": 1, "docs": [{"bibcode": "2020ApJ...001..001A", "title": ["T"]}]},
+    }))
+    result = await ads_jobs(action="submit", kind="search", query="author:x", ctx=mock_ctx)
+    job_id = result.split("`")[1]
+    await jobs.wait(job_id)
+
+    status = await ads_jobs(action="status", job_id=job_id, output="json", ctx=mock_ctx)
+    assert status.structured_content["status"] == "done"
+    assert status.structured_content["done"] == 1
+
+    assert status.structured_content["result_path"].endswith(f"{job_id}.result")
+
+    result = await ads_jobs(action="result", job_id=job_id, ctx=mock_ctx)
+    assert "2020ApJ...001..001A" in result
+    assert "done" in result
+    assert "Results: `" in result
+
+    # Remote users of a multi-tenant server are not shown server paths
+    mock_ctx.lifespan_context["local_files"] = False
+    status = await ads_jobs(action="status", job_id=job_id, output="json", ctx=mock_ctx)
+    assert "result_path" not in status.structured_content
+    assert "Results: `" not in await ads_jobs(action="result", job_id=job_id, ctx=mock_ctx)
+
+
+@pytest.mark.asyncio
+async def test_ads_jobs_export(mock_ctx, mock_httpx, jobs):
+    mock_httpx.post("/v1/export/bibtex").mock(
+        return_value=httpx.Response(200, json={"export": "@article{x,\n}\n"})
+    )
+    result = await ads_jobs(
+        action="submit", kind="export", bibcodes=["2020ApJ...001..001A"], ctx=mock_ctx,
+    )
+    job_id = result.split("`")[1]
+    await jobs.wait(job_id)
+    result = await ads_jobs(action="result", job_id=job_id, output="json", ctx=mock_ctx)
+    assert result.structured_content == {"format": "bibtex", "text": "@article{x,\n}\n"}
+
+
+@pytest.mark.asyncio
+async def test_ads_jobs_unknown(mock_ctx):
+    assert "No job" in await ads_jobs(action="cancel", job_id="nope", ctx=mock_ctx)
+    assert await ads_jobs(action="status", ctx=mock_ctx) == "No jobs."
+
+
+@pytest.mark.asyncio
+async def test_ads_jobs_submit_requires_inputs(mock_ctx):
+    assert "require bibcodes" in await ads_jobs(action="submit", kind="export", ctx=mock_ctx)
+    assert "require a query" in await ads_jobs(action="submit", kind="search", ctx=mock_ctx)
+    assert "requires kind" in await ads_jobs(action="submit", query="x", ctx=mock_ctx)
+    assert await ads_jobs(action="status", ctx=mock_ctx) == "No jobs."
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import json
+import time
+
 import httpx
 import pytest
 
+from mcp_server_ads.deadlines import deadline
+from mcp_server_ads.tools import libraries as libraries_mod
 from mcp_server_ads.tools.libraries import ads_library, ads_library_documents
 from tests.conftest import load_fixture
 
@@ -23,13 +28,57 @@ async def test_library_list(mock_ctx, mock_httpx):
 @pytest.mark.asyncio
 async def test_library_get(mock_ctx, mock_httpx):
     fixture = load_fixture("library_detail_response.json")
-    mock_httpx.get("/v1/biblib/libraries/abc123").mock(
+    detail = mock_httpx.get("/v1/biblib/libraries/abc123").mock(
         return_value=httpx.Response(200, json=fixture)
     )
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(return_value=httpx.Response(200, json=[]))
+    listing = mock_httpx.get("/v1/biblib/libraries").mock(
+        return_value=httpx.Response(200, json=_listing(abc123=3))
+    )
     result = await ads_library(action="get", library_id="abc123", ctx=mock_ctx)
     assert "My Reading List" in result
     assert "1905AnP" in result
 
+    # Second read is served from the mirror, unless the listing shows a change
+    await ads_library(action="get", library_id="abc123", ctx=mock_ctx)
+    assert detail.call_count == 1
+    listing.mock(return_value=httpx.Response(200, json=_listing(abc123=4)))
+    await ads_library(action="get", library_id="abc123", ctx=mock_ctx)
+    assert detail.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_library_sync_reports_failures(mock_ctx, mock_httpx):
+    mock_httpx.get("/v1/biblib/libraries").mock(
+        return_value=httpx.Response(200, json=_listing(abc123=3, def456=3, gone=3))
+    )
+    mock_httpx.get("/v1/biblib/libraries/abc123").mock(
+        return_value=httpx.Response(200, json=load_fixture("library_detail_response.json"))
+    )
+    mock_httpx.get("/v1/biblib/libraries/def456").mock(return_value=httpx.Response(401))
+    mock_httpx.get("/v1/biblib/libraries/gone").mock(return_value=httpx.Response(404))
+    mock_httpx.get(url__regex=r"/v1/biblib/notes/\w+").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+    result = await ads_library(action="sync", ctx=mock_ctx)
+    assert "1 fetched, 0 unchanged, 1 removed. Failed: `def456`" in result
+    assert "abc123" in mock_ctx.lifespan_context["library_mirror"]
+
+
+@pytest.mark.asyncio
+async def test_library_sync(mock_ctx, mock_httpx):
+    mock_httpx.get("/v1/biblib/libraries").mock(
+        return_value=httpx.Response(200, json=load_fixture("libraries_response.json"))
+    )
+    mock_httpx.get(url__regex=r"/v1/biblib/libraries/\w+").mock(
+        return_value=httpx.Response(200, json=load_fixture("library_detail_response.json"))
+    )
+    mock_httpx.get(url__regex=r"/v1/biblib/notes/\w+").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+    result = await ads_library(action="sync", ctx=mock_ctx)
+    assert "2 fetched" in result
+
 
 @pytest.mark.asyncio
 async def test_library_create(mock_ctx, mock_httpx):
@@ -61,8 +110,25 @@ async def test_library_delete(mock_ctx, mock_httpx):
     assert "deleted" in result
 
 
+def _listing(**sizes: int) -> dict:
+    return {"libraries": [{"id": lib_id, "num_documents": n} for lib_id, n in sizes.items()]}
+
+
+def _mock_library(mock_httpx, lib_id: str, docs: list[str]) -> None:
+    mock_httpx.get(f"/v1/biblib/libraries/{lib_id}").mock(
+        return_value=httpx.Response(200, json={
+            "metadata": {"id": lib_id, "num_documents": len(docs)}, "documents": docs,
+        })
+    )
+    mock_httpx.get(f"/v1/biblib/notes/{lib_id}").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+    mock_httpx.get("/v1/biblib/libraries").mock(return_value=httpx.Response(200, json=_listing()))
+
+
 @pytest.mark.asyncio
 async def test_library_documents_add(mock_ctx, mock_httpx):
+    _mock_library(mock_httpx, "abc123", [])
     mock_httpx.post("/v1/biblib/documents/abc123").mock(
         return_value=httpx.Response(200, json={"number_added": 2})
     )
@@ -74,6 +140,66 @@ async def test_library_documents_add(mock_ctx, mock_httpx):
     assert "2" in result
 
 
+@pytest.mark.asyncio
+async def test_library_documents_bulk_add(mock_ctx, mock_httpx, monkeypatch):
+    monkeypatch.setattr(libraries_mod, "WRITE_CHUNK_SIZE", 2)
+    b = [f"2020ApJ...900..{i:03d}A" for i in range(5)]
+    _mock_library(mock_httpx, "abc123", [b[0]])
+    writes = mock_httpx.post("/v1/biblib/documents/abc123").mock(
+        side_effect=lambda request: httpx.Response(
+            200, json={"number_added": len(json.loads(request.content)["bibcode"])}
+        )
+    )
+    result = await ads_library_documents(
+        library_id="abc123", action="add",
+        bibcodes=[b[0], b[1], b[2], b[2], b[3], b[4], "not-a-bibcode"],
+        ctx=mock_ctx,
+    )
+    assert "Added 4 document(s)" in result
+    assert "Skipped 1 already present" in result
+    assert "Ignored 1 invalid bibcode(s): not-a-bibcode" in result
+    assert writes.call_count == 2
+    sent = [x for call in writes.calls for x in json.loads(call.request.content)["bibcode"]]
+    assert sorted(sent) == b[1:]
+    mock_ctx.report_progress.assert_awaited_with(4, 4)
+
+
+@pytest.mark.asyncio
+async def test_library_documents_remove_sends_unmirrored(mock_ctx, mock_httpx):
+    # Removes are not checked against the mirror, which misses alternate bibcodes
+    b = [f"2020ApJ...900..{i:03d}A" for i in range(3)]
+    writes = mock_httpx.post("/v1/biblib/documents/abc123").mock(
+        return_value=httpx.Response(200, json={"number_removed": 2})
+    )
+    result = await ads_library_documents(
+        library_id="abc123", action="remove", bibcodes=b, ctx=mock_ctx,
+    )
+    assert json.loads(writes.calls[0].request.content)["bibcode"] == b
+    assert "Removed 2 document(s)" in result
+    assert "Skipped 1 already absent" in result
+
+
+@pytest.mark.asyncio
+async def test_library_documents_bulk_update_stops_at_deadline(mock_ctx, mock_httpx, monkeypatch):
+    monkeypatch.setattr(libraries_mod, "WRITE_CHUNK_SIZE", 2)
+    monkeypatch.setattr(libraries_mod, "MAX_CONCURRENT_WRITES", 1)
+    b = [f"2020ApJ...900..{i:03d}A" for i in range(3)]
+
+    def slow_write(request):
+        time.sleep(0.06)  # outlasts the deadline, but is not cut off
+        return httpx.Response(200, json={"number_removed": 2})
+
+    writes = mock_httpx.post("/v1/biblib/documents/abc123").mock(side_effect=slow_write)
+    with deadline(0.05):
+        result = await ads_library_documents(
+            library_id="abc123", action="remove", bibcodes=b, ctx=mock_ctx,
+        )
+    assert writes.call_count == 1
+    assert "Removed 2 document(s)" in result
+    assert "Skipped" not in result
+    assert f"Deadline reached before 1 bibcode(s) were sent (first: {b[2]})" in result
+
+
 @pytest.mark.asyncio
 async def test_library_documents_union(mock_ctx, mock_httpx):
     mock_httpx.post("/v1/biblib/libraries/operations/abc123").mock(
@@ -87,6 +213,10 @@ async def test_library_documents_union(mock_ctx, mock_httpx):
 
 @pytest.mark.asyncio
 async def test_library_documents_get_notes(mock_ctx, mock_httpx):
+    mock_httpx.get("/v1/biblib/libraries").mock(return_value=httpx.Response(200, json=_listing()))
+    mock_httpx.get("/v1/biblib/libraries/abc123").mock(
+        return_value=httpx.Response(200, json=load_fixture("library_detail_response.json"))
+    )
     mock_httpx.get("/v1/biblib/notes/abc123").mock(
         return_value=httpx.Response(200, json=[
             {"bibcode": "1905AnP...322..891E", "content": "Great paper"},
@@ -96,3 +226,32 @@ async def test_library_documents_get_notes(mock_ctx, mock_httpx):
         library_id="abc123", action="get_notes", ctx=mock_ctx,
     )
     assert "Great paper" in result
+
+
+@pytest.mark.asyncio
+async def test_library_documents_union_preview(mock_ctx, mock_httpx):
+    _mock_library(mock_httpx, "abc123", ["A", "B"])
+    _mock_library(mock_httpx, "def456", ["B", "C"])
+    result = await ads_library_documents(
+        library_id="abc123", action="union", libraries=["def456"], preview=True,
+        ctx=mock_ctx,
+    )
+    assert "not applied" in result
+    assert "+1 added" in result
+    assert "`C`" in result
+
+
+@pytest.mark.asyncio
+async def test_library_documents_get_notes_json(mock_ctx, mock_httpx):
+    _mock_library(mock_httpx, "abc123", [])
+    mock_httpx.get("/v1/biblib/notes/abc123").mock(
+        return_value=httpx.Response(200, json=[
+            {"bibcode": "1905AnP...322..891E", "content": "Great paper"},
+        ])
+    )
+    result = await ads_library_documents(
+        library_id="abc123", action="get_notes", output="json", ctx=mock_ctx,
+    )
+    assert result.structured_content == {
+        "notes": [{"bibcode": "1905AnP...322..891E", "content": "Great paper"}],
+    }
@@ -20,3 +20,14 @@ async def test_ads_metrics(mock_ctx, mock_httpx):
     )
     assert "h-index" in result
     assert "35" in result
+
+
+@pytest.mark.asyncio
+async def test_ads_metrics_json(mock_ctx, mock_httpx):
+    fixture = load_fixture("metrics_response.json")
+    mock_httpx.post("/v1/metrics").mock(
+        return_value=httpx.Response(200, json=fixture)
+    )
+    result = await ads_metrics(bibcodes=["1905AnP...322..891E"], output="json", ctx=mock_ctx)
+    assert result.structured_content["h_index"] == 35
+    assert result.structured_content["total_papers"] == 80
@@ -32,3 +32,17 @@ async def test_paper_network(mock_ctx, mock_httpx):
         bibcodes=["1905AnP...322..891E"], type="paper", ctx=mock_ctx,
     )
     assert "Gravitational Waves" in result
+
+
+@pytest.mark.asyncio
+async def test_network_json(mock_ctx, mock_httpx):
+    fixture = load_fixture("author_network_response.json")
+    mock_httpx.post("/v1/vis/author-network").mock(
+        return_value=httpx.Response(200, json=fixture)
+    )
+    result = await ads_network(
+        bibcodes=["1905AnP...322..891E"], type="author", output="json", ctx=mock_ctx,
+    )
+    data = result.structured_content
+    assert data["type"] == "author"
+    assert any("Einstein" in group["name"] for group in data["groups"])
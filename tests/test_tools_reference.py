@@ -22,3 +22,15 @@ async def test_resolve_reference(mock_ctx, mock_httpx):
     )
     assert "1905AnP" in result
     assert "Einstein" in result
+
+
+@pytest.mark.asyncio
+async def test_resolve_reference_json(mock_ctx, mock_httpx):
+    mock_httpx.post("/v1/reference/text").mock(
+        return_value=httpx.Response(200, text=FIXTURE_TEXT)
+    )
+    result = await ads_resolve_reference(
+        references=["Einstein 1905 Annalen der Physik 17 891"], output="json", ctx=mock_ctx,
+    )
+    first = result.structured_content["references"][0]
+    assert first["bibcode"].startswith("1905AnP")
@@ -44,3 +44,28 @@ async def test_ads_bigquery(mock_ctx, mock_httpx):
         ctx=mock_ctx,
     )
     assert "150" in result
+
+
+@pytest.mark.asyncio
+async def test_ads_search_max_tokens(mock_ctx, mock_httpx):
+    fixture = load_fixture("search_response.json")
+    mock_httpx.get("/v1/search/query").mock(
+        return_value=httpx.Response(200, json=fixture)
+    )
+    result = await ads_search(query="test", max_tokens=100, ctx=mock_ctx)
+    assert len(result) <= 400
+
+
+@pytest.mark.asyncio
+async def test_ads_search_json(mock_ctx, mock_httpx):
+    fixture = load_fixture("search_response.json")
+    mock_httpx.get("/v1/search/query").mock(
+        return_value=httpx.Response(200, json=fixture)
+    )
+    result = await ads_search(query="test", output="json", ctx=mock_ctx)
+    data = result.structured_content
+    assert data["num_found"] == 150
+    paper = data["papers"][0]
+    assert paper["bibcode"] == "1905AnP...322..891E"
+    assert isinstance(paper["title"], str)
+    assert "abstract" not in paper
@@ -0,0 +1,45 @@
+"""Tests for watch tool."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from mcp_server_ads.tools.watches import ads_watch
+
+
+@pytest.mark.asyncio
+async def test_ads_watch_lifecycle(mock_ctx, mock_httpx):
+    mock_httpx.get("/v1/search/query").mock(side_effect=[
+        httpx.Response(200, json={"response": {"numFound": 1, "docs": [
+            {"bibcode": "2024ApJ...001..001A", "title": ["Old"],
+             "entry_date": "2024-01-01T00:00:00Z"},
+        ]}}),
+        httpx.Response(200, json={"response": {"numFound": 0, "docs": []}}),
+    ])
+    result = await ads_watch(action="create", name="mine", query="author:x", ctx=mock_ctx)
+    assert "saved" in result
+
+    result = await ads_watch(action="run", name="mine", ctx=mock_ctx)
+    assert "baseline" in result
+    assert "Old" in result
+
+    result = await ads_watch(action="run", name="mine", ctx=mock_ctx)
+    assert "No new results" in result
+
+    result = await ads_watch(action="list", output="json", ctx=mock_ctx)
+    assert result.structured_content["watches"][0]["since"] == "2024-01-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_ads_watch_unknown(mock_ctx):
+    result = await ads_watch(action="run", name="missing", ctx=mock_ctx)
+    assert "No watch named" in result
+
+
+@pytest.mark.asyncio
+async def test_ads_watch_create_requires_name_and_query(mock_ctx):
+    assert "requires a name" in await ads_watch(action="create", query="q", ctx=mock_ctx)
+    assert "requires a query" in await ads_watch(action="create", name="w", ctx=mock_ctx)
+    assert "requires a name" in await ads_watch(action="run", ctx=mock_ctx)
+    assert "No watch queries saved" in await ads_watch(action="list", ctx=mock_ctx)
@@ -0,0 +1,67 @@
+"""Tests for optional OpenTelemetry tracing."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from mcp_server_ads import tracing
+from mcp_server_ads.client import ADSClient
+
+
+def test_disabled_is_noop(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", False)
+
+    def func():
+        return 1
+
+    assert tracing.traced("x")(func) is func
+    with tracing.span("x") as span:
+        assert span is None
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    memory = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    yield memory
+    memory.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_request_decode_and_format_spans(exporter, mock_httpx):
+    client = ADSClient(httpx.AsyncClient(base_url="https://api.adsabs.harvard.edu"))
+    mock_httpx.get("/v1/biblib/libraries/abc").mock(
+        return_value=httpx.Response(200, json={"documents": []})
+    )
+
+    @tracing.traced("format_test")
+    def render(data):
+        return str(data)
+
+    with tracing.span("tool"):
+        render(await client.get("/v1/biblib/libraries/abc"))
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    request = spans["ADS GET /v1/biblib/libraries"]
+    assert request.attributes["url.path"] == "/v1/biblib/libraries/abc"
+    assert request.attributes["http.response.status_code"] == 200
+    assert request.attributes["ads.response_bytes"] > 0
+    assert "ads.decode" in spans
+    assert "format_test" in spans
+    tool = spans["tool"]
+    assert all(
+        spans[name].parent.span_id == tool.context.span_id
+        for name in ("ADS GET /v1/biblib/libraries", "ads.decode", "format_test")
+    )
@@ -0,0 +1,94 @@
+"""Tests for saved watch queries."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from mcp_server_ads import watch as watch_mod
+from mcp_server_ads.watch import WatchQuery, WatchStore
+
+
+def _doc(bibcode: str, entry_date: str) -> dict:
+    return {"bibcode": bibcode, "entry_date": entry_date}
+
+
+def _response(*docs: dict, num_found: int | None = None) -> httpx.Response:
+    found = len(docs) if num_found is None else num_found
+    return httpx.Response(200, json={"response": {"numFound": found, "docs": list(docs)}})
+
+
+def test_delta_query():
+    watch = WatchQuery(name="w", query="author:x")
+    assert watch.delta_query() == "author:x"
+    watch.advance([_doc("A", "2024-01-02T00:00:00Z"), _doc("B", "2024-01-01T00:00:00Z")])
+    assert watch.since == "2024-01-02T00:00:00Z"
+    assert watch.seen == ["A"]
+    assert watch.delta_query() == (
+        '(author:x) entry_date:["2024-01-02T00:00:00Z" TO *] -bibcode:("A")'
+    )
+
+
+def test_advance_same_date_accumulates_seen():
+    watch = WatchQuery(name="w", query="q", since="2024-01-02T00:00:00Z", seen=["A"])
+    watch.advance([_doc("C", "2024-01-02T00:00:00Z")])
+    assert watch.seen == ["A", "C"]
+    watch.advance([])
+    assert watch.seen == ["A", "C"]
+
+
+@pytest.mark.asyncio
+async def test_run_fetches_only_delta(watches, mock_httpx):
+    route = mock_httpx.get("/v1/search/query").mock(side_effect=[
+        _response(_doc("A", "2024-01-02T00:00:00Z"), _doc("B", "2024-01-01T00:00:00Z"),
+                  num_found=40),
+        _response(_doc("C", "2024-01-03T00:00:00Z"), num_found=3),
+    ])
+    await watches.create("w", "author:x")
+
+    first = await watches.run("w", "bibcode")
+    assert first.baseline
+    assert first.remaining == 0
+    params = route.calls[0].request.url.params
+    assert params["q"] == "author:x"
+    assert params["sort"] == "entry_date desc"
+    assert params["fl"] == "bibcode,entry_date"
+
+    second = await watches.run("w", "bibcode", rows=1)
+    assert not second.baseline
+    assert [d["bibcode"] for d in second.docs] == ["C"]
+    assert second.remaining == 2
+    params = route.calls[1].request.url.params
+    assert "entry_date:[" in params["q"]
+    assert params["sort"] == "entry_date asc"
+
+
+@pytest.mark.asyncio
+async def test_run_drops_seen_beyond_query_limit(watches, mock_httpx, monkeypatch):
+    monkeypatch.setattr(watch_mod, "MAX_EXCLUDED", 1)
+    route = mock_httpx.get("/v1/search/query").mock(return_value=_response(
+        _doc("B", "2024-01-02T00:00:00Z"), _doc("C", "2024-01-03T00:00:00Z"), num_found=2,
+    ))
+    watch = await watches.create("w", "author:x")
+    watch.since, watch.seen = "2024-01-02T00:00:00Z", ["A", "B"]
+
+    run = await watches.run("w", "title", rows=1)
+    params = route.calls[0].request.url.params
+    assert params["q"].endswith('-bibcode:("A")')
+    assert params["rows"] == "2" and params["fl"] == "title,bibcode,entry_date"
+    assert [d["bibcode"] for d in run.docs] == ["C"]
+    assert run.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_store_persists(ads_client, tmp_path):
+    path = tmp_path / "watches.json"
+    store = WatchStore(ads_client, path)
+    await store.create("w", "author:x")
+    store.get("w").advance([_doc("A", "2024-01-02T00:00:00Z")])
+    store.save()
+
+    reloaded = WatchStore(ads_client, path)
+    assert reloaded.get("w").since == "2024-01-02T00:00:00Z"
+    assert await reloaded.delete("w")
+    assert "w" not in WatchStore(ads_client, path)